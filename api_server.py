@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+HTTP inference service for Prompt Engineering Studio.
+
+Exposes the prompt engineering tools and the validation models over a small
+asyncio HTTP/1.1 server with JSON requests and responses. Inputs go through
+the same validation, safety wrapping and output filtering as the app. Blocking
+work runs on separate executors, so a slow model call never holds up the
+cheap rule-based tools.
+
+Endpoints:
+    GET  /health              Liveness check
+    GET  /models              Available tools and models
+    GET  /stats               Request counters and latencies
+    GET  /metrics             Per-stage span histograms (Prometheus text)
+    GET  /traces              Per-stage span histograms (JSON)
+    POST /validate            {"input": "..."}
+    POST /tools/<tool>        {"input": "..."}
+    POST /generate            {"model": "distilgpt2", "input": "...", "max_new_tokens": 50,
+                               "do_sample": true, "seed": null, "precision": "fp32"}
+
+Usage:
+    python api_server.py [--host 127.0.0.1] [--port 8600]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple, Union
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.runner import run_model, is_prompt_tool, PROMPT_TOOLS, DEFAULT_MAX_WORKERS
+from models.load_model import PRECISION_MODES, DEFAULT_PRECISION
+from models.batching import get_micro_batcher
+from utils.safety import detect_injection, safe_format_prompt, validate_input
+from utils.tracing import span, get_tracer
+
+logger = logging.getLogger(__name__)
+
+# Models callable through /generate; loading arbitrary hub models is not allowed
+DEFAULT_API_MODELS = os.environ.get(
+    "PROMPT_STUDIO_API_MODELS", "google/flan-t5-small,microsoft/DialoGPT-small,distilgpt2"
+)
+DEFAULT_PORT = int(os.environ.get("PROMPT_STUDIO_API_PORT", "8600"))
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_PENDING_GENERATIONS = 64
+TOOL_WORKERS = 4
+
+
+class HTTPError(Exception):
+    """Error returned to the client as a JSON body"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class InferenceService:
+    """Request handlers and the executors they run on"""
+
+    def __init__(self, api_models: Optional[list] = None):
+        self.api_models = api_models or [
+            name.strip() for name in DEFAULT_API_MODELS.split(",") if name.strip()
+        ]
+        # Rule-based tools and model generations never queue behind each other
+        self.tool_executor = ThreadPoolExecutor(TOOL_WORKERS, thread_name_prefix="api-tool")
+        self.model_executor = ThreadPoolExecutor(
+            DEFAULT_MAX_WORKERS, thread_name_prefix="api-model"
+        )
+        self.pending_generations = 0
+        self.requests: Dict[str, Dict[str, float]] = {}
+
+    def record(self, route: str, status: int, seconds: float):
+        entry = self.requests.setdefault(
+            route, {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        )
+        entry["count"] += 1
+        entry["errors"] += status >= 400
+        entry["total_seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending_generations": self.pending_generations,
+            "batching": get_micro_batcher().stats(),
+            "routes": {
+                route: dict(entry, mean_seconds=entry["total_seconds"] / entry["count"])
+                for route, entry in self.requests.items()
+            },
+        }
+
+    @staticmethod
+    def _validated_prompt(body: Dict[str, Any]) -> str:
+        """Validate the input and wrap it with the safety preamble"""
+        user_input = body.get("input")
+        if not isinstance(user_input, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'input' must be a string")
+        with span("validate_input"):
+            message, is_valid = validate_input(user_input)
+        if not is_valid:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, message)
+        with span("safe_format_prompt"):
+            return safe_format_prompt(user_input.strip())
+
+    async def handle(
+        self, method: str, path: str, body: Dict[str, Any]
+    ) -> Union[Dict[str, Any], str]:
+        """Dispatch a request to its handler; str results are sent as plain text"""
+        if method == "GET" and path == "/health":
+            return {"status": "ok"}
+        if method == "GET" and path == "/models":
+            return {"tools": PROMPT_TOOLS, "models": self.api_models}
+        if method == "GET" and path == "/stats":
+            return self.stats()
+        if method == "GET" and path == "/metrics":
+            return get_tracer().to_prometheus()
+        if method == "GET" and path == "/traces":
+            return get_tracer().to_json()
+        if method == "POST" and path == "/validate":
+            user_input = str(body.get("input", ""))
+            message, is_valid = validate_input(user_input)
+            return {
+                "valid": is_valid,
+                "message": message,
+                "injection_matches": [m._asdict() for m in detect_injection(user_input)],
+            }
+        if method == "POST" and path.startswith("/tools/"):
+            return await self.run_tool(path[len("/tools/"):], body)
+        if method == "POST" and path == "/generate":
+            return await self.generate(body)
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+
+    async def run_tool(self, tool_name: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        if not is_prompt_tool(tool_name):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown tool '{tool_name}'")
+        final_prompt = self._validated_prompt(body)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.tool_executor, lambda: run_model(tool_name, final_prompt)
+        )
+        return _public_result(result)
+
+    async def generate(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        model_name = body.get("model")
+        if model_name not in self.api_models:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown model '{model_name}'")
+        precision = body.get("precision", DEFAULT_PRECISION)
+        if precision not in PRECISION_MODES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"'precision' must be one of {PRECISION_MODES}")
+        max_new_tokens = body.get("max_new_tokens", 50)
+        if not _is_int(max_new_tokens) or max_new_tokens <= 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'max_new_tokens' must be a positive integer")
+        do_sample = body.get("do_sample", True)
+        if not isinstance(do_sample, bool):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'do_sample' must be true or false")
+        seed = body.get("seed")
+        if seed is not None and not _is_int(seed):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'seed' must be an integer or null")
+        final_prompt = self._validated_prompt(body)
+
+        # Shed load instead of queueing without bound behind slow generations
+        if self.pending_generations >= MAX_PENDING_GENERATIONS:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Too many pending generations")
+
+        kwargs = {
+            "max_new_tokens": min(max_new_tokens, 200),
+            "do_sample": do_sample,
+            "seed": seed,
+            "precision": precision,
+        }
+        loop = asyncio.get_running_loop()
+        self.pending_generations += 1
+        try:
+            result = await loop.run_in_executor(
+                self.model_executor, lambda: run_model(model_name, final_prompt, **kwargs)
+            )
+        finally:
+            self.pending_generations -= 1
+        if not result["loaded"]:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, result["response"])
+        return _public_result(result)
+
+
+def _is_int(value: Any) -> bool:
+    """JSON integers only; bool is a subclass of int in Python"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _public_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "model": result["model_name"],
+        "response": result["response"],
+        "was_filtered": result["was_filtered"],
+        "cached": result["cached"],
+        "generation_time": result["generation_time"],
+    }
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Read one HTTP/1.1 request; None when the client closed the connection"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    if not target.startswith("/"):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Request target must be a path")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = headers.get("content-length", "0") or "0"
+    if not (length.isascii() and length.isdigit()):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Content-Length must be a non-negative integer")
+    length = int(length)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], headers, body
+
+
+def _write_response(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    payload: Union[Dict[str, Any], str],
+    keep_alive: bool,
+):
+    if isinstance(payload, str):
+        data = payload.encode("utf-8")
+        content_type = "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        content_type = "application/json; charset=utf-8"
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + data)
+
+
+async def _serve_connection(
+    service: InferenceService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+):
+    """Serve requests on one connection until the client closes it"""
+    try:
+        while True:
+            start_time = time.perf_counter()
+            route = "invalid"
+            keep_alive = False
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, raw_body = request
+                route = f"{method} /{path.split('/')[1]}"
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    body = json.loads(raw_body) if raw_body else {}
+                except ValueError:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+                if not isinstance(body, dict):
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+                status, payload = HTTPStatus.OK, await service.handle(method, path, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            except Exception as e:
+                logger.error(f"Request failed: {str(e)}")
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+            service.record(route, status.value, time.perf_counter() - start_time)
+            _write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+    """
+    Run the HTTP service until cancelled.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to listen on
+    """
+    service = InferenceService()
+    server = await asyncio.start_server(
+        lambda reader, writer: _serve_connection(service, reader, writer), host, port
+    )
+    logger.info(f"Prompt Engineering Studio API listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt Engineering Studio HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,39 @@ import streamlit as st
 import json
 import os
 import time
-import difflib
 import base64
+import uuid
 from datetime import datetime
+from multiprocessing import AuthenticationError
 from typing import Dict, List
-from models.load_model import load_model, generate_text, get_model_info
+from models.load_model import (
+    get_model_info,
+    get_model_registry,
+    PRECISION_MODES,
+    DEFAULT_PRECISION,
+)
+from models.runner import (
+    run_model,
+    run_models_concurrently,
+    get_static_prefix,
+    DEFAULT_MAX_WORKERS,
+)
+from models.prefix_cache import get_prefix_cache
+from models.batching import get_micro_batcher
+from models.warmup import start_preload, get_readiness
+from models.worker_pool import get_worker_client
 from utils.prompt_formatter import (
     format_prompt,
     validate_template,
     count_tokens_estimate,
+    count_tokens,
 )
-from utils.safety import safe_format_prompt, filter_output, validate_input
+from utils.token_counter import get_token_counter
+from utils.template_store import TemplateStore, get_template_store
+from utils.history_store import get_history_store
+from utils.response_diff import compare_responses, unified_diff
+from utils.safety import safe_format_prompt, validate_input
+from utils.tracing import span, get_tracer
 
 # Try to import pyperclip, but provide fallback if not available
 try:
@@ -51,8 +73,15 @@ def load_logo():
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if "session_memory" not in st.session_state:
-        st.session_state.session_memory = []
+    if "history_id" not in st.session_state:
+        # The id is the only key to a user's stored history, so it is never put
+        # in the shareable URL (older links carried it); users resume with it explicitly
+        if "history" in st.query_params:
+            del st.query_params["history"]
+        st.session_state.history_id = uuid.uuid4().hex
+    if "history_cursors" not in st.session_state:
+        # Start of each history page viewed so far; None is the newest page
+        st.session_state.history_cursors = [None]
     if "remember_session" not in st.session_state:
         st.session_state.remember_session = False
     if "dark_theme" not in st.session_state:
@@ -63,30 +92,47 @@ def initialize_session_state():
         st.session_state.last_models_used = []
     if "generation_times" not in st.session_state:
         st.session_state.generation_times = {}
+    if "wall_clock_time" not in st.session_state:
+        st.session_state.wall_clock_time = None
+    if "generation_metrics" not in st.session_state:
+        st.session_state.generation_metrics = {}
+
+
+def resume_history():
+    """Switch to the history saved under the key the user entered"""
+    history_key = st.session_state.resume_history_key.strip()
+    st.session_state.resume_history_key = ""
+    if history_key:
+        st.session_state.history_id = history_key
+        st.session_state.history_cursors = [None]
 
 
 def save_to_session_memory(
     prompt_type, user_input, final_prompt, models, responses, times
 ):
-    """Save current session to memory"""
+    """Append the current run to the user's on-disk history"""
     if st.session_state.remember_session:
-        session_entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "prompt_type": prompt_type,
-            "user_input": user_input,
-            "final_prompt": final_prompt,
-            "models": models,
-            "responses": responses,
-            "generation_times": times,
-        }
-        st.session_state.session_memory.append(session_entry)
-        # Keep only last 10 sessions to avoid memory issues
-        if len(st.session_state.session_memory) > 10:
-            st.session_state.session_memory = st.session_state.session_memory[-10:]
+        get_history_store().append(
+            st.session_state.history_id,
+            prompt_type,
+            user_input,
+            final_prompt,
+            models,
+            responses,
+            times,
+        )
+        st.session_state.history_cursors = [None]
 
 
 def create_download_content(
-    prompt_type, user_input, final_prompt, models, responses, times, format_type="txt"
+    prompt_type,
+    user_input,
+    final_prompt,
+    models,
+    responses,
+    times,
+    format_type="txt",
+    wall_clock_time=None,
 ):
     """Create downloadable content in specified format"""
     if format_type == "txt":
@@ -111,6 +157,8 @@ Model Responses:
             content += f"Generation Time: {gen_time:.2f}s\n"
             content += f"Response: {response}\n"
             content += "-" * 30 + "\n"
+        if wall_clock_time is not None:
+            content += f"\nTotal Wall-Clock Time: {wall_clock_time:.2f}s\n"
 
     elif format_type == "md":
         content = f"""# 🧠 Prompt Engineering Studio Export
@@ -132,19 +180,31 @@ Model Responses:
             content += f"\n### {model}\n"
             content += f"**Generation Time:** {gen_time:.2f}s\n\n"
             content += f"```\n{response}\n```\n"
+        if wall_clock_time is not None:
+            content += f"\n**Total Wall-Clock Time:** {wall_clock_time:.2f}s\n"
 
     return content
 
 
-@st.cache_resource
-def load_prompt_types() -> Dict:
-    """Load prompt types from JSON file"""
+TEMPLATE_PAGE_SIZE = 50
+HISTORY_PAGE_SIZE = 10
+
+
+def set_template_text(text: str):
+    """Replace the template being edited; call before the editor is drawn"""
+    st.session_state.template_text = text
+    # The keyed editor keeps its own value across reruns, so update it too
+    st.session_state.template_editor = text
+
+
+def load_template_store() -> TemplateStore:
+    """Return the template store, importing prompt_types.json whenever it changes"""
+    template_store = get_template_store()
     try:
-        with open("prompt_types.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        st.error("prompt_types.json file not found!")
-        return {}
+        template_store.sync_json("prompt_types.json")
+    except (OSError, ValueError) as e:
+        st.error(f"Could not import prompt_types.json: {str(e)}")
+    return template_store
 
 
 def load_models() -> List[str]:
@@ -199,7 +259,115 @@ def is_unsafe_model(model_name: str) -> bool:
     return "⚠️" in model_name
 
 
+def render_registry_stats(registry_stats):
+    """Render model registry memory usage and counters"""
+    st.write(
+        f"**Resident:** {registry_stats['resident_bytes'] / (1024 * 1024):.0f}MB "
+        f"/ {registry_stats['budget_bytes'] / (1024 * 1024):.0f}MB budget"
+    )
+    st.write(
+        f"**Hits:** {registry_stats['hits']} · **Misses:** {registry_stats['misses']} "
+        f"· **Evictions:** {registry_stats['evictions']}"
+    )
+    for name, details in registry_stats["models"].items():
+        st.caption(
+            f"{name}: {details['bytes'] / (1024 * 1024):.0f}MB, "
+            f"idle {details['idle_seconds']:.0f}s"
+        )
+
+
+def render_worker_pool_stats(worker_client):
+    """Render the status of the out-of-process model workers"""
+    try:
+        pool_stats = worker_client.stats()
+    except (OSError, EOFError, AuthenticationError) as e:
+        st.error(f"❌ Model worker pool at {worker_client.address} is unreachable: {str(e)}")
+        return
+
+    st.write(
+        f"**Worker pool:** {pool_stats['num_workers']} workers · "
+        f"{pool_stats['inflight']} running · {pool_stats['restarts']} restarts"
+    )
+    for worker_id, worker in pool_stats["workers"].items():
+        status = "🟢" if worker["alive"] else "🔴"
+        st.write(f"{status} **Worker {worker_id}** (pid {worker['pid']})")
+        if worker["registry"]:
+            render_registry_stats(worker["registry"])
+
+
+def render_model_response(
+    index: int,
+    model_name: str,
+    response: str,
+    timing: float,
+    show_timing: bool,
+    cached: bool = False,
+    metrics: Dict = None,
+):
+    """Render a single model's response card with timing and copy button"""
+    model_info = get_model_info(model_name)
+
+    # Model header with colored background
+    color = ["#FF6B6B", "#4ECDC4", "#45B7D1"][index % 3]
+    st.markdown(
+        f"""
+    <div style="background-color: {color}; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
+        <h4 style="color: white; margin: 0;">{model_info['type']}</h4>
+        <small style="color: white;">{model_name}</small>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    # Response
+    if response.startswith("❌"):
+        st.error(response)
+    else:
+        st.success(response)
+
+    # Timing info
+    if show_timing:
+        timing_text = f"⏱️ Generated in {timing:.2f}s"
+        if cached:
+            timing_text += " (⚡ cached)"
+        elif metrics and "time_to_first_token" in metrics:
+            timing_text += (
+                f" · first token {metrics['time_to_first_token']:.2f}s"
+                f" · {metrics['tokens_per_sec']:.1f} tok/s"
+            )
+            if metrics.get("stopped_early"):
+                timing_text += (
+                    f" · 🛑 stopped on filtered output, saved {metrics['tokens_saved']} tokens"
+                    f" (~{metrics['cpu_time_saved']:.2f}s CPU)"
+                )
+        st.caption(timing_text)
+
+    # Copy button for individual response
+    if st.button(f"📋 Copy", key=f"copy_{model_name.replace('/', '_')}"):
+        if CLIPBOARD_AVAILABLE and copy_to_clipboard(response):
+            st.success("✅ Copied!")
+        else:
+            st.info("📋 Copy:")
+            st.code(response)
+
+
+READINESS_ICONS = {
+    "ready": "✅ Ready",
+    "pending": "🕓 Queued for preload",
+    "loading": "⏳ Loading",
+    "warming up": "🔥 Warming up",
+    "failed": "❌ Failed to load",
+    "not loaded": "💤 Loads on first use",
+}
+
+
 def main():
+    # Preload configured models in the background (once per server process);
+    # a worker pool preloads them in its own processes instead
+    worker_client = get_worker_client()
+    if worker_client is None:
+        start_preload()
+
     # Initialize session state
     initialize_session_state()
 
@@ -225,14 +393,13 @@ def main():
     )
 
     # Load data
-    prompt_types = load_prompt_types()
+    template_store = load_template_store()
     models = load_models()
 
     # Initialize additional session state
     if "current_prompt_type" not in st.session_state:
-        st.session_state.current_prompt_type = (
-            list(prompt_types.keys())[0] if prompt_types else ""
-        )
+        first_names = template_store.list_names(limit=1)
+        st.session_state.current_prompt_type = first_names[0] if first_names else ""
     if "template_text" not in st.session_state:
         st.session_state.template_text = ""
     if "user_input" not in st.session_state:
@@ -263,12 +430,47 @@ def main():
             value=st.session_state.remember_session,
             help="Save prompts and responses in session memory",
         )
+    if st.session_state.remember_session:
+        with st.sidebar.expander("🔑 History Key"):
+            st.caption(
+                "Your history is kept on the server under this private key. Anyone "
+                "who has it can read and clear your history, so do not share it. "
+                "Enter it in a later session to resume your history."
+            )
+            st.code(st.session_state.history_id, language=None)
+            st.text_input("Resume history", key="resume_history_key", type="password")
+            st.button("📂 Resume", key="resume_history", on_click=resume_history)
 
     st.sidebar.markdown("---")
 
-    # Prompt Type Selector
-    if prompt_types:
-        prompt_type_names = list(prompt_types.keys())
+    # Prompt Type Selector: one page of the template library, optionally searched
+    template_query = st.sidebar.text_input(
+        "🔍 Search Templates",
+        key="template_query",
+        help="Find prompt types by name or description",
+    )
+    template_count = template_store.count(template_query)
+    template_page = 0
+    if template_count > TEMPLATE_PAGE_SIZE:
+        page_count = -(-template_count // TEMPLATE_PAGE_SIZE)
+        template_page = (
+            st.sidebar.number_input(
+                f"Page (of {page_count})", min_value=1, max_value=page_count, value=1,
+                key="template_page",
+            )
+            - 1
+        )
+    prompt_type_names = template_store.list_names(
+        template_query, offset=template_page * TEMPLATE_PAGE_SIZE, limit=TEMPLATE_PAGE_SIZE
+    )
+    # Keep the current selection while searching or paging
+    if (
+        st.session_state.current_prompt_type not in prompt_type_names
+        and template_store.get(st.session_state.current_prompt_type) is not None
+    ):
+        prompt_type_names.insert(0, st.session_state.current_prompt_type)
+
+    if prompt_type_names:
         selected_prompt_type = st.sidebar.selectbox(
             "📝 Prompt Type",
             prompt_type_names,
@@ -281,14 +483,35 @@ def main():
             key="prompt_type_selector",
         )
 
+        prompt_data = template_store.get(selected_prompt_type) or {}
+
         # Update session state and auto-fill template when prompt type changes
         if selected_prompt_type != st.session_state.current_prompt_type:
             st.session_state.current_prompt_type = selected_prompt_type
-            if selected_prompt_type in prompt_types:
-                st.session_state.template_text = prompt_types[selected_prompt_type].get(
-                    "template", ""
-                )
+            if prompt_data:
+                set_template_text(prompt_data.get("template", ""))
                 st.rerun()
+
+        # Hot reload: pick up a new version of the selected template unless it was edited here
+        loaded = st.session_state.get("loaded_template")
+        if (
+            prompt_data
+            and loaded
+            and loaded[0] == selected_prompt_type
+            and loaded[1] != prompt_data["version"]
+            and st.session_state.template_text == loaded[2]
+        ):
+            set_template_text(prompt_data["template"])
+            st.sidebar.info(f"🔄 {selected_prompt_type} updated to version {prompt_data['version']}")
+        if prompt_data:
+            st.session_state.loaded_template = (
+                selected_prompt_type,
+                prompt_data["version"],
+                prompt_data["template"],
+            )
+    elif template_query:
+        st.sidebar.warning("No prompt types match your search")
+        return
     else:
         st.sidebar.error("No prompt types available")
         return
@@ -335,15 +558,14 @@ def main():
     st.sidebar.subheader("📝 Template Editor")
 
     # Auto-fill template if needed
-    if not st.session_state.template_text and selected_prompt_type in prompt_types:
-        st.session_state.template_text = prompt_types[selected_prompt_type].get(
-            "template", ""
-        )
+    if not st.session_state.template_text and prompt_data:
+        st.session_state.template_text = prompt_data.get("template", "")
 
     # Template text area
+    if "template_editor" not in st.session_state:
+        st.session_state.template_editor = st.session_state.template_text
     template_text = st.sidebar.text_area(
         "Edit Template:",
-        value=st.session_state.template_text,
         height=150,
         help="Edit the prompt template. Use {input} as placeholder for user input.",
         key="template_editor",
@@ -358,18 +580,35 @@ def main():
         st.sidebar.error(f"⚠️ {error_msg}")
 
     # Quick template actions
-    col1, col2 = st.sidebar.columns(2)
+    col1, col2, col3 = st.sidebar.columns(3)
     with col1:
-        if st.button(
-            "🔄 Reset", help="Reset to original template", key="reset_template"
-        ):
-            if selected_prompt_type in prompt_types:
-                st.session_state.template_text = prompt_types[selected_prompt_type].get(
-                    "template", ""
-                )
-                st.rerun()
+        # A callback, so the editor's own state can still be changed before it is drawn
+        st.button(
+            "🔄 Reset",
+            help="Reset to the saved template",
+            key="reset_template",
+            disabled=not prompt_data,
+            on_click=set_template_text,
+            args=(prompt_data.get("template", ""),),
+        )
 
     with col2:
+        if st.button(
+            "💾 Save",
+            help="Save the template as a new version of this prompt type",
+            key="save_template",
+            disabled=not is_valid or template_text == prompt_data.get("template"),
+        ):
+            version = template_store.save(
+                selected_prompt_type,
+                template_text,
+                prompt_data.get("description", ""),
+                prompt_data.get("input_placeholder", ""),
+            )
+            st.session_state.loaded_template = (selected_prompt_type, version, template_text)
+            st.sidebar.success(f"✅ Saved version {version}")
+
+    with col3:
         if st.button("📋 Copy", help="Copy template to clipboard", key="copy_template"):
             if CLIPBOARD_AVAILABLE and copy_to_clipboard(template_text):
                 st.sidebar.success("✅ Copied!")
@@ -382,10 +621,8 @@ def main():
 
     # Get placeholder text
     placeholder_text = ""
-    if selected_prompt_type in prompt_types:
-        placeholder_text = prompt_types[selected_prompt_type].get(
-            "input_placeholder", "Enter your input here..."
-        )
+    if prompt_data:
+        placeholder_text = prompt_data.get("input_placeholder") or "Enter your input here..."
 
     user_input = st.sidebar.text_area(
         "Your Input:",
@@ -400,7 +637,8 @@ def main():
     st.session_state.user_input = user_input
 
     # Input validation
-    validation_message, is_valid_input = validate_input(user_input)
+    with span("validate_input"):
+        validation_message, is_valid_input = validate_input(user_input)
     if validation_message and not is_valid_input:
         st.sidebar.error(validation_message)
     elif validation_message and is_valid_input:
@@ -428,6 +666,98 @@ def main():
     show_timing = st.sidebar.checkbox(
         "⏱️ Show Generation Time", value=True, help="Display time taken for each model"
     )
+    deterministic = st.sidebar.checkbox(
+        "🎯 Deterministic Decoding",
+        value=False,
+        help="Use greedy decoding so repeated runs are served from the response cache",
+    )
+    seed_value = st.sidebar.number_input(
+        "🎲 Sampling Seed",
+        min_value=0,
+        value=0,
+        step=1,
+        help="0 = random. A fixed seed makes sampling reproducible and cacheable",
+        disabled=deterministic,
+    )
+    precision = st.sidebar.selectbox(
+        "🧮 Inference Precision",
+        PRECISION_MODES,
+        index=PRECISION_MODES.index(DEFAULT_PRECISION),
+        help="fp32 = full precision, bf16 = half memory on CPUs with native support, "
+        "int8 = dynamic quantization of Linear layers",
+    )
+    stream_tokens = st.sidebar.checkbox(
+        "📡 Stream Tokens",
+        value=True,
+        help="Show model output as it is generated and record time-to-first-token",
+    )
+    run_concurrently = st.sidebar.checkbox(
+        "⚡ Run Models Concurrently",
+        value=True,
+        help=f"Process up to {DEFAULT_MAX_WORKERS} selected models in parallel instead of one after another",
+    )
+
+    # Model memory usage
+    with st.sidebar.expander("🧮 Model Memory"):
+        if worker_client is not None:
+            render_worker_pool_stats(worker_client)
+        else:
+            render_registry_stats(get_model_registry().stats())
+        prefix_stats = get_prefix_cache().stats()
+        st.write(
+            f"**Prefix cache:** {prefix_stats['hit_rate']:.0%} hit rate · "
+            f"{prefix_stats['prefill_tokens_saved']} tokens / "
+            f"{prefix_stats['prefill_seconds_saved']:.2f}s prefill saved"
+        )
+        batch_stats = get_micro_batcher().stats()
+        st.write(
+            f"**Micro-batching:** {batch_stats['batches']} batches · "
+            f"mean size {batch_stats['mean_batch_size']:.1f} · "
+            f"queue p95 {batch_stats['queue_delay']['p95'] * 1000:.0f}ms"
+        )
+        if batch_stats["batch_size_histogram"]:
+            st.caption(
+                "Batch sizes: "
+                + ", ".join(
+                    f"{size}×{count}"
+                    for size, count in batch_stats["batch_size_histogram"].items()
+                )
+            )
+
+    # Where request time goes, per stage
+    with st.sidebar.expander("⏱️ Stage Timings"):
+        trace_data = get_tracer().to_json()
+        if trace_data["spans"]:
+            st.dataframe(
+                [
+                    {
+                        "Stage": entry["name"],
+                        "Labels": ", ".join(f"{k}={v}" for k, v in entry["labels"].items()),
+                        "Count": entry["count"],
+                        "Mean (ms)": round(entry["mean_seconds"] * 1000, 2),
+                        "Max (ms)": round(entry["max_seconds"] * 1000, 2),
+                        "Total (s)": round(entry["total_seconds"], 3),
+                    }
+                    for entry in trace_data["spans"]
+                ],
+                hide_index=True,
+            )
+            st.download_button(
+                "📥 Download JSON",
+                data=json.dumps(trace_data, indent=2),
+                file_name="prompt_studio_traces.json",
+                mime="application/json",
+                key="download_traces_json",
+            )
+            st.download_button(
+                "📥 Download Prometheus",
+                data=get_tracer().to_prometheus(),
+                file_name="prompt_studio_metrics.prom",
+                mime="text/plain",
+                key="download_traces_prom",
+            )
+        else:
+            st.caption("No requests traced yet")
 
     # Main Panel
     col1, col2 = st.columns([1, 1])
@@ -435,15 +765,13 @@ def main():
     with col1:
         st.subheader("📋 Prompt Template & Preview")
 
-        if selected_prompt_type in prompt_types:
-            prompt_data = prompt_types[selected_prompt_type]
-
+        if prompt_data:
             # Show description in expander
             with st.expander("ℹ️ About this prompt type", expanded=False):
-                st.write(prompt_data.get("description", "No description available"))
+                st.write(prompt_data.get("description") or "No description available")
 
                 # Show input guidance
-                if "input_placeholder" in prompt_data:
+                if prompt_data.get("input_placeholder"):
                     st.write("**Input Guidance:**")
                     st.write(f"💡 {prompt_data['input_placeholder']}")
 
@@ -459,10 +787,22 @@ def main():
             final_prompt = format_prompt(template_text, user_input.strip())
             st.code(final_prompt, language="text")
 
-            # Token estimation
-            token_count = count_tokens_estimate(final_prompt)
+            # Exact counts from the tokenizers of loaded models, otherwise an estimate
+            token_counts = {}
+            for model in selected_models:
+                actual_model_name = get_actual_model_name(model)
+                if get_token_counter(actual_model_name, load=False) is not None:
+                    token_counts[actual_model_name] = count_tokens(
+                        final_prompt, actual_model_name, load=False
+                    )
+            token_count = max(token_counts.values(), default=count_tokens_estimate(final_prompt))
             if token_count > 400:
                 st.warning(f"⚠️ Long prompt ({token_count} tokens). May be truncated.")
+            elif token_counts:
+                st.info(
+                    "📊 Tokens: "
+                    + ", ".join(f"{count} ({name})" for name, count in token_counts.items())
+                )
             else:
                 st.info(f"📊 Estimated tokens: {token_count}")
 
@@ -481,9 +821,11 @@ def main():
         if selected_models:
             with st.expander("🤖 Selected Models Information"):
                 for model in selected_models:
-                    model_info = get_model_info(model)
+                    actual_model_name = get_actual_model_name(model)
+                    model_info = get_model_info(actual_model_name)
+                    readiness = READINESS_ICONS[get_readiness(actual_model_name, precision)]
                     st.write(
-                        f"**{model}**: {model_info['type']} ({model_info['size']})"
+                        f"**{model}**: {model_info['type']} ({model_info['size']}) — {readiness}"
                     )
 
         # Handle generation
@@ -500,8 +842,10 @@ def main():
                 st.error("⚠️ Please fix input validation issues before generating!")
             else:
                 # Create safe prompt - use safe formatting for better control
-                raw_prompt = format_prompt(template_text, user_input.strip())
-                final_prompt = safe_format_prompt(raw_prompt)
+                with span("format_prompt"):
+                    raw_prompt = format_prompt(template_text, user_input.strip())
+                with span("safe_format_prompt"):
+                    final_prompt = safe_format_prompt(raw_prompt)
 
                 # Show what we're generating
                 st.write("**📝 Generating for:**")
@@ -510,53 +854,102 @@ def main():
                 # Initialize results storage
                 model_responses = {}
                 generation_times = {}
+                generation_metrics = {}
+
+                # Create columns for side-by-side comparison
+                st.write("**🔧 Prompt Engineering Analysis:**")
+                if len(selected_models) == 1:
+                    cols = st.columns(1)
+                elif len(selected_models) == 2:
+                    cols = st.columns(2)
+                else:
+                    cols = st.columns(3)
+
+                # Reserve a slot per model so each result renders as soon as it is ready
+                result_slots = {}
+                for i, model_name in enumerate(selected_models):
+                    with cols[i]:
+                        result_slots[model_name] = st.empty()
+                        result_slots[model_name].info(f"⏳ Waiting for {model_name}...")
 
                 # Generate responses for each model
                 progress_bar = st.progress(0)
                 status_text = st.empty()
+                actual_names = {
+                    get_actual_model_name(model_name): model_name
+                    for model_name in selected_models
+                }
+                generation_params = {
+                    "max_new_tokens": 50,
+                    "do_sample": not deterministic,
+                    "seed": int(seed_value) if seed_value and not deterministic else None,
+                    "precision": precision,
+                    "static_prefix": get_static_prefix(template_text),
+                }
+
+                def show_partial(model_name, text):
+                    result_slots[model_name].info(f"{text} ▌")
+
+                wall_clock_start = time.time()
+                if run_concurrently:
+                    status_text.text(
+                        f"Processing {len(selected_models)} models concurrently..."
+                    )
+                    results = run_models_concurrently(
+                        list(actual_names.keys()),
+                        final_prompt,
+                        max_workers=DEFAULT_MAX_WORKERS,
+                        stream=stream_tokens,
+                        **generation_params,
+                    )
+                else:
+                    status_text.text(
+                        f"Processing with {get_actual_model_name(selected_models[0])}..."
+                    )
+                    results = (
+                        run_model(
+                            actual_model_name,
+                            final_prompt,
+                            on_chunk=(
+                                (lambda text, name=model_name: show_partial(name, text))
+                                if stream_tokens
+                                else None
+                            ),
+                            **generation_params,
+                        )
+                        for actual_model_name, model_name in actual_names.items()
+                    )
 
-                for i, model_name in enumerate(selected_models):
-                    # Get the actual model name for loading
-                    actual_model_name = get_actual_model_name(model_name)
-                    status_text.text(f"Loading {actual_model_name}...")
-                    progress_bar.progress((i) / len(selected_models))
-
-                    # Load model
-                    with st.spinner(f"Loading {actual_model_name}..."):
-                        model_pipeline = load_model(actual_model_name)
-
-                    if model_pipeline is not None:
-                        status_text.text(f"Generating with {actual_model_name}...")
-
-                        # Time the generation
-                        start_time = time.time()
-                        with st.spinner(f"Processing with {actual_model_name}..."):
-                            # Handle prompt engineering tools
-                            if actual_model_name in ["prompt_refiner", "prompt_analyzer", "few_shot_generator", "cot_builder", "fakegpt"]:
-                                raw_generated_text = model_pipeline(final_prompt)
-                            else:
-                                raw_generated_text = generate_text(
-                                    model_pipeline, final_prompt, max_new_tokens=50
-                                )
-                        end_time = time.time()
-
-                        # Apply safety filtering (skip for prompt engineering tools)
-                        if actual_model_name in ["prompt_refiner", "prompt_analyzer", "few_shot_generator", "cot_builder", "fakegpt"]:
-                            filtered_text = raw_generated_text
-                            was_filtered = False
-                        else:
-                            filtered_text, was_filtered = filter_output(raw_generated_text)
-
-                        # Store the result
-                        model_responses[model_name] = filtered_text
-                        generation_times[model_name] = end_time - start_time
-
-                        # Log if content was filtered (for debugging)
-                        if was_filtered:
-                            print(f"Content filtered for model {model_name}")
-                    else:
-                        model_responses[model_name] = "❌ Failed to load model"
-                        generation_times[model_name] = 0
+                completed = 0
+                for result in results:
+                    model_name = actual_names[result["model_name"]]
+                    if "partial" in result:
+                        show_partial(model_name, result["partial"])
+                        continue
+
+                    # Store the result
+                    model_responses[model_name] = result["response"]
+                    generation_times[model_name] = result["generation_time"]
+                    generation_metrics[model_name] = result["metrics"]
+
+                    with result_slots[model_name].container():
+                        render_model_response(
+                            selected_models.index(model_name),
+                            model_name,
+                            result["response"],
+                            result["generation_time"],
+                            show_timing,
+                            result.get("cached", False),
+                            result["metrics"],
+                        )
+
+                    completed += 1
+                    progress_bar.progress(completed / len(selected_models))
+                    if not run_concurrently and completed < len(selected_models):
+                        status_text.text(
+                            f"Processing with {get_actual_model_name(selected_models[completed])}..."
+                        )
+                wall_clock_time = time.time() - wall_clock_start
 
                 progress_bar.progress(1.0)
                 status_text.text("Generation complete!")
@@ -565,6 +958,8 @@ def main():
                 st.session_state.last_generated_responses = model_responses
                 st.session_state.last_models_used = selected_models
                 st.session_state.generation_times = generation_times
+                st.session_state.wall_clock_time = wall_clock_time
+                st.session_state.generation_metrics = generation_metrics
 
                 # Save to session memory if enabled
                 save_to_session_memory(
@@ -580,55 +975,12 @@ def main():
                 progress_bar.empty()
                 status_text.empty()
 
-                # Display results side by side
-                st.write("**🔧 Prompt Engineering Analysis:**")
-
-                # Create columns for side-by-side comparison
-                if len(selected_models) == 1:
-                    cols = st.columns(1)
-                elif len(selected_models) == 2:
-                    cols = st.columns(2)
-                else:
-                    cols = st.columns(3)
-
-                # Display each model's response
-                for i, model_name in enumerate(selected_models):
-                    with cols[i]:
-                        model_info = get_model_info(model_name)
-
-                        # Model header with colored background
-                        color = ["#FF6B6B", "#4ECDC4", "#45B7D1"][i % 3]
-                        st.markdown(
-                            f"""
-                        <div style="background-color: {color}; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                            <h4 style="color: white; margin: 0;">{model_info['type']}</h4>
-                            <small style="color: white;">{model_name}</small>
-                        </div>
-                        """,
-                            unsafe_allow_html=True,
-                        )
-
-                        # Response
-                        response = model_responses.get(model_name, "No response")
-                        if response.startswith("❌"):
-                            st.error(response)
-                        else:
-                            st.success(response)
-
-                        # Timing info
-                        if show_timing and model_name in generation_times:
-                            timing = generation_times[model_name]
-                            st.caption(f"⏱️ Generated in {timing:.2f}s")
-
-                        # Copy button for individual response
-                        if st.button(
-                            f"📋 Copy", key=f"copy_{model_name.replace('/', '_')}"
-                        ):
-                            if CLIPBOARD_AVAILABLE and copy_to_clipboard(response):
-                                st.success("✅ Copied!")
-                            else:
-                                st.info("📋 Copy:")
-                                st.code(response)
+                # Wall-clock latency next to the per-model generation times
+                if show_timing:
+                    st.caption(
+                        f"⏱️ Wall-clock: {wall_clock_time:.2f}s "
+                        f"(sum of model times: {sum(generation_times.values()):.2f}s)"
+                    )
 
                 # Difference highlighting if enabled
                 if highlight_differences and len(selected_models) > 1:
@@ -642,30 +994,41 @@ def main():
                     }
 
                     if len(valid_responses) >= 2:
-                        models_list = list(valid_responses.keys())
-
-                        # Compare first two models
-                        model1, model2 = models_list[0], models_list[1]
-                        response1 = valid_responses[model1]
-                        response2 = valid_responses[model2]
-
-                        # Generate diff
-                        diff = list(
-                            difflib.unified_diff(
-                                response1.split(),
-                                response2.split(),
-                                fromfile=model1,
-                                tofile=model2,
-                                lineterm="",
-                            )
+                        # Similarity of every pair of models, diffs cached by response
+                        comparison = compare_responses(valid_responses)
+                        st.dataframe(
+                            {
+                                "Model": comparison.models,
+                                **{
+                                    model: [f"{row[i]:.0%}" for row in comparison.matrix]
+                                    for i, model in enumerate(comparison.models)
+                                },
+                            },
+                            hide_index=True,
                         )
 
-                        if diff:
-                            st.code("\n".join(diff), language="diff")
-                        else:
-                            st.info(
-                                "No significant differences found between responses"
-                            )
+                        # Most different pairs first
+                        pairs = sorted(
+                            comparison.diffs.items(), key=lambda item: item[1].similarity
+                        )
+                        for index, ((model1, model2), pair) in enumerate(pairs):
+                            with st.expander(
+                                f"{model1} ↔ {model2} ({pair.similarity:.0%} similar)",
+                                expanded=index == 0,
+                            ):
+                                diff = unified_diff(
+                                    valid_responses[model1].split(),
+                                    valid_responses[model2].split(),
+                                    pair.opcodes,
+                                    fromfile=model1,
+                                    tofile=model2,
+                                )
+                                if diff:
+                                    st.code("\n".join(diff), language="diff")
+                                else:
+                                    st.info(
+                                        "No significant differences found between responses"
+                                    )
                     else:
                         st.info("Need at least 2 valid responses to show differences")
 
@@ -684,6 +1047,7 @@ def main():
                         model_responses,
                         generation_times,
                         "txt",
+                        wall_clock_time,
                     )
                     st.download_button(
                         label="📄 Download as TXT",
@@ -702,6 +1066,7 @@ def main():
                         model_responses,
                         generation_times,
                         "md",
+                        wall_clock_time,
                     )
                     st.download_button(
                         label="📝 Download as Markdown",
@@ -754,6 +1119,7 @@ def main():
                         st.session_state.last_generated_responses,
                         st.session_state.generation_times,
                         "txt",
+                        st.session_state.wall_clock_time,
                     )
                     st.download_button(
                         label="📄 Download as TXT",
@@ -771,6 +1137,7 @@ def main():
                         st.session_state.last_generated_responses,
                         st.session_state.generation_times,
                         "md",
+                        st.session_state.wall_clock_time,
                     )
                     st.download_button(
                         label="📝 Download as Markdown",
@@ -779,18 +1146,46 @@ def main():
                         mime="text/markdown",
                     )
 
-        # Session Memory Display
-        if st.session_state.remember_session and st.session_state.session_memory:
+        # Session Memory Display: one page at a time from the history store
+        history_store = get_history_store()
+        history_id = st.session_state.history_id
+        if st.session_state.remember_session and history_store.count(history_id):
             st.markdown("---")
             st.write("**💾 Session Memory:**")
 
             with st.expander(
-                f"📚 View Previous Sessions ({len(st.session_state.session_memory)})"
+                f"📚 View Previous Sessions ({history_store.count(history_id)})"
             ):
-                for i, session in enumerate(reversed(st.session_state.session_memory)):
-                    st.write(
-                        f"**Session {len(st.session_state.session_memory) - i}** - {session['timestamp']}"
+                facets = history_store.facets(history_id)
+                filter_col1, filter_col2 = st.columns(2)
+                with filter_col1:
+                    type_filter = st.selectbox(
+                        "Prompt Type", ["All"] + facets["prompt_types"], key="history_prompt_type"
                     )
+                with filter_col2:
+                    model_filter = st.selectbox(
+                        "Model", ["All"] + facets["models"], key="history_model"
+                    )
+                filters = {
+                    "prompt_type": None if type_filter == "All" else type_filter,
+                    "model": None if model_filter == "All" else model_filter,
+                }
+                # Go back to the newest page when the filters change
+                if st.session_state.get("history_filters") != filters:
+                    st.session_state.history_filters = filters
+                    st.session_state.history_cursors = [None]
+
+                cursors = st.session_state.history_cursors
+                page_start = (len(cursors) - 1) * HISTORY_PAGE_SIZE
+                matching = history_store.count(history_id, **filters)
+                sessions = history_store.page(
+                    history_id, cursors[-1], HISTORY_PAGE_SIZE, **filters
+                )
+                for i, session in enumerate(sessions):
+                    timestamp = datetime.fromtimestamp(session["created_at"]).strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    )
+                    st.write(f"**Session {matching - page_start - i}** - {timestamp}")
                     st.write(f"📝 Prompt Type: {session['prompt_type']}")
                     st.write(f"💬 Input: {session['user_input'][:100]}...")
 
@@ -802,12 +1197,31 @@ def main():
                             f"🤖 {model}: {response[:50]}... (⏱️ {time_taken:.2f}s)"
                         )
 
-                    if i < len(st.session_state.session_memory) - 1:
+                    if i < len(sessions) - 1:
                         st.markdown("---")
 
+                # Page through older sessions
+                nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+                with nav_col1:
+                    if len(cursors) > 1 and st.button("⬅️ Newer", key="history_newer"):
+                        cursors.pop()
+                        st.rerun()
+                with nav_col2:
+                    if sessions:
+                        st.caption(
+                            f"Showing {page_start + 1}–{page_start + len(sessions)} of {matching}"
+                        )
+                with nav_col3:
+                    if page_start + len(sessions) < matching and st.button(
+                        "Older ➡️", key="history_older"
+                    ):
+                        cursors.append(sessions[-1]["cursor"])
+                        st.rerun()
+
                 # Clear session memory button
                 if st.button("🗑️ Clear Session Memory"):
-                    st.session_state.session_memory = []
+                    history_store.clear(history_id)
+                    st.session_state.history_cursors = [None]
                     st.rerun()
 
         else:
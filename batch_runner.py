@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Headless batch runner for Prompt Engineering Studio.
+
+Streams a JSONL file of requests through the same validate → format →
+safety-wrap → generate → filter path as the Streamlit app and writes one
+result per line to an output JSONL file. Input is read in bounded chunks, so
+memory stays constant regardless of file size, and a checkpoint file allows
+interrupted runs to resume.
+
+Each input line is a JSON object:
+    {"id": "optional", "prompt_type": "Zero-shot", "input": "What is a prompt?",
+     "models": ["prompt_refiner", "distilgpt2"],
+     "params": {"max_new_tokens": 50, "do_sample": false, "seed": null, "precision": "fp32"},
+     "template": "optional template overriding prompt_type"}
+
+Usage:
+    python batch_runner.py requests.jsonl results.jsonl [--workers 4] [--resume]
+    python batch_runner.py requests.jsonl token_counts.jsonl --count-tokens distilgpt2
+    python batch_runner.py dataset.csv prompts.jsonl --render Zero-shot [--count-tokens distilgpt2]
+"""
+
+import os
+import sys
+import json
+import argparse
+import multiprocessing
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.prompt_formatter import format_prompt, validate_template
+from utils.safety import safe_format_prompt, validate_input
+from utils.tracing import span
+
+DEFAULT_PROMPT_TYPES_PATH = "prompt_types.json"
+DEFAULT_MODELS = ["prompt_refiner"]
+ALLOWED_PARAMS = ["max_new_tokens", "do_sample", "seed", "precision"]
+
+# Set in each worker by _init_worker
+_prompt_types: Dict[str, Any] = {}
+
+
+def load_prompt_types(path: str = DEFAULT_PROMPT_TYPES_PATH) -> Dict[str, Any]:
+    """Load prompt types from JSON file"""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"⚠️ {path} not found, requests must provide a template", file=sys.stderr)
+        return {}
+
+
+def _init_worker(prompt_types: Dict[str, Any], torch_threads: int):
+    """Per-process setup: share prompt types and avoid CPU oversubscription"""
+    global _prompt_types
+    _prompt_types = prompt_types
+    # torch is imported lazily, so this applies to models loaded in this worker
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    os.environ["MKL_NUM_THREADS"] = str(torch_threads)
+
+
+def _parse_record(line: str) -> Dict[str, Any]:
+    """
+    Parse one request line and check the types of its fields.
+
+    Args:
+        line (str): Raw JSON line
+
+    Returns:
+        dict: The request
+
+    Raises:
+        ValueError: With the message reported as the record's error
+    """
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {str(e)}")
+    if not isinstance(record, dict):
+        raise ValueError("Request is not a JSON object")
+
+    for field in ("prompt_type", "input", "template"):
+        if record.get(field) is not None and not isinstance(record[field], str):
+            raise ValueError(f"'{field}' must be a string")
+    models = record.get("models")
+    if models is not None and not (
+        isinstance(models, list) and all(isinstance(model, str) for model in models)
+    ):
+        raise ValueError("'models' must be a list of model names")
+    params = record.get("params")
+    if params is None:
+        return record
+    if not isinstance(params, dict):
+        raise ValueError("'params' must be a JSON object")
+
+    # Same checks as the API server
+    max_new_tokens = params.get("max_new_tokens", 50)
+    if not _is_int(max_new_tokens) or max_new_tokens <= 0:
+        raise ValueError("'max_new_tokens' must be a positive integer")
+    if not isinstance(params.get("do_sample", True), bool):
+        raise ValueError("'do_sample' must be true or false")
+    seed = params.get("seed")
+    if seed is not None and not _is_int(seed):
+        raise ValueError("'seed' must be an integer or null")
+    if params.get("precision") is not None and not isinstance(params["precision"], str):
+        raise ValueError("'precision' must be a string")
+    return record
+
+
+def _is_int(value: Any) -> bool:
+    """JSON integers only; bool is a subclass of int in Python"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def process_record(line_number: int, line: str) -> Dict[str, Any]:
+    """
+    Run one request through the app's generation path.
+
+    Args:
+        line_number (int): 1-based line number in the input file
+        line (str): Raw JSON line
+
+    Returns:
+        dict: The result record written to the output file
+    """
+    from models.runner import run_model, get_static_prefix
+
+    result = {"line": line_number}
+    try:
+        record = _parse_record(line)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+
+    result["id"] = record.get("id")
+    prompt_type = record.get("prompt_type") or ""
+    user_input = record.get("input") or ""
+    models = record.get("models") or DEFAULT_MODELS
+    params = {k: v for k, v in (record.get("params") or {}).items() if k in ALLOWED_PARAMS}
+    result.update({"prompt_type": prompt_type, "input": user_input, "models": models})
+
+    template = record.get("template") or _prompt_types.get(prompt_type, {}).get("template", "")
+    if not template:
+        result["error"] = f"Unknown prompt type '{prompt_type}' and no template given"
+        return result
+
+    # Same validation as the app
+    is_valid, error_msg = validate_template(template)
+    if not is_valid:
+        result["error"] = f"Template error: {error_msg}"
+        return result
+    with span("validate_input"):
+        validation_message, is_valid_input = validate_input(user_input)
+    if not is_valid_input:
+        result["error"] = validation_message
+        return result
+
+    with span("format_prompt"):
+        raw_prompt = format_prompt(template, user_input.strip())
+    with span("safe_format_prompt"):
+        final_prompt = safe_format_prompt(raw_prompt)
+    static_prefix = get_static_prefix(template)
+    result["final_prompt"] = final_prompt
+
+    responses, generation_times, filtered, errors = {}, {}, {}, []
+    for model_name in models:
+        run = run_model(model_name, final_prompt, static_prefix=static_prefix, **params)
+        responses[model_name] = run["response"]
+        generation_times[model_name] = run["generation_time"]
+        filtered[model_name] = run["was_filtered"]
+        # Load and generation failures come back as a "❌ ..." response
+        if not run["loaded"] or run["response"].startswith("❌"):
+            errors.append(run["response"].split("\n\n")[0])
+
+    result.update(
+        {"responses": responses, "generation_times": generation_times, "was_filtered": filtered}
+    )
+    if errors:
+        result["error"] = "; ".join(errors)
+    return result
+
+
+def _process_item(item: Tuple[int, str]) -> Dict[str, Any]:
+    return process_record(*item)
+
+
+def _read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    """Atomically replace the checkpoint file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def iter_lines(path: str, skip: int = 0) -> Iterator[Tuple[int, str]]:
+    """
+    Stream non-empty lines with their 1-based line numbers.
+
+    Args:
+        path (str): Input JSONL file
+        skip (int): Number of leading lines already processed
+
+    Yields:
+        Tuple[int, str]: (line_number, line)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if line_number <= skip or not line.strip():
+                continue
+            yield line_number, line
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    workers: int = 1,
+    chunk_size: int = 16,
+    resume: bool = False,
+    prompt_types_path: str = DEFAULT_PROMPT_TYPES_PATH,
+    torch_threads: int = 1,
+) -> Dict[str, int]:
+    """
+    Process a JSONL request file, writing results incrementally.
+
+    Args:
+        input_path (str): Input JSONL file
+        output_path (str): Output JSONL file
+        workers (int): Number of worker processes (1 runs in-process)
+        chunk_size (int): Requests per worker per checkpoint interval
+        resume (bool): Continue from the checkpoint of a previous run
+        prompt_types_path (str): Prompt types JSON file
+        torch_threads (int): Intra-op threads per worker process
+
+    Returns:
+        dict: Number of processed and failed requests in this run
+    """
+    checkpoint_path = output_path + ".checkpoint"
+    checkpoint = _read_checkpoint(checkpoint_path) if resume else None
+    if checkpoint and checkpoint.get("input") != os.path.abspath(input_path):
+        raise ValueError(f"Checkpoint {checkpoint_path} belongs to another input file")
+
+    lines_done = checkpoint["lines_done"] if checkpoint else 0
+    output = open(output_path, "a+" if checkpoint else "w", encoding="utf-8")
+    if checkpoint:
+        # Drop results written after the last checkpoint; they will be redone
+        output.truncate(checkpoint["output_bytes"])
+        output.seek(0, os.SEEK_END)
+
+    prompt_types = load_prompt_types(prompt_types_path)
+    pool = None
+    if workers > 1:
+        pool = multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(prompt_types, torch_threads)
+        )
+        process = lambda batch: pool.imap(_process_item, batch)
+    else:
+        _init_worker(prompt_types, torch_threads)
+        process = lambda batch: map(_process_item, batch)
+
+    stats = {"processed": 0, "failed": 0}
+    lines = iter_lines(input_path, skip=lines_done)
+    try:
+        while True:
+            # Only one chunk per worker is in memory at a time
+            batch: List[Tuple[int, str]] = list(islice(lines, chunk_size * max(1, workers)))
+            if not batch:
+                break
+            for result in process(batch):
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                stats["processed"] += 1
+                if "error" in result:
+                    stats["failed"] += 1
+
+            output.flush()
+            os.fsync(output.fileno())
+            lines_done = batch[-1][0]
+            _write_checkpoint(
+                checkpoint_path,
+                {
+                    "input": os.path.abspath(input_path),
+                    "lines_done": lines_done,
+                    "output_bytes": output.tell(),
+                },
+            )
+            print(f"✅ Processed through line {lines_done}", file=sys.stderr)
+    finally:
+        output.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return stats
+
+
+def _prompt_segments(template: str) -> List[str]:
+    """Static text around the input in the final prompt for a template"""
+    marker = "\x00"  # Cannot appear in typed input
+    return safe_format_prompt(format_prompt(template, marker)).split(marker)
+
+
+def count_tokens_file(
+    input_path: str,
+    output_path: str,
+    model_name: str,
+    chunk_size: int = 1024,
+    prompt_types_path: str = DEFAULT_PROMPT_TYPES_PATH,
+) -> Dict[str, int]:
+    """
+    Count the tokens of every request's final prompt without generating.
+
+    Requests are read in chunks and grouped by template, so each template's
+    static text is tokenized once and the inputs of a chunk in one batch.
+
+    Args:
+        input_path (str): Input JSONL file
+        output_path (str): Output JSONL file of {"line", "id", "tokens"} records
+        model_name (str): Model whose tokenizer is used
+        chunk_size (int): Requests tokenized per batch
+        prompt_types_path (str): Prompt types JSON file
+
+    Returns:
+        dict: Number of processed and failed requests
+    """
+    from utils.token_counter import get_token_counter
+
+    counter = get_token_counter(model_name)
+    if counter is None:
+        raise ValueError(f"No tokenizer available for {model_name}")
+
+    prompt_types = load_prompt_types(prompt_types_path)
+    stats = {"processed": 0, "failed": 0}
+    lines = iter_lines(input_path)
+    with open(output_path, "w", encoding="utf-8") as output:
+        while True:
+            batch = list(islice(lines, chunk_size))
+            if not batch:
+                break
+
+            results: List[Dict[str, Any]] = []
+            by_template: Dict[str, List[Tuple[int, str]]] = {}
+            for line_number, line in batch:
+                result: Dict[str, Any] = {"line": line_number}
+                results.append(result)
+                try:
+                    record = _parse_record(line)
+                except ValueError as e:
+                    result["error"] = str(e)
+                    continue
+                result["id"] = record.get("id")
+                prompt_type = record.get("prompt_type") or ""
+                template = record.get("template") or prompt_types.get(prompt_type, {}).get(
+                    "template", ""
+                )
+                user_input = (record.get("input") or "").strip()
+                if not template:
+                    result["error"] = f"Unknown prompt type '{prompt_type}' and no template given"
+                elif not user_input:
+                    result["error"] = "Please enter some text"
+                else:
+                    by_template.setdefault(template, []).append((len(results) - 1, user_input))
+
+            for template, items in by_template.items():
+                counts = counter.count_prompts(
+                    _prompt_segments(template), [user_input for _, user_input in items]
+                )
+                for (index, _), count in zip(items, counts):
+                    results[index]["tokens"] = count
+
+            for result in results:
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                stats["processed"] += 1
+                if "error" in result:
+                    stats["failed"] += 1
+
+    return stats
+
+
+def render_file(
+    input_path: str,
+    output_path: str,
+    prompt_type: str,
+    model_name: Optional[str] = None,
+    batch_size: int = 1024,
+    prompt_types_path: str = DEFAULT_PROMPT_TYPES_PATH,
+) -> Dict[str, int]:
+    """
+    Render one prompt type's final prompt for every row of a table, without generating.
+
+    Rows are streamed in batches, so memory stays constant regardless of the
+    table size. Columns fill the template's variables by name, e.g. "input".
+
+    Args:
+        input_path (str): Input CSV, TSV, JSONL or Parquet table
+        output_path (str): Output JSONL file of {"row", "prompt", "tokens"} records
+        prompt_type (str): Prompt type whose template is rendered
+        model_name (str, optional): Also count tokens with this model's tokenizer
+        batch_size (int): Rows rendered per batch
+        prompt_types_path (str): Prompt types JSON file
+
+    Returns:
+        dict: Number of processed and failed rows
+    """
+    from utils.bulk_render import BulkRenderer
+    from utils.token_counter import get_token_counter
+
+    template = load_prompt_types(prompt_types_path).get(prompt_type, {}).get("template", "")
+    if not template:
+        raise ValueError(f"Unknown prompt type '{prompt_type}'")
+    is_valid, error_msg = validate_template(template)
+    if not is_valid:
+        raise ValueError(f"Template error: {error_msg}")
+
+    counter = None
+    if model_name:
+        counter = get_token_counter(model_name)
+        if counter is None:
+            raise ValueError(f"No tokenizer available for {model_name}")
+
+    stats = {"processed": 0, "failed": 0}
+    renderer = BulkRenderer(template, counter=counter)
+    with open(output_path, "w", encoding="utf-8") as output:
+        for batch in renderer.render_batches(input_path, batch_size=batch_size):
+            lines = []
+            for row, prompt, tokens, error in zip(*batch):
+                result: Dict[str, Any] = {"row": row}
+                if error:
+                    result["error"] = error
+                    stats["failed"] += 1
+                else:
+                    result["prompt"] = prompt
+                    if counter:
+                        result["tokens"] = tokens
+                lines.append(json.dumps(result, ensure_ascii=False) + "\n")
+            output.writelines(lines)
+            stats["processed"] += len(lines)
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", nargs="?", default="requests.jsonl", help="Input JSONL file")
+    parser.add_argument(
+        "output", nargs="?", default="results.jsonl", help="Output JSONL file"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes (default: number of CPU cores)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=16, help="Requests per worker per checkpoint"
+    )
+    parser.add_argument(
+        "--torch-threads", type=int, default=1, help="Intra-op threads per worker"
+    )
+    parser.add_argument("--prompt-types", default=DEFAULT_PROMPT_TYPES_PATH)
+    parser.add_argument(
+        "--resume", action="store_true", help="Continue from the last checkpoint"
+    )
+    parser.add_argument(
+        "--count-tokens",
+        metavar="MODEL",
+        help="Only count each final prompt's tokens with MODEL's tokenizer",
+    )
+    parser.add_argument(
+        "--render",
+        metavar="PROMPT_TYPE",
+        help="Only render PROMPT_TYPE's final prompt for every row of a CSV/JSONL/Parquet table",
+    )
+    args = parser.parse_args()
+
+    if args.render:
+        stats = render_file(
+            args.input,
+            args.output,
+            args.render,
+            model_name=args.count_tokens,
+            prompt_types_path=args.prompt_types,
+        )
+        print(
+            f"🎉 Done: rendered {stats['processed']} row(s), {stats['failed']} failed",
+            file=sys.stderr,
+        )
+        return
+
+    if args.count_tokens:
+        stats = count_tokens_file(
+            args.input,
+            args.output,
+            args.count_tokens,
+            prompt_types_path=args.prompt_types,
+        )
+        print(
+            f"🎉 Done: counted {stats['processed']} request(s), {stats['failed']} failed",
+            file=sys.stderr,
+        )
+        return
+
+    stats = run_batch(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        resume=args.resume,
+        prompt_types_path=args.prompt_types,
+        torch_threads=args.torch_threads,
+    )
+    print(
+        f"🎉 Done: {stats['processed']} request(s) processed, {stats['failed']} failed",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Precision mode benchmark for Prompt Engineering Studio.
+
+Compares fp32, bf16 and int8 (dynamic quantization) CPU inference on a locally
+stored tiny GPT-2: load time, generation latency, resident memory and output
+drift against fp32. Each mode runs in a fresh interpreter so RSS is comparable.
+
+Usage:
+    python benchmarks/precision_benchmark.py [--hidden 256] [--layers 4] [--runs 10]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import statistics
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiny_model import DEFAULT_TINY_MODEL_DIR, build_tiny_gpt2
+
+PROMPT = (
+    "You are a professional prompt engineering assistant. Respond clearly and "
+    "professionally.\n\nUser: Question: what is the capital of france ?\nAssistant:"
+)
+
+
+def run_mode(model_dir: str, precision: str, runs: int, max_new_tokens: int) -> dict:
+    """
+    Load the model in one precision mode and measure it (runs in a worker process).
+
+    Args:
+        model_dir (str): Directory of the saved tiny model
+        precision (str): "fp32", "bf16" or "int8"
+        runs (int): Number of timed generations
+        max_new_tokens (int): Tokens generated per run
+
+    Returns:
+        dict: Timings, memory, greedy tokens and next-token logits
+    """
+    import torch
+    from models.load_model import load_model, resolve_precision
+    from models.model_registry import measure_footprint
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    start = time.perf_counter()
+    model_pipeline = load_model(model_dir, precision=precision)
+    load_seconds = time.perf_counter() - start
+
+    tokenizer = model_pipeline.tokenizer
+    inputs = tokenizer(PROMPT, return_tensors="pt")
+    generate_kwargs = dict(
+        max_new_tokens=max_new_tokens, do_sample=False, pad_token_id=tokenizer.eos_token_id
+    )
+
+    with torch.inference_mode():
+        model_pipeline.model.generate(**inputs, **generate_kwargs)  # warm-up
+        latencies = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            tokens = model_pipeline.model.generate(**inputs, **generate_kwargs)
+            latencies.append(time.perf_counter() - start)
+        logits = model_pipeline.model(**inputs).logits[0, -1].float()
+
+    return {
+        "precision": resolve_precision(precision),
+        "load_seconds": load_seconds,
+        "p50_latency_ms": statistics.median(latencies) * 1000,
+        "tokens_per_sec": max_new_tokens / statistics.median(latencies),
+        "weights_mb": measure_footprint(model_pipeline) / (1024 * 1024),
+        "rss_delta_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        - rss_before,
+        "tokens": tokens[0, inputs["input_ids"].shape[1] :].tolist(),
+        "logits": logits.tolist(),
+    }
+
+
+def compare(reference: dict, result: dict) -> dict:
+    """Output drift of one mode against the fp32 reference"""
+    max_abs = max(abs(a - b) for a, b in zip(reference["logits"], result["logits"]))
+    matching = sum(a == b for a, b in zip(reference["tokens"], result["tokens"]))
+    return {
+        "max_logit_diff": max_abs,
+        "token_agreement": matching / max(1, len(reference["tokens"])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model-dir", default=DEFAULT_TINY_MODEL_DIR + "-bench")
+    parser.add_argument("--hidden", type=int, default=256, help="Tiny model hidden size")
+    parser.add_argument("--layers", type=int, default=4, help="Tiny model layers")
+    parser.add_argument("--runs", type=int, default=10, help="Timed generations per mode")
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    parser.add_argument("--modes", default="fp32,bf16,int8")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_mode(args.model_dir, args.worker, args.runs, args.max_new_tokens)
+        print(json.dumps(result))
+        return
+
+    build_tiny_gpt2(
+        args.model_dir,
+        hidden_size=args.hidden,
+        num_layers=args.layers,
+        num_heads=max(1, args.hidden // 64),
+    )
+
+    results = {}
+    for mode in args.modes.split(","):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", mode]
+            + ["--model-dir", args.model_dir, "--runs", str(args.runs)]
+            + ["--max-new-tokens", str(args.max_new_tokens)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+
+    reference = results.get("fp32")
+    print(
+        f"{'Mode':<6} {'Used':<6} {'Load (s)':>9} {'p50 (ms)':>9} {'tok/s':>8} "
+        f"{'Weights (MB)':>13} {'RSS Δ (MB)':>11} {'Max Δlogit':>11} {'Agree':>6}"
+    )
+    print("-" * 88)
+    for mode, result in results.items():
+        drift = compare(reference, result) if reference else {}
+        result.update(drift)
+        print(
+            f"{mode:<6} {result['precision']:<6} {result['load_seconds']:>9.2f} "
+            f"{result['p50_latency_ms']:>9.1f} {result['tokens_per_sec']:>8.1f} "
+            f"{result['weights_mb']:>13.2f} {result['rss_delta_mb']:>11.1f} "
+            f"{drift.get('max_logit_diff', 0):>11.4f} {drift.get('token_agreement', 1):>6.0%}"
+        )
+
+    if args.json:
+        for result in results.values():
+            result.pop("logits", None)
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
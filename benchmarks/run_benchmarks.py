@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Hot-path benchmark suite for Prompt Engineering Studio.
+
+Times the prompt formatting, validation and safety helpers, each rule-based
+tool and generate_text on a locally built tiny GPT-2 (no network needed), and
+reports p50/p99 latency and throughput. Results can be saved as JSON
+baselines under benchmarks/baselines/ and compared against on later runs.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--filter safety] [--min-time 0.5]
+    python benchmarks/run_benchmarks.py --save main
+    python benchmarks/run_benchmarks.py --compare main [--threshold 0.25]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tiny_model import REPO_ROOT, build_tiny_gpt2
+
+BASELINE_DIR = os.path.join(REPO_ROOT, "benchmarks", "baselines")
+
+SHORT_INPUT = "Explain how Python decorators work"
+LONG_INPUT = " ".join(
+    [
+        "Analyze the following code review and compare the pros and cons of each",
+        "approach, explaining the reasoning step by step with examples.",
+    ]
+    * 5
+)
+TEMPLATE = (
+    "You are an expert assistant.\n\nTask: {input}\n\n"
+    "Think step by step and answer in a structured format."
+)
+MODEL_OUTPUT = (
+    "Decorators wrap a function to extend its behaviour without modifying it. "
+    "They are applied with the @ syntax and are commonly used for logging, caching "
+    "and access control."
+)
+
+# name -> factory returning the zero-argument callable to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark; the decorated factory runs its setup untimed"""
+
+    def register(factory: Callable[[], Callable[[], object]]):
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+@benchmark("prompt_formatter.format_prompt")
+def _format_prompt():
+    from utils.prompt_formatter import format_prompt
+
+    return lambda: format_prompt(TEMPLATE, SHORT_INPUT)
+
+
+@benchmark("prompt_formatter.render_template_4_variables")
+def _render_template():
+    from utils.prompt_formatter import render_template
+
+    template = "Context: {context}\nExamples: [EXAMPLES]\nTone: <tone>\n\n" + TEMPLATE
+    variables = {"context": LONG_INPUT, "examples": SHORT_INPUT, "tone": "formal", "input": SHORT_INPUT}
+    return lambda: render_template(template, variables)
+
+
+@benchmark("prompt_formatter.extract_placeholders")
+def _extract_placeholders():
+    from utils.prompt_formatter import extract_placeholders
+
+    return lambda: extract_placeholders(TEMPLATE)
+
+
+@benchmark("prompt_formatter.validate_template")
+def _validate_template():
+    from utils.prompt_formatter import validate_template
+
+    return lambda: validate_template(TEMPLATE)
+
+
+@benchmark("prompt_formatter.count_tokens_estimate")
+def _count_tokens_estimate():
+    from utils.prompt_formatter import count_tokens_estimate
+
+    return lambda: count_tokens_estimate(LONG_INPUT)
+
+
+@benchmark("safety.validate_input")
+def _validate_input():
+    from utils.safety import validate_input
+
+    return lambda: validate_input(LONG_INPUT)
+
+
+@benchmark("safety.filter_output")
+def _filter_output():
+    from utils.safety import filter_output
+
+    return lambda: filter_output(MODEL_OUTPUT)
+
+
+@benchmark("safety.filter_outputs_32")
+def _filter_outputs():
+    from utils.safety import filter_outputs
+
+    outputs = [f"{i}. {MODEL_OUTPUT}" for i in range(32)]
+    return lambda: filter_outputs(outputs)
+
+
+@benchmark("safety.streaming_filter")
+def _streaming_filter():
+    from utils.safety import StreamingOutputFilter
+
+    # Roughly one chunk per streamed token
+    chunks = [word + " " for word in (MODEL_OUTPUT * 4).split()]
+
+    def run():
+        output_filter = StreamingOutputFilter()
+        for chunk in chunks:
+            output_filter.feed(chunk)
+        return output_filter.finish()
+
+    return run
+
+
+@benchmark("better_profanity.contains_profanity")
+def _better_profanity():
+    # The implementation filter_output used before the compiled index, for comparison
+    from better_profanity import profanity
+
+    profanity.load_censor_words()
+    return lambda: profanity.contains_profanity(MODEL_OUTPUT)
+
+
+def _tool_benchmark(tool_name: str):
+    def factory():
+        from models import prompt_engineering_tools
+
+        tool = getattr(prompt_engineering_tools, tool_name)
+        return lambda: tool(LONG_INPUT)
+
+    return factory
+
+
+for _tool_name in ["prompt_refiner", "prompt_analyzer", "few_shot_generator", "cot_builder"]:
+    benchmark(f"tools.{_tool_name}")(_tool_benchmark(_tool_name))
+
+
+@benchmark("rule_engine.classify_5000_keywords")
+def _classify_large_table():
+    import random
+    import string
+    from models.rule_engine import RuleEngine
+
+    rng = random.Random(0)
+    categories = {
+        f"category_{i}": [
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+            for _ in range(250)
+        ]
+        for i in range(20)
+    }
+    engine = RuleEngine(categories)
+    return lambda: engine.classify(LONG_INPUT)
+
+
+def _injection_benchmark(pattern_count: int):
+    def factory():
+        import random
+        import string
+        from utils.injection_detector import InjectionDetector
+
+        rng = random.Random(0)
+        words = [
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+            for _ in range(500)
+        ]
+        patterns = [" ".join(rng.sample(words, 3)) for _ in range(pattern_count)]
+        detector = InjectionDetector(patterns)
+        return lambda: detector.detect(LONG_INPUT)
+
+    return factory
+
+
+# Cost should stay roughly flat as the signature set grows
+for _pattern_count in [30, 1000, 10000]:
+    benchmark(f"injection_detector.detect_{_pattern_count}_patterns")(
+        _injection_benchmark(_pattern_count)
+    )
+
+
+def _token_counter_benchmark(batched: bool):
+    def factory():
+        from utils.token_counter import get_token_counter
+        from utils.safety import safe_format_prompt
+
+        counter = get_token_counter(build_tiny_gpt2())
+        segments = safe_format_prompt(f"Question: \x00\nAnswer step by step:").split("\x00")
+        inputs = [f"{SHORT_INPUT} {i}" for i in range(256)]
+        if batched:
+            return lambda: counter.count_prompts(segments, inputs)
+        return lambda: [counter.count(text.join(segments)) for text in inputs]
+
+    return factory
+
+
+# Counting the final prompts of 256 requests, one call per prompt vs batched with cached segments
+benchmark("token_counter.count_256_prompts")(_token_counter_benchmark(False))
+benchmark("token_counter.count_prompts_256_batched")(_token_counter_benchmark(True))
+
+
+def _bulk_render_benchmark(bulk: bool, counted: bool):
+    def factory():
+        from utils.bulk_render import BulkRenderer
+        from utils.prompt_formatter import format_prompt
+        from utils.safety import safe_format_prompt
+        from utils.token_counter import get_token_counter
+
+        counter = get_token_counter(build_tiny_gpt2()) if counted else None
+        rows = [{"input": f"{SHORT_INPUT} {i}"} for i in range(4096)]
+        if bulk:
+            return lambda: [
+                batch.prompts for batch in BulkRenderer(TEMPLATE, counter=counter).render_batches(rows)
+            ]
+
+        def per_row():
+            prompts = [safe_format_prompt(format_prompt(TEMPLATE, row["input"].strip())) for row in rows]
+            if counter:
+                [counter.count(prompt) for prompt in prompts]
+            return prompts
+
+        return per_row
+
+    return factory
+
+
+# Final prompts for 4,096 table rows, with and without token counts:
+# one format_prompt/count call per row vs bulk rendering in streamed batches
+for _counted in [False, True]:
+    _suffix = "_counted" if _counted else ""
+    benchmark(f"bulk_render.per_row_4096{_suffix}")(_bulk_render_benchmark(False, _counted))
+    benchmark(f"bulk_render.render_batches_4096{_suffix}")(_bulk_render_benchmark(True, _counted))
+
+
+def _template_store_benchmark(searched: bool):
+    def factory():
+        from utils.template_store import TemplateStore
+
+        store = TemplateStore(":memory:")
+        store.import_entries(
+            {
+                f"Template {i}": {
+                    "template": TEMPLATE,
+                    "description": f"Prompt number {i} for topic{i % 100} tasks",
+                }
+                for i in range(5000)
+            }
+        )
+        query = "topic42 tasks" if searched else None
+        return lambda: (store.count(query), store.list_names(query, offset=25, limit=50))
+
+    return factory
+
+
+# One sidebar page of a 5,000-template library, listed and searched
+benchmark("template_store.list_page_5000")(_template_store_benchmark(False))
+benchmark("template_store.search_page_5000")(_template_store_benchmark(True))
+
+
+@benchmark("history_store.page_20000")
+def _history_page():
+    from utils.history_store import HistoryStore
+
+    store = HistoryStore(":memory:")
+    for i in range(20000):
+        store.append(
+            "session",
+            "Zero-shot",
+            f"{SHORT_INPUT} {i}",
+            TEMPLATE,
+            ["Prompt Refiner", "distilgpt2"][: 1 + i % 2],
+            {"Prompt Refiner": MODEL_OUTPUT},
+            {"Prompt Refiner": 0.5},
+            created_at=float(i),
+        )
+    # A page deep in the history of one model: keyset pagination keeps it constant-time
+    cursor = store.page("session", (10000.0, 10001), 1, model="distilgpt2")[0]["cursor"]
+    return lambda: store.page("session", cursor, 10, model="distilgpt2")
+
+
+def _response_diff_benchmark(mode: str):
+    def factory():
+        import difflib
+        import random
+        from utils.response_diff import compare_responses, diff_tokens, unified_diff
+
+        # Two ~4,000-word responses that differ in about 2% of their words
+        rng = random.Random(0)
+        vocabulary = MODEL_OUTPUT.split() + [f"step{i}" for i in range(50)]
+        first = [rng.choice(vocabulary) for _ in range(4000)]
+        second = list(first)
+        for _ in range(80):
+            second[rng.randrange(len(second))] = rng.choice(vocabulary)
+        if mode == "difflib":
+            return lambda: list(difflib.unified_diff(first, second, "a", "b", lineterm=""))
+        if mode == "myers":
+            return lambda: unified_diff(first, second, diff_tokens(first, second), "a", "b")
+
+        # A rerun comparing four models: every pair is served from the cache
+        responses = {f"model{i}": " ".join(second if i % 2 else first) + f" {i}" for i in range(4)}
+        compare_responses(responses)
+        return lambda: compare_responses(responses)
+
+    return factory
+
+
+# Word diff of two long responses: difflib vs patience/Myers, and the cached N-way comparison
+benchmark("response_diff.difflib_4000_words")(_response_diff_benchmark("difflib"))
+benchmark("response_diff.diff_tokens_4000_words")(_response_diff_benchmark("myers"))
+benchmark("response_diff.compare_4_models_cached")(_response_diff_benchmark("cached"))
+
+
+@benchmark("load_model.generate_text")
+def _generate_text():
+    from models.load_model import load_model, generate_text
+
+    model_pipeline = load_model(build_tiny_gpt2())
+    return lambda: generate_text(
+        model_pipeline, f"Question: {SHORT_INPUT}\nAnswer:", max_new_tokens=16, do_sample=False
+    )
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def _calls_per_sample(func: Callable[[], object], target: float = 20e-6) -> int:
+    """Number of calls per timed sample so sub-microsecond functions stay above timer noise"""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= target or number >= 1000:
+            return number
+        number *= 2
+
+
+def run_benchmark(
+    func: Callable[[], object], min_time: float, max_iterations: int, warmup: int = 5
+) -> Dict[str, float]:
+    """
+    Time a callable until ``min_time`` seconds or ``max_iterations`` calls.
+
+    Very fast functions are timed in groups of calls, and each sample is the
+    mean latency of its group.
+
+    Args:
+        func (callable): Zero-argument function to time
+        min_time (float): Minimum total measured time in seconds
+        max_iterations (int): Upper bound on timed calls
+        warmup (int): Untimed calls made first
+
+    Returns:
+        dict: iterations, p50/p99/mean latency in microseconds and ops_per_sec
+    """
+    for _ in range(warmup):
+        func()
+    number = _calls_per_sample(func)
+
+    samples = []
+    perf_counter = time.perf_counter
+    deadline = perf_counter() + min_time
+    while len(samples) * number < max_iterations and (
+        perf_counter() < deadline or len(samples) < 10
+    ):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((perf_counter() - start) / number)
+
+    total = sum(samples) * number
+    iterations = len(samples) * number
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "p50_us": _percentile(samples, 0.50) * 1e6,
+        "p99_us": _percentile(samples, 0.99) * 1e6,
+        "mean_us": total / iterations * 1e6,
+        "ops_per_sec": iterations / total if total > 0 else 0.0,
+    }
+
+
+def run_suite(
+    name_filter: Optional[str] = None, min_time: float = 0.5, max_iterations: int = 100000
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run all registered benchmarks whose name contains ``name_filter``.
+
+    Returns:
+        dict: Results keyed by benchmark name
+    """
+    results = {}
+    for name, factory in BENCHMARKS.items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = run_benchmark(factory(), min_time, max_iterations)
+        result = results[name]
+        print(
+            f"{name:<42} p50 {result['p50_us']:>10.2f}µs  p99 {result['p99_us']:>10.2f}µs  "
+            f"{result['ops_per_sec']:>12.0f} ops/s"
+        )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """
+    Compare p50 latencies against a baseline.
+
+    Args:
+        results (dict): Current results
+        baseline (dict): Baseline results
+        threshold (float): Allowed relative slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        List[str]: Names of benchmarks that regressed beyond the threshold
+    """
+    regressions = []
+    print(f"\n{'benchmark':<42} {'baseline p50':>14} {'current p50':>14} {'change':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<42} {'(new)':>14} {result['p50_us']:>12.2f}µs")
+            continue
+        before = baseline[name]["p50_us"]
+        change = result["p50_us"] / before - 1 if before > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  ❌ regression"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  ✅ faster"
+        print(
+            f"{name:<42} {before:>12.2f}µs {result['p50_us']:>12.2f}µs {change:>+8.0%}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt Engineering Studio benchmarks")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per benchmark")
+    parser.add_argument("--max-iterations", type=int, default=100000)
+    parser.add_argument("--save", metavar="NAME", help="Save results as baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare with baselines/NAME.json")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Allowed p50 slowdown when comparing"
+    )
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = run_suite(args.filter, args.min_time, args.max_iterations)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        path = os.path.join(BASELINE_DIR, f"{args.save}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {path}")
+    if args.compare:
+        with open(os.path.join(BASELINE_DIR, f"{args.compare}.json")) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
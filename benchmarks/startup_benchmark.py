@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for Prompt Engineering Studio.
+
+Measures import time and resident memory of a fresh interpreter for the
+rule-based tools path (which should not import torch/transformers) and the
+full Hugging Face model path.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5] [--model PATH] [--json out.json]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each scenario runs in a fresh interpreter and prints its measurements as JSON
+_HARNESS = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "torch_imported": "torch" in sys.modules,
+    "transformers_imported": "transformers" in sys.modules,
+}}))
+"""
+
+RULE_TOOLS_BODY = """
+from models.load_model import load_model
+load_model("prompt_refiner")("Explain how Python decorators work")
+load_model("prompt_analyzer")("Explain how Python decorators work")
+"""
+
+FULL_MODEL_IMPORT_BODY = """
+from models.load_model import load_model
+import torch
+from transformers import pipeline
+"""
+
+FULL_MODEL_LOAD_BODY = """
+from models.load_model import load_model, generate_text
+generate_text(load_model({model!r}), "Hello", max_new_tokens=1, do_sample=False)
+"""
+
+
+def run_scenario(body: str, runs: int) -> dict:
+    """
+    Run a scenario in fresh interpreters and summarize the measurements.
+
+    Args:
+        body (str): Python code to time
+        runs (int): Number of fresh interpreters to start
+
+    Returns:
+        dict: Median seconds and RSS, plus which heavy modules were imported
+    """
+    code = _HARNESS.format(root=REPO_ROOT, body=body)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        "median_seconds": statistics.median(s["seconds"] for s in samples),
+        "median_max_rss_mb": statistics.median(s["max_rss_mb"] for s in samples),
+        "torch_imported": samples[-1]["torch_imported"],
+        "transformers_imported": samples[-1]["transformers_imported"],
+        "runs": runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters per scenario")
+    parser.add_argument(
+        "--model", help="Local model path to load for the full-model path (optional)"
+    )
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    scenarios = {
+        "rule-tools-only": RULE_TOOLS_BODY,
+        "full-model": (
+            FULL_MODEL_LOAD_BODY.format(model=args.model)
+            if args.model
+            else FULL_MODEL_IMPORT_BODY
+        ),
+    }
+
+    results = {}
+    print(f"{'Scenario':<18} {'Time (s)':>10} {'Max RSS (MB)':>14} {'torch':>7}")
+    print("-" * 52)
+    for name, body in scenarios.items():
+        result = run_scenario(body, args.runs)
+        results[name] = result
+        print(
+            f"{name:<18} {result['median_seconds']:>10.3f} "
+            f"{result['median_max_rss_mb']:>14.1f} {str(result['torch_imported']):>7}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
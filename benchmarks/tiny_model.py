@@ -0,0 +1,104 @@
+"""
+Tiny randomly initialized GPT-2 for offline benchmarks.
+
+Builds a small GPT-2 with a word-level tokenizer entirely in memory and saves
+it to a local directory, so benchmarks can exercise load_model/generate_text
+without downloading anything from the Hugging Face Hub.
+"""
+
+import os
+import re
+import json
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TINY_MODEL_DIR = os.path.join(REPO_ROOT, ".cache", "tiny-gpt2")
+
+EOS_TOKEN = "<|endoftext|>"
+UNK_TOKEN = "<unk>"
+
+# Vocabulary covers the safety preamble, the bundled templates and common words
+_BASE_WORDS = """
+you are a professional prompt engineering assistant respond clearly and
+professionally user assistant question answer instruction response here some
+examples what is the capital of france paris let's think step by step about
+this problem reasoning helpful asks as i write creative piece my please
+analyze following analysis explain how python decorators work code function
+data model text input output example help describe compare list summarize
+why when where who which can could would should will do does did it in on
+for with to from of an be this that these those we they he she not no yes
+""".split()
+
+
+def _vocabulary():
+    """Build the word list from the base words and prompt_types.json"""
+    words = list(_BASE_WORDS) + [str(i) for i in range(100)]
+    try:
+        with open(os.path.join(REPO_ROOT, "prompt_types.json"), "r") as f:
+            for entry in json.load(f).values():
+                words.extend(re.findall(r"[a-z0-9']+", entry.get("template", "").lower()))
+    except (OSError, ValueError):
+        pass
+    punctuation = list(".,:;?!'\"()[]{}<>-+=*/")
+    unique = []
+    for word in words + punctuation:
+        if word not in unique:
+            unique.append(word)
+    return unique
+
+
+def build_tiny_gpt2(
+    path: str = DEFAULT_TINY_MODEL_DIR,
+    hidden_size: int = 64,
+    num_layers: int = 2,
+    num_heads: int = 2,
+    overwrite: bool = False,
+) -> str:
+    """
+    Build and save a tiny random GPT-2 model with its tokenizer.
+
+    Args:
+        path (str): Directory to save the model to
+        hidden_size (int): Embedding size
+        num_layers (int): Number of transformer blocks
+        num_heads (int): Number of attention heads
+        overwrite (bool): Rebuild even if the directory already has a model
+
+    Returns:
+        str: The model directory, loadable with load_model(path)
+    """
+    if not overwrite and os.path.exists(os.path.join(path, "config.json")):
+        return path
+
+    import torch
+    from tokenizers import Tokenizer, decoders, models, normalizers, pre_tokenizers
+    from transformers import GPT2Config, GPT2LMHeadModel, PreTrainedTokenizerFast
+
+    vocab = {EOS_TOKEN: 0, UNK_TOKEN: 1}
+    for word in _vocabulary():
+        vocab.setdefault(word, len(vocab))
+
+    backend = Tokenizer(models.WordLevel(vocab, unk_token=UNK_TOKEN))
+    backend.normalizer = normalizers.Lowercase()
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    backend.decoder = decoders.WordPiece()
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend, eos_token=EOS_TOKEN, unk_token=UNK_TOKEN
+    )
+
+    torch.manual_seed(0)
+    config = GPT2Config(
+        vocab_size=len(vocab),
+        n_positions=512,
+        n_embd=hidden_size,
+        n_layer=num_layers,
+        n_head=num_heads,
+        # No EOS so every benchmark run generates exactly max_new_tokens
+        bos_token_id=None,
+        eos_token_id=None,
+    )
+    model = GPT2LMHeadModel(config).eval()
+
+    os.makedirs(path, exist_ok=True)
+    model.save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return path
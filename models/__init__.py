@@ -3,6 +3,20 @@ Models package for Prompt Engineering Studio.
 Contains utilities for loading models and professional prompt engineering tools.
 """
 
-from .load_model import load_model, generate_text, get_model_info
+from .load_model import (
+    load_model,
+    generate_text,
+    generate_batch,
+    get_model_info,
+    get_model_registry,
+)
+from .model_registry import ModelRegistry
 
-__all__ = ["load_model", "generate_text", "get_model_info"]
+__all__ = [
+    "load_model",
+    "generate_text",
+    "generate_batch",
+    "get_model_info",
+    "get_model_registry",
+    "ModelRegistry",
+]
@@ -0,0 +1,219 @@
+"""
+Dynamic micro-batching for the Prompt Engineering Studio.
+Concurrent generations for the same pipeline and decoding settings are
+collected for a short window and run as one padded batch, raising throughput
+when several sessions hit the same validation model at once.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+from models.load_model import generate_text, generate_batch
+
+logger = logging.getLogger(__name__)
+
+# A batch size of 1 disables batching
+DEFAULT_MAX_BATCH_SIZE = int(os.environ.get("PROMPT_STUDIO_MAX_BATCH_SIZE", "8"))
+DEFAULT_MAX_WAIT_MS = float(os.environ.get("PROMPT_STUDIO_BATCH_WAIT_MS", "10"))
+
+# Number of recent queueing delays kept for percentiles
+DELAY_WINDOW = 1000
+
+
+class _PendingBatch:
+    """Requests collected for one batch"""
+
+    def __init__(self, model_pipeline: Any):
+        self.model_pipeline = model_pipeline
+        self.items: List[Tuple[str, Optional[str], Future, float]] = []
+        self.closed = False
+        self.full = threading.Event()
+
+
+class MicroBatcher:
+    """
+    Collects concurrent generate_text calls into batches.
+
+    The first request for a (pipeline, max_new_tokens, do_sample) key becomes
+    the batch leader: it waits up to ``max_wait_ms`` for more requests (or until
+    ``max_batch_size`` is reached) and then runs the whole batch on its own
+    thread. A batch of one uses generate_text, keeping the prefix cache path.
+    Seeded sampling bypasses batching because it relies on the global RNG.
+    """
+
+    def __init__(
+        self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[int, int, bool], _PendingBatch] = {}
+        self.batch_size_histogram: Dict[int, int] = {}
+        self.requests = 0
+        self.bypasses = 0
+        self._delays = deque(maxlen=DELAY_WINDOW)
+
+    def generate(
+        self,
+        model_pipeline: Any,
+        prompt: str,
+        max_new_tokens: int = 50,
+        do_sample: bool = True,
+        seed: Optional[int] = None,
+        static_prefix: Optional[str] = None,
+    ) -> str:
+        """
+        Generate text, sharing a forward pass with concurrent requests when possible.
+
+        Args:
+            model_pipeline: The loaded transformers pipeline
+            prompt (str): The input prompt text
+            max_new_tokens (int): Maximum number of new tokens to generate
+            do_sample (bool): Sample the output; False uses greedy decoding
+            seed (int, optional): Fixed seed; seeded sampling is never batched
+            static_prefix (str, optional): Prefix reused from the prefix cache
+                when the request ends up alone in its batch
+
+        Returns:
+            str: The generated text or error message
+        """
+        batchable = (
+            self.max_batch_size > 1
+            and getattr(model_pipeline, "tokenizer", None) is not None
+            and not (do_sample and seed is not None)
+        )
+        if not batchable:
+            with self._lock:
+                self.bypasses += 1
+            return generate_text(
+                model_pipeline,
+                prompt,
+                max_new_tokens=max_new_tokens,
+                do_sample=do_sample,
+                seed=seed,
+                static_prefix=static_prefix,
+            )
+        return self.submit(
+            model_pipeline, prompt, max_new_tokens, do_sample, static_prefix
+        ).result()
+
+    def submit(
+        self,
+        model_pipeline: Any,
+        prompt: str,
+        max_new_tokens: int = 50,
+        do_sample: bool = True,
+        static_prefix: Optional[str] = None,
+    ) -> Future:
+        """
+        Queue a request and return a future for its generated text.
+
+        The leader of a batch runs it before returning, so its future is
+        already done; other callers wait on theirs.
+        """
+        key = (id(model_pipeline), max_new_tokens, do_sample)
+        future = Future()
+        with self._lock:
+            self.requests += 1
+            batch = self._pending.get(key)
+            leader = batch is None
+            if leader:
+                batch = _PendingBatch(model_pipeline)
+                self._pending[key] = batch
+            batch.items.append((prompt, static_prefix, future, time.perf_counter()))
+            if len(batch.items) >= self.max_batch_size:
+                self._close(key, batch)
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.max_wait)
+            with self._lock:
+                self._close(key, batch)
+            self._run(batch, max_new_tokens, do_sample)
+        return future
+
+    def _close(self, key: Tuple[int, int, bool], batch: _PendingBatch):
+        """Stop a batch from accepting requests (caller holds the lock)"""
+        if not batch.closed:
+            batch.closed = True
+            if self._pending.get(key) is batch:
+                del self._pending[key]
+
+    def _run(self, batch: _PendingBatch, max_new_tokens: int, do_sample: bool):
+        started = time.perf_counter()
+        with self._lock:
+            size = len(batch.items)
+            self.batch_size_histogram[size] = self.batch_size_histogram.get(size, 0) + 1
+            self._delays.extend(started - enqueued for _, _, _, enqueued in batch.items)
+
+        try:
+            if size == 1:
+                prompt, static_prefix, future, _ = batch.items[0]
+                future.set_result(
+                    generate_text(
+                        batch.model_pipeline,
+                        prompt,
+                        max_new_tokens=max_new_tokens,
+                        do_sample=do_sample,
+                        static_prefix=static_prefix,
+                    )
+                )
+                return
+
+            results = generate_batch(
+                batch.model_pipeline,
+                [prompt for prompt, _, _, _ in batch.items],
+                max_new_tokens=max_new_tokens,
+                batch_size=size,
+                do_sample=do_sample,
+            )
+            for (_, _, future, _), result in zip(batch.items, results):
+                future.set_result(result["response"])
+        except Exception as e:
+            logger.error(f"Batched generation failed: {str(e)}")
+            for _, _, future, _ in batch.items:
+                if not future.done():
+                    future.set_result(f"❌ Generation failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching counters.
+
+        Returns:
+            dict: requests, bypasses, batches, batch_size_histogram, mean_batch_size
+            and queue delay (mean/p50/p95/max seconds over recent requests)
+        """
+        with self._lock:
+            delays = sorted(self._delays)
+            histogram = dict(sorted(self.batch_size_histogram.items()))
+        batches = sum(histogram.values())
+        batched_requests = sum(size * count for size, count in histogram.items())
+
+        def percentile(fraction: float) -> float:
+            return delays[min(len(delays) - 1, int(fraction * len(delays)))] if delays else 0.0
+
+        return {
+            "requests": self.requests,
+            "bypasses": self.bypasses,
+            "batches": batches,
+            "batch_size_histogram": histogram,
+            "mean_batch_size": batched_requests / batches if batches else 0.0,
+            "queue_delay": {
+                "mean": sum(delays) / len(delays) if delays else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": delays[-1] if delays else 0.0,
+            },
+        }
+
+
+_micro_batcher = MicroBatcher()
+
+
+def get_micro_batcher() -> MicroBatcher:
+    """Return the process-wide micro-batcher"""
+    return _micro_batcher
@@ -1,14 +1,22 @@
 """
 Model loading utilities for the Prompt Engineering Studio.
 Handles loading and caching of Hugging Face models and prompt engineering tools.
+
+torch and transformers are imported lazily, only once a Hugging Face model is
+actually requested, so processes that only use the rule-based tools start fast.
 """
 
-import streamlit as st
-from transformers import pipeline
-import torch
-from typing import Optional, Any
+import os
+import functools
+import time
+from typing import Optional, Any, Dict, Iterator, List, Tuple
 import logging
+import threading
 from models.fake_llm import fake_llm
+from models.model_registry import ModelRegistry
+from models.prefix_cache import get_prefix_cache
+from utils.token_counter import register_tokenizer
+from utils.tracing import span, traced
 from models.prompt_engineering_tools import (
     prompt_refiner, 
     prompt_analyzer, 
@@ -20,59 +28,244 @@ from models.prompt_engineering_tools import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Serializes seeded generations, since set_seed affects the global RNG
+_seed_lock = threading.Lock()
+
+# CPU inference precision modes; the default can be set with PROMPT_STUDIO_PRECISION
+PRECISION_MODES = ["fp32", "bf16", "int8"]
+DEFAULT_PRECISION = os.environ.get("PROMPT_STUDIO_PRECISION", "fp32").strip().lower() or "fp32"
+if DEFAULT_PRECISION not in PRECISION_MODES:
+    logger.warning(
+        f"Unknown PROMPT_STUDIO_PRECISION '{DEFAULT_PRECISION}' "
+        f"(expected one of {', '.join(PRECISION_MODES)}), using fp32"
+    )
+    DEFAULT_PRECISION = "fp32"
 
-@st.cache_resource
-def load_model(model_name: str) -> Optional[Any]:
+
+def bf16_supported() -> bool:
     """
-    Load a Hugging Face model or prompt engineering tool.
+    Check whether the CPU has native bfloat16 support (AVX512-BF16 or AMX).
+
+    Returns:
+        bool: True if bf16 inference is expected to be fast on this CPU
+    """
+    try:
+        import torch
+
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        pass
+    try:
+        with open("/proc/cpuinfo", "r") as f:
+            cpuinfo = f.read()
+        return "avx512_bf16" in cpuinfo or "amx_bf16" in cpuinfo
+    except OSError:
+        return False
+
+
+def resolve_precision(precision: str, warn: bool = True) -> str:
+    """
+    Validate a precision mode, falling back to fp32 when bf16 is not supported.
+
+    Args:
+        precision (str): One of PRECISION_MODES
+        warn (bool): Log a warning when falling back
+
+    Returns:
+        str: The precision mode that will actually be used
+    """
+    if precision not in PRECISION_MODES:
+        raise ValueError(
+            f"Unknown precision '{precision}' (expected one of {', '.join(PRECISION_MODES)})"
+        )
+    if precision == "bf16" and not bf16_supported():
+        if warn:
+            logger.warning("bf16 is not supported on this CPU, using fp32 instead")
+        return "fp32"
+    return precision
+
+
+def _conv1d_to_linear(model: Any) -> Any:
+    """
+    Replace GPT-2 style Conv1D projections with equivalent nn.Linear layers.
+
+    Dynamic quantization only handles nn.Linear, and GPT-2 family models keep
+    nearly all their weights in transformers' Conv1D (a transposed Linear).
+    """
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    for module in list(model.modules()):
+        for child_name, child in list(module.named_children()):
+            if isinstance(child, Conv1D):
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features)
+                linear.weight.data = child.weight.data.t().contiguous()
+                linear.bias.data = child.bias.data
+                setattr(module, child_name, linear)
+    return model
+
+
+def _quantize_int8(model: Any) -> Any:
+    """Apply torch dynamic int8 quantization to all Linear layers"""
+    import torch
+    import warnings
+
+    _conv1d_to_linear(model)
+    with warnings.catch_warnings():
+        # Eager-mode quantization is deprecated upstream but still the CPU-only option
+        warnings.simplefilter("ignore")
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+
+
+def _load_pipeline(model_name: str, precision: str = "fp32") -> Any:
+    """
+    Load a Hugging Face text-generation pipeline on CPU.
+
+    Args:
+        model_name (str): The model name/path
+        precision (str): "fp32", "bf16" or "int8" (dynamic quantization)
+
+    Returns:
+        Pipeline: The loaded transformers pipeline
+    """
+    # Heavy imports are deferred until a Hugging Face model is needed
+    import torch
+    from transformers import pipeline
+
+    # Determine the task based on the model
+    # All supported models use text-generation task
+    task = "text-generation"
+
+    # int8 weights are quantized from the fp32 checkpoint after loading
+    torch_dtype = torch.bfloat16 if precision == "bf16" else torch.float32
+
+    # Load the model with CPU-only settings
+    model_pipeline = pipeline(
+        task=task,
+        model=model_name,
+        device=-1,  # CPU only
+        torch_dtype=torch_dtype,
+        trust_remote_code=False,  # Security best practice
+        return_full_text=False if task == "text-generation" else True,
+        max_new_tokens=50,  # Default limit for memory efficiency
+        model_kwargs={"low_cpu_mem_usage": True},  # Optimize for low memory usage
+    )
+
+    if precision == "int8":
+        _quantize_int8(model_pipeline.model)
+
+    _instrument_pipeline(model_pipeline)
+    if model_pipeline.tokenizer is not None:
+        # Token counts in the app use the tokenizer that is already loaded
+        register_tokenizer(model_name, model_pipeline.tokenizer)
+    logger.info(f"Successfully loaded model: {model_name} ({precision})")
+    return model_pipeline
+
+
+def _instrument_pipeline(model_pipeline: Any):
+    """Record tokenization, generation and decoding inside pipeline calls as spans"""
+    model_pipeline.preprocess = traced("tokenize")(model_pipeline.preprocess)
+    model_pipeline._forward = traced("generate")(model_pipeline._forward)
+    model_pipeline.postprocess = traced("decode")(model_pipeline.postprocess)
+
+
+def registry_key(model_name: str, precision: str) -> str:
+    """
+    Get the model registry key of a model loaded in a given precision.
+
+    Args:
+        model_name (str): Hugging Face model name
+        precision (str): Resolved precision (see resolve_precision)
+
+    Returns:
+        str: The key used by the model registry and warm-up status
+    """
+    return model_name if precision == "fp32" else f"{model_name}:{precision}"
+
+
+# Shared across sessions: keeps loaded pipelines within the RAM budget
+_model_registry = ModelRegistry(loader=_load_pipeline)
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry"""
+    return _model_registry
+
+
+def try_load_model(
+    model_name: str, precision: str = DEFAULT_PRECISION
+) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Load a Hugging Face model or prompt engineering tool, returning why it failed.
+
+    Hugging Face pipelines are served from the memory-budgeted model registry,
+    with one entry per model and precision mode. Errors are returned rather
+    than shown, since models are often loaded off the Streamlit script thread.
 
     Args:
         model_name (str): The model name/path or tool identifier
+        precision (str): "fp32", "bf16" or "int8" for Hugging Face models
 
     Returns:
-        Pipeline, function, or None: The loaded model/tool or None if loading fails
+        Tuple: (the loaded model/tool or None, the error message or None)
     """
     try:
         logger.info(f"Loading model/tool: {model_name}")
 
         # Handle prompt engineering tools
         if model_name == "prompt_refiner":
-            return prompt_refiner
+            return prompt_refiner, None
         elif model_name == "prompt_analyzer":
-            return prompt_analyzer
+            return prompt_analyzer, None
         elif model_name == "few_shot_generator":
-            return few_shot_generator
+            return few_shot_generator, None
         elif model_name == "cot_builder":
-            return cot_builder
+            return cot_builder, None
         elif model_name.lower() == "fakegpt":
-            return fake_llm
-
-        # Determine the task based on the model
-        # All supported models use text-generation task
-        task = "text-generation"
-
-        # Load the model with CPU-only settings
-        model_pipeline = pipeline(
-            task=task,
-            model=model_name,
-            device=-1,  # CPU only
-            torch_dtype=torch.float32,  # Use float32 for better CPU compatibility
-            trust_remote_code=False,  # Security best practice
-            return_full_text=False if task == "text-generation" else True,
-            max_new_tokens=50,  # Default limit for memory efficiency
-            model_kwargs={"low_cpu_mem_usage": True},  # Optimize for low memory usage
-        )
+            return fake_llm, None
 
-        logger.info(f"Successfully loaded model: {model_name}")
-        return model_pipeline
+        precision = resolve_precision(precision)
+        key = registry_key(model_name, precision)
+        with span("load_model", result="hit" if key in _model_registry else "miss"):
+            return _model_registry.get(key, model_name, precision), None
 
     except Exception as e:
         logger.error(f"Failed to load model {model_name}: {str(e)}")
-        st.error(f"❌ Failed to load model '{model_name}': {str(e)}")
-        return None
+        return None, str(e)
+
+
+def load_model(model_name: str, precision: str = DEFAULT_PRECISION) -> Optional[Any]:
+    """
+    Load a Hugging Face model or prompt engineering tool.
+
+    Args:
+        model_name (str): The model name/path or tool identifier
+        precision (str): "fp32", "bf16" or "int8" for Hugging Face models
+
+    Returns:
+        Pipeline, function, or None: The loaded model/tool or None if loading fails
+    """
+    return try_load_model(model_name, precision)[0]
+
+
+def _sampling_kwargs(do_sample: bool) -> dict:
+    """Decoding arguments for sampled or greedy generation"""
+    if do_sample:
+        return {"do_sample": True, "temperature": 0.7, "top_p": 0.9}
+    return {"do_sample": False}
 
 
-def generate_text(model_pipeline: Any, prompt: str, max_new_tokens: int = 50) -> str:
+def generate_text(
+    model_pipeline: Any,
+    prompt: str,
+    max_new_tokens: int = 50,
+    do_sample: bool = True,
+    seed: Optional[int] = None,
+    static_prefix: Optional[str] = None,
+) -> str:
     """
     Generate text using the loaded model pipeline.
 
@@ -80,6 +273,10 @@ def generate_text(model_pipeline: Any, prompt: str, max_new_tokens: int = 50) ->
         model_pipeline: The loaded transformers pipeline
         prompt (str): The input prompt text
         max_new_tokens (int): Maximum number of new tokens to generate
+        do_sample (bool): Sample the output; False uses greedy decoding
+        seed (int, optional): Fixed seed that makes sampling reproducible
+        static_prefix (str, optional): Leading part of the prompt shared across
+            requests, whose key/values are reused from the prefix cache
 
     Returns:
         str: The generated text or error message
@@ -88,36 +285,342 @@ def generate_text(model_pipeline: Any, prompt: str, max_new_tokens: int = 50) ->
         if model_pipeline is None:
             return "❌ Model not loaded. Please try selecting a different model."
 
-        # Generate text with the pipeline
-        result = model_pipeline(
-            prompt,
+        generation_kwargs = dict(
             max_new_tokens=max_new_tokens,
-            do_sample=True,
-            temperature=0.7,
-            top_p=0.9,
             pad_token_id=model_pipeline.tokenizer.eos_token_id,
+            **_sampling_kwargs(do_sample),
         )
+        cached_inputs = None
+        if static_prefix:
+            with span("prefix_cache"):
+                cached_inputs = get_prefix_cache().prepare(model_pipeline, prompt, static_prefix)
 
-        # Extract the generated text based on pipeline type
-        if isinstance(result, list) and len(result) > 0:
-            if "generated_text" in result[0]:
-                generated = result[0]["generated_text"]
-                # For text-generation, remove the original prompt if it's included
-                if generated.startswith(prompt):
-                    generated = generated[len(prompt) :].strip()
-                return generated
-            elif "summary_text" in result[0]:
-                return result[0]["summary_text"]
-            else:
-                return str(result[0])
-        else:
-            return "❌ No output generated by the model."
+        def _generate() -> str:
+            if cached_inputs is None:
+                # Generate text with the pipeline
+                result = model_pipeline(prompt, **generation_kwargs)
+                return _extract_generated_text(result, prompt)
+
+            # Only the tokens after the cached prefix are prefilled
+            with span("generate"):
+                output_ids = model_pipeline.model.generate(**cached_inputs, **generation_kwargs)
+            prompt_length = cached_inputs["input_ids"].shape[1]
+            with span("decode"):
+                return model_pipeline.tokenizer.decode(
+                    output_ids[0, prompt_length:], skip_special_tokens=True
+                ).strip()
+
+        if seed is not None and do_sample:
+            # The RNG is global, so seeded runs must not interleave
+            from transformers import set_seed
+
+            with _seed_lock:
+                set_seed(seed)
+                return _generate()
+        return _generate()
 
     except Exception as e:
         logger.error(f"Text generation failed: {str(e)}")
         return f"❌ Generation failed: {str(e)}"
 
 
+@functools.lru_cache(maxsize=None)
+def _metrics_streamer_class() -> type:
+    """Build the metrics streamer class on first use, importing transformers lazily"""
+    from transformers import TextIteratorStreamer
+
+    class _MetricsStreamer(TextIteratorStreamer):
+        """Text streamer that also records when tokens are produced"""
+
+        def __init__(self, tokenizer: Any, start_time: float, **kwargs: Any):
+            super().__init__(tokenizer, **kwargs)
+            self.start_time = start_time
+            self.first_token_time = None
+            self.token_count = 0
+            self._prompt_seen = False
+
+        def put(self, value: Any):
+            # The first call carries the prompt tokens, which are not generated output
+            if self._prompt_seen:
+                if self.first_token_time is None:
+                    self.first_token_time = time.perf_counter()
+                self.token_count += value.numel()
+            self._prompt_seen = True
+            super().put(value)
+
+    return _MetricsStreamer
+
+
+def _stop_event_criteria(stop_event: threading.Event) -> Any:
+    """Stopping criteria that ends generation once the event is set"""
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class _StopEventCriteria(StoppingCriteria):
+        def __call__(self, input_ids: Any, scores: Any, **kwargs: Any) -> Any:
+            stop = stop_event.is_set()
+            return torch.full((input_ids.shape[0],), stop, dtype=torch.bool, device=input_ids.device)
+
+    return StoppingCriteriaList([_StopEventCriteria()])
+
+
+def stream_text(
+    model_pipeline: Any,
+    prompt: str,
+    max_new_tokens: int = 50,
+    do_sample: bool = True,
+    seed: Optional[int] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+    static_prefix: Optional[str] = None,
+    stop_event: Optional[threading.Event] = None,
+) -> Iterator[str]:
+    """
+    Generate text with the loaded pipeline, yielding chunks as they are decoded.
+
+    Generation runs in a background thread feeding a transformers streamer.
+    When ``metrics`` is given it is filled with time_to_first_token, tokens,
+    tokens_per_sec, generate_cpu_time and total_time once the stream is
+    exhausted. Setting ``stop_event`` ends generation after the current token;
+    metrics then also report stopped_early, tokens_saved and an estimated
+    cpu_time_saved. If generation fails, the error message is yielded last and
+    metrics get an "error", so partial output is not mistaken for a result.
+
+    Args:
+        model_pipeline: The loaded transformers pipeline
+        prompt (str): The input prompt text
+        max_new_tokens (int): Maximum number of new tokens to generate
+        do_sample (bool): Sample the output; False uses greedy decoding
+        seed (int, optional): Fixed seed that makes sampling reproducible
+        metrics (dict, optional): Receives timing metrics for the generation
+        static_prefix (str, optional): Leading part of the prompt shared across
+            requests, whose key/values are reused from the prefix cache
+        stop_event (threading.Event, optional): Set by the consumer to stop early
+
+    Yields:
+        str: Decoded text chunks, or a single error message
+    """
+    if model_pipeline is None:
+        yield "❌ Model not loaded. Please try selecting a different model."
+        return
+
+    errors = []
+    start_time = time.perf_counter()
+    try:
+        tokenizer = model_pipeline.tokenizer
+        inputs = None
+        if static_prefix:
+            with span("prefix_cache"):
+                inputs = get_prefix_cache().prepare(model_pipeline, prompt, static_prefix)
+        if inputs is None:
+            with span("tokenize"):
+                inputs = tokenizer(prompt, return_tensors="pt")
+        streamer = _metrics_streamer_class()(
+            tokenizer, start_time, skip_prompt=True, skip_special_tokens=True
+        )
+        generation_kwargs = dict(
+            **inputs,
+            streamer=streamer,
+            max_new_tokens=max_new_tokens,
+            pad_token_id=tokenizer.eos_token_id,
+            **_sampling_kwargs(do_sample),
+        )
+        if stop_event is not None:
+            generation_kwargs["stopping_criteria"] = _stop_event_criteria(stop_event)
+    except Exception as e:
+        logger.error(f"Text generation failed: {str(e)}")
+        if metrics is not None:
+            metrics["error"] = str(e)
+        yield f"❌ Generation failed: {str(e)}"
+        return
+
+    cpu_times = []
+
+    def _generate():
+        cpu_start = time.thread_time()
+        try:
+            with span("generate", streamed=True):
+                if seed is not None and do_sample:
+                    from transformers import set_seed
+
+                    with _seed_lock:
+                        set_seed(seed)
+                        model_pipeline.model.generate(**generation_kwargs)
+                else:
+                    model_pipeline.model.generate(**generation_kwargs)
+        except Exception as e:
+            errors.append(e)
+            # Unblock the consumer, which would otherwise wait forever
+            streamer.end()
+        finally:
+            cpu_times.append(time.thread_time() - cpu_start)
+
+    thread = threading.Thread(target=_generate, name="stream-generate", daemon=True)
+    thread.start()
+    for chunk in streamer:
+        if chunk:
+            yield chunk
+    thread.join()
+
+    if errors:
+        logger.error(f"Text generation failed: {str(errors[0])}")
+        if metrics is not None:
+            metrics["error"] = str(errors[0])
+        yield f"❌ Generation failed: {str(errors[0])}"
+
+    if metrics is not None:
+        total_time = time.perf_counter() - start_time
+        first_token_time = streamer.first_token_time
+        metrics.update(
+            {
+                "time_to_first_token": (
+                    first_token_time - start_time if first_token_time else total_time
+                ),
+                "tokens": streamer.token_count,
+                "tokens_per_sec": (
+                    streamer.token_count / total_time if total_time > 0 else 0.0
+                ),
+                "generate_cpu_time": cpu_times[0] if cpu_times else 0.0,
+                "total_time": total_time,
+            }
+        )
+        if stop_event is not None and stop_event.is_set():
+            tokens_saved = max(max_new_tokens - streamer.token_count, 0)
+            cpu_per_token = metrics["generate_cpu_time"] / max(streamer.token_count, 1)
+            metrics.update(
+                {
+                    "stopped_early": True,
+                    "tokens_saved": tokens_saved,
+                    "cpu_time_saved": tokens_saved * cpu_per_token,
+                }
+            )
+
+
+def _extract_generated_text(result: Any, prompt: str) -> str:
+    """
+    Extract the generated text from a pipeline result for a single prompt.
+
+    Args:
+        result: The raw pipeline output for one prompt
+        prompt (str): The prompt that produced the result
+
+    Returns:
+        str: The generated text or error message
+    """
+    # Extract the generated text based on pipeline type
+    if isinstance(result, list) and len(result) > 0:
+        if "generated_text" in result[0]:
+            generated = result[0]["generated_text"]
+            # For text-generation, remove the original prompt if it's included
+            if generated.startswith(prompt):
+                generated = generated[len(prompt) :].strip()
+            return generated
+        elif "summary_text" in result[0]:
+            return result[0]["summary_text"]
+        else:
+            return str(result[0])
+    else:
+        return "❌ No output generated by the model."
+
+
+def _pad_batch(sequences: List[List[int]], pad_token_id: int, left: bool) -> Dict[str, Any]:
+    """Token ids and attention mask tensors for sequences of different lengths"""
+    import torch
+
+    width = max(len(ids) for ids in sequences)
+    input_ids, attention_mask = [], []
+    for ids in sequences:
+        padding = [pad_token_id] * (width - len(ids))
+        mask = [0] * len(padding)
+        input_ids.append(padding + ids if left else ids + padding)
+        attention_mask.append(mask + [1] * len(ids) if left else [1] * len(ids) + mask)
+    return {"input_ids": torch.tensor(input_ids), "attention_mask": torch.tensor(attention_mask)}
+
+
+def generate_batch(
+    model_pipeline: Any,
+    prompts: List[str],
+    max_new_tokens: int = 50,
+    batch_size: int = 8,
+    do_sample: bool = True,
+) -> List[Dict[str, str]]:
+    """
+    Generate text for many prompts, running one forward pass per batch.
+
+    Prompts are grouped by tokenized length so each batch carries as little
+    padding as possible, then results are returned in the original order.
+    Prompt engineering tools (plain callables) are applied to each prompt.
+
+    Args:
+        model_pipeline: The loaded transformers pipeline or prompt tool
+        prompts (List[str]): The input prompt texts
+        max_new_tokens (int): Maximum number of new tokens to generate
+        batch_size (int): Maximum number of prompts per forward pass
+        do_sample (bool): Sample the outputs; False uses greedy decoding
+
+    Returns:
+        List[Dict[str, str]]: One {"prompt", "response"} entry per input prompt
+    """
+    if not prompts:
+        return []
+
+    if model_pipeline is None:
+        return [
+            {
+                "prompt": prompt,
+                "response": "❌ Model not loaded. Please try selecting a different model.",
+            }
+            for prompt in prompts
+        ]
+
+    tokenizer = getattr(model_pipeline, "tokenizer", None)
+    if tokenizer is None:
+        return [
+            {"prompt": prompt, "response": model_pipeline(prompt)} for prompt in prompts
+        ]
+
+    try:
+        # Padding is applied per batch, so the shared tokenizer is never changed
+        pad_token_id = tokenizer.pad_token_id
+        if pad_token_id is None:
+            pad_token_id = tokenizer.eos_token_id
+        encoder_decoder = getattr(model_pipeline.model.config, "is_encoder_decoder", False)
+
+        # Sort by token length so prompts of similar size share a batch
+        encoded = tokenizer(list(prompts))["input_ids"]
+        order = sorted(range(len(prompts)), key=lambda i: len(encoded[i]))
+
+        responses: List[str] = [""] * len(prompts)
+        batch_size = max(1, batch_size)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start : start + batch_size]
+            # Decoder-only models continue from the last token, so they are padded on the left
+            inputs = _pad_batch([encoded[i] for i in chunk], pad_token_id, left=not encoder_decoder)
+            with span("generate", batch_size=len(chunk)):
+                output_ids = model_pipeline.model.generate(
+                    **inputs,
+                    max_new_tokens=max_new_tokens,
+                    pad_token_id=pad_token_id,
+                    **_sampling_kwargs(do_sample),
+                )
+            if not encoder_decoder:
+                output_ids = output_ids[:, inputs["input_ids"].shape[1] :]
+            texts = tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+            for index, text in zip(chunk, texts):
+                responses[index] = text.strip()
+
+        return [
+            {"prompt": prompt, "response": response}
+            for prompt, response in zip(prompts, responses)
+        ]
+
+    except Exception as e:
+        logger.error(f"Batch generation failed: {str(e)}")
+        return [
+            {"prompt": prompt, "response": f"❌ Generation failed: {str(e)}"}
+            for prompt in prompts
+        ]
+
+
 def get_model_info(model_name: str) -> dict:
     """
     Get information about the model or tool for display purposes.
@@ -191,12 +694,23 @@ def get_model_info(model_name: str) -> dict:
         },
     }
 
-    return model_info.get(
-        model_name,
-        {
-            "type": "Unknown",
-            "size": "Unknown",
-            "task": "text-generation",
-            "description": "Custom model or tool",
-        },
+    info = dict(
+        model_info.get(
+            model_name,
+            {
+                "type": "Unknown",
+                "size": "Unknown",
+                "task": "text-generation",
+                "description": "Custom model or tool",
+            },
+        )
     )
+
+    # Prefer the measured footprint once the model is resident
+    for precision in PRECISION_MODES:
+        footprint = _model_registry.footprint(registry_key(model_name, precision))
+        if footprint is not None:
+            info["size"] = f"{footprint / (1024 * 1024):.0f}MB (measured, {precision})"
+            break
+
+    return info
@@ -0,0 +1,224 @@
+"""
+Model registry for the Prompt Engineering Studio.
+Keeps loaded Hugging Face pipelines within a configurable RAM budget, evicting
+least-recently-used models and models that have been idle past a TTL.
+"""
+
+import gc
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MB = float(os.environ.get("PROMPT_STUDIO_MODEL_BUDGET_MB", "1024"))
+DEFAULT_IDLE_TTL = float(os.environ.get("PROMPT_STUDIO_MODEL_IDLE_TTL", "1800"))
+
+
+def _iter_tensors(value: Any):
+    """Yield tensors from a state dict value (quantized layers store tuples)"""
+    if isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _iter_tensors(item)
+    elif hasattr(value, "data_ptr") and hasattr(value, "element_size"):
+        yield value
+
+
+def measure_footprint(model_pipeline: Any) -> int:
+    """
+    Measure the memory held by a pipeline's model weights and buffers.
+
+    Tied weights (e.g. GPT-2's embedding and LM head) are only counted once,
+    and packed weights of dynamically quantized layers are included.
+
+    Args:
+        model_pipeline: A loaded transformers pipeline
+
+    Returns:
+        int: Footprint in bytes, or 0 if it cannot be measured
+    """
+    model = getattr(model_pipeline, "model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return 0
+
+    seen = set()
+    total = 0
+    try:
+        if hasattr(model, "state_dict"):
+            values = list(model.state_dict(keep_vars=True).values())
+        else:
+            values = list(model.parameters()) + list(model.buffers())
+        for tensor in _iter_tensors(values):
+            key = tensor.data_ptr()
+            if key in seen:
+                continue
+            seen.add(key)
+            total += tensor.numel() * tensor.element_size()
+    except Exception as e:
+        logger.warning(f"Could not measure model footprint: {str(e)}")
+        return 0
+    return total
+
+
+class ModelRegistry:
+    """
+    Thread-safe LRU cache of loaded models bounded by a memory budget.
+
+    Models are measured after loading. When the resident total exceeds the
+    budget, the least recently used models are evicted; models that have not
+    been used for ``idle_ttl`` seconds are evicted on the next access.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        budget_mb: float = DEFAULT_BUDGET_MB,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+    ):
+        self.loader = loader
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.idle_ttl = idle_ttl
+        self._models = OrderedDict()  # key -> {"model", "bytes", "loaded_at", "last_used"}
+        self._lock = threading.RLock()
+        self._loading_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, *loader_args: Any) -> Any:
+        """
+        Return a resident model, loading it on a miss.
+
+        Args:
+            key (str): Cache key for the model
+            *loader_args: Arguments passed to the loader (defaults to the key)
+
+        Returns:
+            The loaded model. Loader exceptions are propagated and not cached.
+        """
+        self.sweep()
+
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                self.hits += 1
+                return entry["model"]
+            loading_lock = self._loading_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model; others wait and then hit
+        with loading_lock:
+            with self._lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry["model"]
+                self.misses += 1
+
+            model = self.loader(*(loader_args or (key,)))
+            footprint = measure_footprint(model)
+
+            with self._lock:
+                now = time.monotonic()
+                self._models[key] = {
+                    "model": model,
+                    "bytes": footprint,
+                    "loaded_at": now,
+                    "last_used": now,
+                }
+                self._enforce_budget(keep=key)
+                self._loading_locks.pop(key, None)
+
+        logger.info(
+            f"Registered model {key} ({footprint / (1024 * 1024):.1f}MB, "
+            f"{self.resident_bytes() / (1024 * 1024):.1f}MB resident)"
+        )
+        return model
+
+    def _touch(self, key: str) -> Optional[Dict[str, Any]]:
+        """Mark a model as most recently used and return its entry"""
+        entry = self._models.get(key)
+        if entry is not None:
+            entry["last_used"] = time.monotonic()
+            self._models.move_to_end(key)
+        return entry
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        """Evict least recently used models until the budget is respected"""
+        for key in list(self._models.keys()):
+            if self.resident_bytes() <= self.budget_bytes:
+                break
+            if key != keep:
+                self._evict(key, "memory budget")
+
+        if self.resident_bytes() > self.budget_bytes:
+            logger.warning(
+                f"Model {keep} alone exceeds the {self.budget_bytes / (1024 * 1024):.0f}MB budget"
+            )
+
+    def _evict(self, key: str, reason: str):
+        """Drop a model from the registry"""
+        entry = self._models.pop(key, None)
+        if entry is not None:
+            self.evictions += 1
+            logger.info(f"Evicted model {key} ({reason})")
+            gc.collect()
+
+    def sweep(self):
+        """Evict models that have been idle for longer than the TTL"""
+        if self.idle_ttl <= 0:
+            return
+        with self._lock:
+            cutoff = time.monotonic() - self.idle_ttl
+            for key in [k for k, e in self._models.items() if e["last_used"] < cutoff]:
+                self._evict(key, "idle TTL")
+
+    def evict(self, key: str):
+        """Explicitly evict a model"""
+        with self._lock:
+            self._evict(key, "manual")
+
+    def clear(self):
+        """Evict all models"""
+        with self._lock:
+            for key in list(self._models.keys()):
+                self._evict(key, "manual")
+
+    def resident_bytes(self) -> int:
+        """Total measured bytes of all resident models"""
+        return sum(entry["bytes"] for entry in self._models.values())
+
+    def footprint(self, key: str) -> Optional[int]:
+        """Measured bytes of a resident model, or None if it is not loaded"""
+        entry = self._models.get(key)
+        return entry["bytes"] if entry is not None else None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._models
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get registry counters and resident models.
+
+        Returns:
+            dict: hits, misses, evictions, budget/resident bytes and per-model details
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "budget_bytes": self.budget_bytes,
+                "resident_bytes": self.resident_bytes(),
+                "idle_ttl": self.idle_ttl,
+                "models": {
+                    key: {
+                        "bytes": entry["bytes"],
+                        "idle_seconds": now - entry["last_used"],
+                    }
+                    for key, entry in self._models.items()
+                },
+            }
@@ -0,0 +1,195 @@
+"""
+Shared-prefix KV cache for the Prompt Engineering Studio.
+Every generation starts with the same safety preamble and static template text,
+so their past key/values are computed once per (model, prefix) and reused;
+only the user's input and the new tokens are processed per request.
+"""
+
+import copy
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PREFIXES_PER_MODEL = 32
+
+# Attribute holding each pipeline's prefix entries, so they are freed with the model
+_ENTRIES_ATTR = "_prompt_studio_prefix_kv"
+_PREFILL_LOCKS_ATTR = "_prompt_studio_prefix_locks"
+
+
+def _common_prefix_length(a: List[int], b: List[int]) -> int:
+    """Number of leading token ids shared by two sequences"""
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+
+class PrefixCache:
+    """
+    Cache of prefilled past key/values for static prompt prefixes.
+
+    Entries live on the pipeline object itself, so a model evicted from the
+    model registry takes its cached prefixes with it. Counters are global.
+    """
+
+    def __init__(self, max_prefixes_per_model: int = DEFAULT_MAX_PREFIXES_PER_MODEL):
+        self.max_prefixes_per_model = max_prefixes_per_model
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.prefill_tokens_saved = 0
+        self.prefill_seconds_saved = 0.0
+
+    @staticmethod
+    def supports(model_pipeline: Any) -> bool:
+        """Prefix reuse needs a decoder-only model with a tokenizer"""
+        model = getattr(model_pipeline, "model", None)
+        return (
+            model is not None
+            and getattr(model_pipeline, "tokenizer", None) is not None
+            and hasattr(model, "generate")
+            and not getattr(model.config, "is_encoder_decoder", False)
+        )
+
+    def _entry(self, model_pipeline: Any, static_prefix: str) -> Dict[str, Any]:
+        """Return the prefilled entry for a prefix, computing it on a miss"""
+        import torch
+
+        with self._lock:
+            entries = getattr(model_pipeline, _ENTRIES_ATTR, None)
+            if entries is None:
+                entries = OrderedDict()
+                setattr(model_pipeline, _ENTRIES_ATTR, entries)
+                setattr(model_pipeline, _PREFILL_LOCKS_ATTR, {})
+
+            entry = entries.get(static_prefix)
+            if entry is not None:
+                entries.move_to_end(static_prefix)
+                self.hits += 1
+                return entry
+            prefill_locks = getattr(model_pipeline, _PREFILL_LOCKS_ATTR)
+            prefill_lock = prefill_locks.setdefault(static_prefix, threading.Lock())
+
+        # Prefill outside the cache-wide lock, so other models and prefixes are
+        # not blocked; concurrent misses on the same prefix wait for one prefill
+        with prefill_lock:
+            with self._lock:
+                entry = entries.get(static_prefix)
+                if entry is not None:
+                    entries.move_to_end(static_prefix)
+                    self.hits += 1
+                    return entry
+                self.misses += 1
+
+            try:
+                prefix_ids = model_pipeline.tokenizer(static_prefix, return_tensors="pt")[
+                    "input_ids"
+                ]
+                start_time = time.perf_counter()
+                with torch.inference_mode():
+                    outputs = model_pipeline.model(input_ids=prefix_ids, use_cache=True)
+                entry = {
+                    "token_ids": prefix_ids[0].tolist(),
+                    "past_key_values": outputs.past_key_values,
+                    "prefill_seconds": time.perf_counter() - start_time,
+                }
+            finally:
+                with self._lock:
+                    prefill_locks.pop(static_prefix, None)
+
+            with self._lock:
+                entries[static_prefix] = entry
+                while len(entries) > self.max_prefixes_per_model:
+                    entries.popitem(last=False)
+            return entry
+
+    def prepare(
+        self, model_pipeline: Any, prompt: str, static_prefix: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build generate() inputs that reuse the cached prefix key/values.
+
+        Args:
+            model_pipeline: The loaded transformers pipeline
+            prompt (str): The full prompt
+            static_prefix (str, optional): The part of the prompt shared across requests
+
+        Returns:
+            dict or None: input_ids, attention_mask and past_key_values for
+            model.generate, or None when the prompt cannot reuse a prefix
+        """
+        if (
+            not static_prefix
+            or not prompt.startswith(static_prefix)
+            or not self.supports(model_pipeline)
+        ):
+            with self._lock:
+                self.bypasses += 1
+            return None
+
+        import torch
+
+        entry = self._entry(model_pipeline, static_prefix)
+        inputs = model_pipeline.tokenizer(prompt, return_tensors="pt")
+        input_ids = inputs["input_ids"]
+
+        # Tokenizers may merge across the prefix boundary (e.g. a trailing space),
+        # so only the tokens both sequences share can reuse cached values, and
+        # at least one prompt token must still be processed
+        reused = _common_prefix_length(entry["token_ids"], input_ids[0].tolist())
+        reused = min(reused, input_ids.shape[1] - 1)
+        if reused <= 0:
+            with self._lock:
+                self.bypasses += 1
+            return None
+
+        # generate() extends the cache in place, so each request gets its own copy
+        past_key_values = copy.deepcopy(entry["past_key_values"])
+        if reused < len(entry["token_ids"]):
+            past_key_values.crop(reused)
+
+        with self._lock:
+            self.prefill_tokens_saved += reused
+            self.prefill_seconds_saved += entry["prefill_seconds"] * (
+                reused / len(entry["token_ids"])
+            )
+
+        return {
+            "input_ids": input_ids,
+            "attention_mask": torch.ones_like(input_ids),
+            "past_key_values": past_key_values,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get prefix cache counters.
+
+        Returns:
+            dict: hits, misses, bypasses, hit_rate, prefill tokens and seconds saved
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "prefill_tokens_saved": self.prefill_tokens_saved,
+                "prefill_seconds_saved": self.prefill_seconds_saved,
+            }
+
+
+_prefix_cache = PrefixCache()
+
+
+def get_prefix_cache() -> PrefixCache:
+    """Return the process-wide prefix cache"""
+    return _prefix_cache
@@ -2,27 +2,30 @@
 Prompt Engineering Tools for professional prompt optimization
 """
 
+from models.rule_engine import get_rule_engine
+
+
 def prompt_refiner(prompt: str) -> str:
     """
     AI-powered prompt optimization and refinement
     """
     prompt_stripped = prompt.strip()
-    prompt_lower = prompt_stripped.lower()
     
     if len(prompt_stripped) < 10:
         return f"**OPTIMIZED PROMPT:**\n\nPlease provide a detailed and comprehensive response to: '{prompt_stripped}'\n\nEnsure your response includes:\n• Relevant context and background\n• Specific examples and use cases\n• Clear, actionable information\n• Well-structured presentation"
     
-    # Advanced prompt optimization based on type
-    if any(word in prompt_lower for word in ["code", "function", "programming", "development"]):
+    # Advanced prompt optimization based on type (keywords in rules/prompt_refiner.json)
+    category = get_rule_engine("prompt_refiner").first_category(prompt_stripped)
+    if category == "code":
         return f"**OPTIMIZED PROMPT:**\n\n{prompt_stripped}\n\n**Requirements:**\n1. Provide working, commented code examples\n2. Explain the logic and methodology\n3. Include error handling and edge cases\n4. Suggest optimizations and alternatives\n5. Add relevant documentation and best practices"
     
-    if any(word in prompt_lower for word in ["explain", "describe", "what is", "how does"]):
+    if category == "explanation":
         return f"**OPTIMIZED PROMPT:**\n\n{prompt_stripped}\n\n**Structure your response with:**\n• **Definition**: Clear, concise explanation\n• **Context**: Why this matters and when to use it\n• **Examples**: Real-world applications and scenarios\n• **Key Points**: Most important takeaways\n• **Further Reading**: Related concepts or resources"
     
-    if any(word in prompt_lower for word in ["compare", "versus", "difference", "pros and cons"]):
+    if category == "comparison":
         return f"**OPTIMIZED PROMPT:**\n\n{prompt_stripped}\n\n**Provide comprehensive comparison:**\n• **Overview**: Brief introduction to items being compared\n• **Similarities**: What they have in common\n• **Key Differences**: Major distinguishing factors\n• **Pros & Cons**: Advantages and disadvantages of each\n• **Use Cases**: When to choose one over the other\n• **Recommendation**: Best choice for specific scenarios"
     
-    if any(word in prompt_lower for word in ["analyze", "review", "evaluate", "assessment"]):
+    if category == "analysis":
         return f"**OPTIMIZED PROMPT:**\n\n{prompt_stripped}\n\n**Framework for analysis:**\n• **Executive Summary**: Key findings upfront\n• **Methodology**: How the analysis was conducted\n• **Key Findings**: Major discoveries and insights\n• **Evidence**: Supporting data and examples\n• **Implications**: What this means and why it matters\n• **Recommendations**: Actionable next steps"
     
     # Default optimization
@@ -35,6 +38,8 @@ def prompt_analyzer(prompt: str) -> str:
     """
     prompt_stripped = prompt.strip()
     analysis = []
+    # Keywords in rules/prompt_analyzer.json
+    categories = get_rule_engine("prompt_analyzer").classify(prompt_stripped)
     
     # Length analysis
     word_count = len(prompt_stripped.split())
@@ -46,13 +51,13 @@ def prompt_analyzer(prompt: str) -> str:
         analysis.append("✅ **Length**: Good detail level")
     
     # Clarity analysis
-    if any(word in prompt_stripped.lower() for word in ["please", "could you", "would you"]):
+    if "polite" in categories:
         analysis.append("✅ **Tone**: Polite and professional")
     else:
         analysis.append("⚠️ **Tone**: Consider adding polite language")
     
     # Specificity analysis
-    if any(word in prompt_stripped.lower() for word in ["specific", "detailed", "example", "step"]):
+    if "specific" in categories:
         analysis.append("✅ **Specificity**: Requests specific information")
     else:
         analysis.append("❌ **Specificity**: Too vague - add specific requirements")
@@ -64,7 +69,7 @@ def prompt_analyzer(prompt: str) -> str:
         analysis.append("⚠️ **Structure**: Consider framing as a clear question")
     
     # Context analysis
-    if any(word in prompt_stripped.lower() for word in ["context", "background", "situation", "scenario"]):
+    if "context" in categories:
         analysis.append("✅ **Context**: Provides situational context")
     else:
         analysis.append("❌ **Context**: Missing background information")
@@ -0,0 +1,233 @@
+"""
+Response cache for the Prompt Engineering Studio.
+Stores deterministic generations in an in-memory LRU tier backed by an on-disk
+SQLite tier with TTL and size-based eviction, so repeated runs survive restarts.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from utils.sqlite_store import open_sqlite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.environ.get("PROMPT_STUDIO_CACHE_DIR", ".cache")
+DEFAULT_TTL = float(os.environ.get("PROMPT_STUDIO_RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))
+DEFAULT_MAX_DISK_MB = float(os.environ.get("PROMPT_STUDIO_RESPONSE_CACHE_MB", "64"))
+DEFAULT_MEMORY_ENTRIES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+"""
+
+
+def is_deterministic(params: Dict[str, Any]) -> bool:
+    """
+    Check whether generation parameters produce a reproducible output.
+
+    Args:
+        params (dict): Generation parameters (do_sample, seed, ...)
+
+    Returns:
+        bool: True for greedy decoding or sampling with a fixed seed
+    """
+    return not params.get("do_sample", True) or params.get("seed") is not None
+
+
+def make_cache_key(model_name: str, prompt: str, params: Dict[str, Any]) -> str:
+    """
+    Build a cache key from the model id, final prompt hash and generation parameters.
+
+    Args:
+        model_name (str): The actual model name or tool identifier
+        prompt (str): The final prompt sent to the model
+        params (dict): Generation parameters
+
+    Returns:
+        str: Hex digest identifying the generation
+    """
+    payload = json.dumps(
+        {
+            "model": model_name,
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "params": params,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of generated responses.
+
+    Lookups hit the in-memory LRU first and fall back to SQLite, promoting disk
+    hits into memory. Disk entries expire after ``ttl`` seconds and the least
+    recently accessed entries are dropped once the file exceeds ``max_disk_mb``.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        max_disk_mb: float = DEFAULT_MAX_DISK_MB,
+    ):
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, "responses.sqlite3")
+
+        self.path = path
+        self.memory_entries = memory_entries
+        self.ttl = ttl
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self._memory = OrderedDict()  # key -> (response, created_at)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = open_sqlite(path, _SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): Key from make_cache_key
+
+        Returns:
+            str or None: The cached response, or None on a miss or expiry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, created_at = entry
+                if now - created_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return response
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+            return row[0]
+
+    def put(self, key: str, model_name: str, response: str):
+        """
+        Store a response in both tiers.
+
+        Args:
+            key (str): Key from make_cache_key
+            model_name (str): The model that produced the response
+            response (str): The generated text
+        """
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._remember(key, response, now)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, response, size, now, now),
+            )
+            self._evict_disk(now)
+            self._conn.commit()
+
+    def _remember(self, key: str, response: str, created_at: float):
+        """Insert into the memory tier, dropping the least recently used entry"""
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float):
+        """Remove expired rows, then the least recently accessed rows over the size limit"""
+        expired = self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+        ).rowcount
+        self.evictions += max(expired, 0)
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+
+        excess = total - self.max_disk_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC, rowid ASC"
+        ):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+        for (key,) in victims:
+            self._memory.pop(key, None)
+        self.evictions += len(victims)
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: memory/disk hits, misses, evictions and entry counts
+        """
+        with self._lock:
+            disk_entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+            }
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
@@ -0,0 +1,98 @@
+"""
+Data-driven keyword rule engine for the rule-based prompt tools.
+Each rule table maps category names to keyword lists; all keywords of a table
+are compiled into one matcher, so a prompt is classified in a single pass.
+"""
+
+import os
+import json
+import functools
+from typing import Dict, Iterable, List, Optional, Set
+from utils.keyword_matcher import KeywordMatcher
+
+# Rule tables ship next to this module; point this at another directory to override them
+DEFAULT_RULES_DIR = os.environ.get(
+    "PROMPT_STUDIO_RULES_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+)
+
+
+class RuleEngine:
+    """
+    Classifies text into keyword categories.
+
+    Matching is case-insensitive with substring semantics, the same as
+    ``any(word in text.lower() for word in keywords)`` for each category.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        """
+        Args:
+            categories (dict): Category name -> keywords, in priority order
+        """
+        self.order: List[str] = list(categories)
+        self._matcher = KeywordMatcher(
+            (keyword.lower(), name)
+            for name, keywords in categories.items()
+            for keyword in keywords
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "RuleEngine":
+        """
+        Load a rule table from JSON: {"categories": {"name": ["keyword", ...]}}.
+
+        Args:
+            path (str): Path to the rule table
+
+        Returns:
+            RuleEngine: The compiled engine
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["categories"])
+
+    def __len__(self) -> int:
+        """Number of distinct keywords"""
+        return len(self._matcher)
+
+    def classify(self, text: str) -> Set[str]:
+        """
+        Get every category with a keyword in the text.
+
+        Args:
+            text (str): Text to classify
+
+        Returns:
+            Set[str]: Matching category names
+        """
+        return self._matcher.labels(text.lower())
+
+    def first_category(self, text: str) -> Optional[str]:
+        """Get the highest-priority matching category, or None"""
+        return self._matcher.first_label(text.lower(), self.order)
+
+    def classify_many(self, texts: Iterable[str]) -> List[Set[str]]:
+        """
+        Classify many texts, e.g. when auditing a prompt corpus.
+
+        Args:
+            texts: Texts to classify
+
+        Returns:
+            List[Set[str]]: Matching categories for each text
+        """
+        labels = self._matcher.labels
+        return [labels(text.lower()) for text in texts]
+
+
+@functools.lru_cache(maxsize=None)
+def get_rule_engine(name: str) -> RuleEngine:
+    """
+    Return the compiled rule engine for a rule table, loading it once.
+
+    Args:
+        name (str): Rule table name, e.g. "prompt_refiner"
+
+    Returns:
+        RuleEngine: The shared engine
+    """
+    return RuleEngine.from_file(os.path.join(DEFAULT_RULES_DIR, f"{name}.json"))
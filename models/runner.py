@@ -0,0 +1,326 @@
+"""
+Model execution utilities for the Prompt Engineering Studio.
+Runs prompt engineering tools and validation models, one after another or
+concurrently on a bounded worker pool.
+"""
+
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from models.load_model import try_load_model, stream_text, DEFAULT_PRECISION
+from models.batching import get_micro_batcher
+from models.response_cache import get_response_cache, is_deterministic, make_cache_key
+from models.worker_pool import get_worker_client
+from utils.prompt_formatter import format_prompt
+from utils.safety import safe_format_prompt, filter_output, StreamingOutputFilter
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Rule-based tools return their output directly and skip safety filtering
+PROMPT_TOOLS = [
+    "prompt_refiner",
+    "prompt_analyzer",
+    "few_shot_generator",
+    "cot_builder",
+    "fakegpt",
+]
+
+# Default number of models processed at the same time
+DEFAULT_MAX_WORKERS = 3
+
+
+def is_prompt_tool(model_name: str) -> bool:
+    """Check if a model name refers to a rule-based prompt engineering tool"""
+    return model_name in PROMPT_TOOLS
+
+
+def get_static_prefix(template: str) -> str:
+    """
+    Get the part of the final prompt that does not depend on the user input.
+
+    This is the safety preamble plus the template text before the input
+    placeholder, which the prefix cache prefills once per model.
+
+    Args:
+        template (str): The prompt template
+
+    Returns:
+        str: The static prefix, or an empty string if the template has no placeholder
+    """
+    marker = "\x00"  # Cannot appear in typed input
+    final_prompt = safe_format_prompt(format_prompt(template, marker))
+    if marker not in final_prompt:
+        return ""
+    return final_prompt.split(marker, 1)[0]
+
+
+def _finish(
+    model_name: str,
+    raw_generated_text: str,
+    generation_time: float,
+    cached: bool,
+    metrics: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Apply safety filtering and package a run result"""
+    # Apply safety filtering (skip for prompt engineering tools)
+    if is_prompt_tool(model_name):
+        filtered_text = raw_generated_text
+        was_filtered = False
+    else:
+        with span("filter_output"):
+            filtered_text, was_filtered = filter_output(raw_generated_text)
+
+    if was_filtered:
+        logger.info(f"Content filtered for model {model_name}")
+
+    return {
+        "model_name": model_name,
+        "response": filtered_text,
+        "was_filtered": was_filtered,
+        "generation_time": generation_time,
+        "loaded": True,
+        "cached": cached,
+        "metrics": metrics or {"total_time": generation_time},
+    }
+
+
+def run_model(
+    model_name: str,
+    final_prompt: str,
+    max_new_tokens: int = 50,
+    do_sample: bool = True,
+    seed: Optional[int] = None,
+    use_cache: bool = True,
+    on_chunk: Optional[Callable[[str], None]] = None,
+    precision: str = DEFAULT_PRECISION,
+    static_prefix: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Load a model or tool, generate a response and apply safety filtering.
+
+    Deterministic runs (prompt tools, greedy decoding or a fixed seed) are
+    served from the response cache when the same prompt was seen before.
+    When ``on_chunk`` is given, Hugging Face models stream their output and
+    the callback receives the accumulated text after every decoded chunk.
+    Hugging Face models run on the out-of-process worker pool when
+    PROMPT_STUDIO_WORKER_ADDRESS is set.
+
+    Args:
+        model_name (str): The actual model name or tool identifier
+        final_prompt (str): The fully formatted prompt
+        max_new_tokens (int): Maximum number of new tokens to generate
+        do_sample (bool): Sample the output; False uses greedy decoding
+        seed (int, optional): Fixed seed that makes sampling reproducible
+        use_cache (bool): Read and write the response cache for deterministic runs
+        on_chunk (callable, optional): Receives the partial text while streaming
+        precision (str): "fp32", "bf16" or "int8" for Hugging Face models
+        static_prefix (str, optional): Input-independent start of the prompt
+            (see get_static_prefix) reused from the prefix KV cache
+
+    Returns:
+        dict: model_name, response, was_filtered, generation_time, loaded, cached
+        and metrics (time_to_first_token, tokens and tokens_per_sec when streamed,
+        plus tokens_saved and cpu_time_saved when filtering stopped the stream early)
+    """
+    worker_client = None if is_prompt_tool(model_name) else get_worker_client()
+    if worker_client is not None:
+        try:
+            return worker_client.run_model(
+                model_name,
+                final_prompt,
+                on_chunk=on_chunk,
+                max_new_tokens=max_new_tokens,
+                do_sample=do_sample,
+                seed=seed,
+                use_cache=use_cache,
+                precision=precision,
+                static_prefix=static_prefix,
+            )
+        except (OSError, EOFError, AuthenticationError) as e:
+            return _failed_result(model_name, e)
+
+    # Prompt tools ignore generation parameters and are always deterministic
+    if is_prompt_tool(model_name):
+        params = {}
+    else:
+        params = {
+            "max_new_tokens": max_new_tokens,
+            "do_sample": do_sample,
+            "seed": seed,
+            "precision": precision,
+        }
+    cacheable = use_cache and (is_prompt_tool(model_name) or is_deterministic(params))
+
+    if cacheable:
+        start_time = time.time()
+        cache_key = make_cache_key(model_name, final_prompt, params)
+        with span("response_cache") as labels:
+            cached_text = get_response_cache().get(cache_key)
+            labels["result"] = "miss" if cached_text is None else "hit"
+        if cached_text is not None:
+            return _finish(model_name, cached_text, time.time() - start_time, True)
+
+    model_pipeline, load_error = try_load_model(model_name, precision=precision)
+
+    if model_pipeline is None:
+        # Returned rather than shown: runs may be on threads without a Streamlit context
+        return {
+            "model_name": model_name,
+            "response": f"❌ Failed to load model '{model_name}': {load_error}",
+            "was_filtered": False,
+            "generation_time": 0,
+            "loaded": False,
+            "cached": False,
+            "metrics": {},
+        }
+
+    # Time the generation
+    metrics = {}
+    start_time = time.time()
+    if is_prompt_tool(model_name):
+        with span("tool", tool=model_name):
+            raw_generated_text = model_pipeline(final_prompt)
+    elif on_chunk is not None:
+        # Partial text is shown to users, so it is filtered like the final output,
+        # and generation stops as soon as the output would be filtered anyway
+        output_filter = StreamingOutputFilter()
+        stop_event = threading.Event()
+        for chunk in stream_text(
+            model_pipeline,
+            final_prompt,
+            max_new_tokens=max_new_tokens,
+            do_sample=do_sample,
+            seed=seed,
+            metrics=metrics,
+            static_prefix=static_prefix,
+            stop_event=stop_event,
+        ):
+            if stop_event.is_set():
+                continue  # Tokens decoded before generation noticed the stop
+            if "error" in metrics:
+                continue  # The error message, reported below instead of as output
+            with span("filter_output", partial=True):
+                if output_filter.feed(chunk):
+                    stop_event.set()
+            on_chunk(output_filter.output)
+        raw_generated_text = output_filter.text.strip()
+        error = metrics.pop("error", None)
+        if error is not None:
+            # A failed run is reported as an error (and never cached), keeping what streamed
+            raw_generated_text = f"❌ Generation failed: {error}" + (
+                f"\n\n{raw_generated_text}" if raw_generated_text else ""
+            )
+        if metrics.get("stopped_early"):
+            logger.info(
+                f"Stopped {model_name} early on filtered output, "
+                f"saving {metrics['tokens_saved']} tokens"
+            )
+    else:
+        # Concurrent requests for the same model share one padded batch
+        raw_generated_text = get_micro_batcher().generate(
+            model_pipeline,
+            final_prompt,
+            max_new_tokens=max_new_tokens,
+            do_sample=do_sample,
+            seed=seed,
+            static_prefix=static_prefix,
+        )
+    end_time = time.time()
+
+    # Errors are not cached so they are retried on the next run
+    if cacheable and not raw_generated_text.startswith("❌"):
+        get_response_cache().put(cache_key, model_name, raw_generated_text)
+
+    return _finish(
+        model_name, raw_generated_text, end_time - start_time, False, metrics or None
+    )
+
+
+def _failed_result(model_name: str, error: Exception) -> Dict[str, Any]:
+    """Result for a model run that raised instead of returning"""
+    logger.error(f"Model run failed for {model_name}: {str(error)}")
+    return {
+        "model_name": model_name,
+        "response": f"❌ Generation failed: {str(error)}",
+        "was_filtered": False,
+        "generation_time": 0,
+        "loaded": False,
+        "cached": False,
+        "metrics": {},
+    }
+
+
+def run_models_concurrently(
+    model_names: List[str],
+    final_prompt: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    max_new_tokens: int = 50,
+    do_sample: bool = True,
+    seed: Optional[int] = None,
+    stream: bool = False,
+    precision: str = DEFAULT_PRECISION,
+    static_prefix: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run several models in parallel and yield each result as soon as it finishes.
+
+    With ``stream=True`` partial updates are interleaved with the results as
+    ``{"model_name": ..., "partial": text_so_far}`` dicts.
+
+    Args:
+        model_names (List[str]): The actual model names or tool identifiers
+        final_prompt (str): The fully formatted prompt
+        max_workers (int): Maximum number of models processed at the same time
+        max_new_tokens (int): Maximum number of new tokens to generate
+        do_sample (bool): Sample the output; False uses greedy decoding
+        seed (int, optional): Fixed seed that makes sampling reproducible
+        stream (bool): Also yield partial text while models are generating
+        precision (str): "fp32", "bf16" or "int8" for Hugging Face models
+        static_prefix (str, optional): Input-independent start of the prompt
+
+    Yields:
+        dict: The run_model result for each model, in completion order
+    """
+    if not model_names:
+        return
+
+    # Workers only push events; the caller's thread consumes them in order
+    events = queue.Queue()
+
+    def _run(name: str):
+        on_chunk = None
+        if stream:
+            on_chunk = lambda text: events.put({"model_name": name, "partial": text})
+        try:
+            result = run_model(
+                name,
+                final_prompt,
+                max_new_tokens=max_new_tokens,
+                do_sample=do_sample,
+                seed=seed,
+                on_chunk=on_chunk,
+                precision=precision,
+                static_prefix=static_prefix,
+            )
+        except Exception as e:
+            result = _failed_result(name, e)
+        events.put(result)
+
+    workers = max(1, min(max_workers, len(model_names)))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="model-runner"
+    ) as executor:
+        for name in model_names:
+            executor.submit(_run, name)
+
+        remaining = len(model_names)
+        while remaining:
+            event = events.get()
+            if "partial" not in event:
+                remaining -= 1
+            yield event
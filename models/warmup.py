@@ -0,0 +1,155 @@
+"""
+Background model preloading for the Prompt Engineering Studio.
+Loads a configurable list of models when the server starts and runs a dummy
+generation on each, so the first real request sees steady-state latency.
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, List, Optional
+from models.load_model import (
+    DEFAULT_PRECISION,
+    load_model,
+    generate_text,
+    get_model_registry,
+    resolve_precision,
+    registry_key,
+)
+from models.runner import is_prompt_tool
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated list of models to preload, e.g. "distilgpt2,google/flan-t5-small"
+DEFAULT_PRELOAD_MODELS = os.environ.get("PROMPT_STUDIO_PRELOAD_MODELS", "")
+
+WARMUP_PROMPT = "Hello"
+
+# Keyed like the model registry, by model name and precision
+_status: Dict[str, str] = {}
+_status_lock = threading.Lock()
+_preload_thread: Optional[threading.Thread] = None
+
+
+def _set_status(model_name: str, status: str):
+    with _status_lock:
+        _status[model_name] = status
+
+
+def parse_preload_list(value: str) -> List[str]:
+    """
+    Parse a comma-separated preload setting.
+
+    Args:
+        value (str): Model names separated by commas
+
+    Returns:
+        List[str]: Model names without blanks or duplicates
+    """
+    names = []
+    for name in value.split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def warm_up_model(model_name: str, precision: str = DEFAULT_PRECISION) -> bool:
+    """
+    Load a model and run a one-token greedy generation to trigger lazy initialization.
+
+    Args:
+        model_name (str): The actual model name
+        precision (str): Precision mode the model will be requested in
+
+    Returns:
+        bool: True if the model is loaded and warmed up
+    """
+    key = registry_key(model_name, resolve_precision(precision))
+    _set_status(key, "loading")
+    model_pipeline = load_model(model_name, precision)
+    if model_pipeline is None:
+        _set_status(key, "failed")
+        return False
+
+    _set_status(key, "warming up")
+    output = generate_text(model_pipeline, WARMUP_PROMPT, max_new_tokens=1, do_sample=False)
+    if output.startswith("❌"):
+        logger.warning(f"Warm-up generation failed for {model_name}: {output}")
+        _set_status(key, "failed")
+        return False
+
+    _set_status(key, "ready")
+    logger.info(f"Model {model_name} ({precision}) is warmed up")
+    return True
+
+
+def _preload(model_names: List[str], precision: str):
+    for model_name in model_names:
+        try:
+            warm_up_model(model_name, precision)
+        except Exception as e:
+            logger.error(f"Preloading {model_name} failed: {str(e)}")
+            _set_status(registry_key(model_name, precision), "failed")
+
+
+def start_preload(
+    model_names: Optional[List[str]] = None, precision: str = DEFAULT_PRECISION
+) -> Optional[threading.Thread]:
+    """
+    Start preloading models in a background thread, once per process.
+
+    Args:
+        model_names (List[str], optional): Models to preload; defaults to
+            the PROMPT_STUDIO_PRELOAD_MODELS setting
+        precision (str): Precision mode the models will be requested in
+
+    Returns:
+        Thread or None: The preload thread, or None if there is nothing to load
+    """
+    global _preload_thread
+    if model_names is None:
+        model_names = parse_preload_list(DEFAULT_PRELOAD_MODELS)
+
+    with _status_lock:
+        if _preload_thread is not None:
+            return _preload_thread
+        if not model_names:
+            return None
+        resolved = resolve_precision(precision, warn=False)
+        for model_name in model_names:
+            _status.setdefault(registry_key(model_name, resolved), "pending")
+        _preload_thread = threading.Thread(
+            target=_preload, args=(model_names, resolved), name="model-preload", daemon=True
+        )
+        _preload_thread.start()
+
+    logger.info(f"Preloading models in background: {', '.join(model_names)}")
+    return _preload_thread
+
+
+def get_readiness(model_name: str, precision: str = DEFAULT_PRECISION) -> str:
+    """
+    Get the readiness status of a model.
+
+    Args:
+        model_name (str): The actual model name or tool identifier
+        precision (str): Precision mode the model will be requested in
+
+    Returns:
+        str: "ready", "pending", "loading", "warming up", "failed" or "not loaded"
+    """
+    # Rule-based tools need no loading and are always ready
+    if is_prompt_tool(model_name):
+        return "ready"
+
+    key = registry_key(model_name, resolve_precision(precision, warn=False))
+    with _status_lock:
+        status = _status.get(key)
+
+    if status in ("pending", "loading", "warming up"):
+        return status
+    # Models loaded on demand (or evicted since preloading) follow the registry
+    if key in get_model_registry():
+        return "ready"
+    return status if status == "failed" else "not loaded"
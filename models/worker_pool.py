@@ -0,0 +1,543 @@
+"""
+Out-of-process model workers for the Prompt Engineering Studio.
+
+A pool of long-lived worker processes owns the loaded models and serves jobs
+over a local authenticated socket, so several Streamlit replicas on one host
+share one copy of the weights and inference never runs on the UI's GIL. Each
+model is pinned to one worker, and crashed workers are restarted with their
+in-flight jobs failed.
+
+Start the pool with:
+    python -m models.worker_pool --address 127.0.0.1:6150 --workers 2
+and point the app at it with PROMPT_STUDIO_WORKER_ADDRESS=127.0.0.1:6150.
+
+Connections carry pickled jobs, so the authkey is all that stops other users
+from running code in the workers. It is taken from PROMPT_STUDIO_WORKER_AUTHKEY,
+or else from a key file only its owner can read (PROMPT_STUDIO_WORKER_AUTHKEY_FILE),
+which the server fills with a random key on first start.
+"""
+
+import os
+import time
+import zlib
+import queue
+import logging
+import socket
+import ipaddress
+import signal
+import secrets
+import argparse
+import threading
+import itertools
+import multiprocessing
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Settings shared by the pool server and its clients
+WORKER_ADDRESS_ENV = "PROMPT_STUDIO_WORKER_ADDRESS"
+WORKER_AUTHKEY_ENV = "PROMPT_STUDIO_WORKER_AUTHKEY"
+WORKER_AUTHKEY_FILE_ENV = "PROMPT_STUDIO_WORKER_AUTHKEY_FILE"
+DEFAULT_AUTHKEY_FILE = os.path.join("~", ".prompt_studio", "worker_authkey")
+DEFAULT_NUM_WORKERS = 2
+
+# How often the supervisor checks for dead workers
+SUPERVISE_INTERVAL = 1.0
+
+
+def parse_address(value: str) -> Union[str, Tuple[str, int]]:
+    """
+    Parse a worker pool address.
+
+    Args:
+        value (str): "host:port" for TCP, or a filesystem path for a Unix socket
+
+    Returns:
+        str or tuple: An address accepted by multiprocessing.connection
+    """
+    if "/" in value or ":" not in value:
+        return value
+    host, port = value.rsplit(":", 1)
+    return (host or "127.0.0.1", int(port))
+
+
+def _authkey_file() -> str:
+    return os.path.expanduser(os.environ.get(WORKER_AUTHKEY_FILE_ENV, DEFAULT_AUTHKEY_FILE))
+
+
+def _authkey(create: bool = False) -> bytes:
+    """
+    Get the shared worker pool authkey.
+
+    Args:
+        create (bool): Generate a random key file if there is none (server side)
+
+    Returns:
+        bytes: The authkey
+
+    Raises:
+        PermissionError: If there is no key, or the key file is readable by others
+    """
+    key = os.environ.get(WORKER_AUTHKEY_ENV)
+    if key:
+        return key.encode("utf-8")
+
+    path = _authkey_file()
+    if create and not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass  # Created by another server starting at the same time
+        else:
+            with os.fdopen(fd, "wb") as f:
+                f.write(secrets.token_bytes(32))
+            logger.info(f"Generated a worker pool authkey in {path}")
+
+    try:
+        if os.stat(path).st_mode & 0o077:
+            raise PermissionError(f"Worker pool authkey file {path} must only be readable by its owner (chmod 600)")
+        with open(path, "rb") as f:
+            key = f.read()
+    except FileNotFoundError:
+        key = b""
+    if not key:
+        raise PermissionError(
+            f"No worker pool authkey: set {WORKER_AUTHKEY_ENV} or start the pool to create {path}"
+        )
+    return key
+
+
+def _worker_main(worker_id: int, jobs, events, preload: List[str]):
+    """Worker process loop: run jobs with the in-process runner and report back"""
+    # Workers always run models locally, never through another pool
+    os.environ.pop(WORKER_ADDRESS_ENV, None)
+    from models.load_model import get_model_registry
+    from models.runner import run_model, _failed_result
+    from models.warmup import warm_up_model
+
+    for model_name in preload:
+        warm_up_model(model_name)
+    events.put((None, worker_id, get_model_registry().stats()))
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+
+        job_id = job["job_id"]
+        on_chunk = None
+        if job["stream"]:
+            on_chunk = lambda text: events.put(
+                (job_id, worker_id, {"model_name": job["model_name"], "partial": text})
+            )
+        try:
+            result = run_model(
+                job["model_name"], job["prompt"], on_chunk=on_chunk, **job["kwargs"]
+            )
+        except Exception as e:
+            result = _failed_result(job["model_name"], e)
+        result["worker_stats"] = get_model_registry().stats()
+        events.put((job_id, worker_id, result))
+
+
+class WorkerPool:
+    """
+    Supervised pool of model worker processes.
+
+    Jobs for the same model always go to the same worker, so each model is
+    loaded once per pool. Events from workers are routed back to per-job
+    callbacks by a single router thread.
+    """
+
+    def __init__(
+        self, num_workers: int = DEFAULT_NUM_WORKERS, preload: Optional[List[str]] = None
+    ):
+        self.num_workers = max(1, num_workers)
+        self.preload = preload or []
+        # Spawn, so workers do not inherit the server's threads and sockets
+        self._ctx = multiprocessing.get_context("spawn")
+        self._events = self._ctx.Queue()
+        self._workers: List[Optional[Tuple[Any, Any]]] = [None] * self.num_workers
+        self._inflight: Dict[int, Tuple[int, str, Callable]] = {}
+        self._worker_stats: Dict[int, Dict[str, Any]] = {}
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._running = False
+        self.restarts = 0
+        self.completed = 0
+
+    def worker_for(self, model_name: str) -> int:
+        """Stable worker index for a model"""
+        return zlib.crc32(model_name.encode("utf-8")) % self.num_workers
+
+    def _spawn(self, worker_id: int):
+        preload = [name for name in self.preload if self.worker_for(name) == worker_id]
+        jobs = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, jobs, self._events, preload),
+            name=f"model-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._workers[worker_id] = (process, jobs)
+        logger.info(f"Started model worker {worker_id} (pid {process.pid})")
+
+    def start(self):
+        """Start the worker processes and the router and supervisor threads"""
+        self._running = True
+        with self._lock:
+            for worker_id in range(self.num_workers):
+                self._spawn(worker_id)
+        threading.Thread(target=self._route, name="worker-router", daemon=True).start()
+        threading.Thread(
+            target=self._supervise, name="worker-supervisor", daemon=True
+        ).start()
+
+    def stop(self):
+        """Ask workers to exit and wait for them"""
+        self._running = False
+        with self._lock:
+            workers = [w for w in self._workers if w is not None]
+        for _, jobs in workers:
+            jobs.put(None)
+        for process, _ in workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    def submit(
+        self,
+        model_name: str,
+        prompt: str,
+        kwargs: Dict[str, Any],
+        callback: Callable[[Dict[str, Any]], None],
+        stream: bool = False,
+    ) -> int:
+        """
+        Queue a run_model job on the worker that owns the model.
+
+        Args:
+            model_name (str): The actual model name
+            prompt (str): The final prompt
+            kwargs (dict): Extra run_model keyword arguments
+            callback (callable): Receives partial events and the final result
+            stream (bool): Also deliver partial text events
+
+        Returns:
+            int: The job id
+        """
+        job_id = next(self._job_ids)
+        worker_id = self.worker_for(model_name)
+        with self._lock:
+            self._inflight[job_id] = (worker_id, model_name, callback)
+            _, jobs = self._workers[worker_id]
+        jobs.put(
+            {
+                "job_id": job_id,
+                "model_name": model_name,
+                "prompt": prompt,
+                "kwargs": kwargs,
+                "stream": stream,
+            }
+        )
+        return job_id
+
+    def _route(self):
+        while self._running:
+            try:
+                job_id, worker_id, event = self._events.get(timeout=SUPERVISE_INTERVAL)
+            except queue.Empty:
+                continue
+
+            if job_id is None:  # Startup report
+                with self._lock:
+                    self._worker_stats[worker_id] = event
+                continue
+
+            partial = "partial" in event
+            with self._lock:
+                entry = self._inflight.get(job_id) if partial else self._inflight.pop(job_id, None)
+                if not partial:
+                    self._worker_stats[worker_id] = event.pop("worker_stats", {})
+                    self.completed += 1
+            if entry is not None:
+                entry[2](event)
+
+    def _supervise(self):
+        while self._running:
+            time.sleep(SUPERVISE_INTERVAL)
+            with self._lock:
+                for worker_id, worker in enumerate(self._workers):
+                    process, _ = worker
+                    if process.is_alive() or not self._running:
+                        continue
+
+                    logger.error(
+                        f"Model worker {worker_id} died (exit code {process.exitcode}), restarting"
+                    )
+                    failed = [
+                        (job_id, entry)
+                        for job_id, entry in self._inflight.items()
+                        if entry[0] == worker_id
+                    ]
+                    crashed = f"❌ Model worker crashed (exit code {process.exitcode})"
+                    for job_id, (_, model_name, callback) in failed:
+                        del self._inflight[job_id]
+                        callback(_failed_result(model_name, crashed))
+                    self._worker_stats.pop(worker_id, None)
+                    self.restarts += 1
+                    self._spawn(worker_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool status.
+
+        Returns:
+            dict: worker count, restarts, completed and in-flight jobs, and the
+            latest model registry stats reported by each worker
+        """
+        with self._lock:
+            return {
+                "num_workers": self.num_workers,
+                "restarts": self.restarts,
+                "completed": self.completed,
+                "inflight": len(self._inflight),
+                "workers": {
+                    worker_id: {
+                        "pid": worker[0].pid,
+                        "alive": worker[0].is_alive(),
+                        "registry": self._worker_stats.get(worker_id, {}),
+                    }
+                    for worker_id, worker in enumerate(self._workers)
+                },
+            }
+
+
+def _failed_result(model_name: str, response: str) -> Dict[str, Any]:
+    return {
+        "model_name": model_name,
+        "response": response,
+        "was_filtered": False,
+        "generation_time": 0,
+        "loaded": False,
+        "cached": False,
+        "metrics": {},
+    }
+
+
+def _request_error(request: Any) -> Optional[str]:
+    """Describe what is wrong with a client request, or None if it is valid"""
+    if not isinstance(request, dict):
+        return "Request must be a dict"
+    if request.get("op") == "stats":
+        return None
+    for field in ("model_name", "prompt"):
+        if not isinstance(request.get(field), str):
+            return f"'{field}' must be a string"
+    if not isinstance(request.get("kwargs", {}), dict):
+        return "'kwargs' must be a dict"
+    return None
+
+
+def _handle_connection(pool: WorkerPool, conn):
+    """Serve one client request on its own thread"""
+    try:
+        request = conn.recv()
+        error = _request_error(request)
+        if error is not None:
+            model_name = request.get("model_name") if isinstance(request, dict) else None
+            if not isinstance(model_name, str):
+                model_name = ""
+            conn.send(_failed_result(model_name, f"❌ Invalid request: {error}"))
+            return
+        if request.get("op") == "stats":
+            conn.send(pool.stats())
+            return
+
+        events = queue.Queue()
+        pool.submit(
+            request["model_name"],
+            request["prompt"],
+            request.get("kwargs", {}),
+            events.put,
+            stream=request.get("stream", False),
+        )
+        while True:
+            event = events.get()
+            conn.send(event)
+            if "partial" not in event:
+                break
+    except (EOFError, OSError) as e:
+        logger.warning(f"Client connection closed: {str(e)}")
+    finally:
+        conn.close()
+
+
+def _raise_interrupt():
+    raise KeyboardInterrupt
+
+
+def _remove_stale_socket(path: str):
+    """Delete a Unix socket left behind by a server that was killed"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+    finally:
+        probe.close()
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def serve(address: str, num_workers: int = DEFAULT_NUM_WORKERS, preload: Optional[List[str]] = None):
+    """
+    Run the worker pool server until interrupted.
+
+    Args:
+        address (str): "host:port" or a Unix socket path to listen on
+        num_workers (int): Number of model worker processes
+        preload (List[str], optional): Models each worker loads at startup
+    """
+    listen_address = parse_address(address)
+    if isinstance(listen_address, str):
+        _remove_stale_socket(listen_address)
+    # Shut down cleanly (and remove the socket file) when the service manager stops us
+    signal.signal(signal.SIGTERM, lambda signum, frame: _raise_interrupt())
+
+    # Refuse to start without a key rather than listen unauthenticated
+    authkey = _authkey(create=True)
+    if isinstance(listen_address, tuple) and not _is_loopback(listen_address[0]):
+        logger.warning(
+            f"Worker pool is reachable from other hosts on {address}; "
+            "anyone holding the authkey can run code in the workers"
+        )
+
+    pool = WorkerPool(num_workers, preload)
+    pool.start()
+    listener = Listener(listen_address, authkey=authkey)
+    logger.info(f"Model worker pool listening on {address} with {num_workers} workers")
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except multiprocessing.AuthenticationError:
+                logger.warning("Rejected client with a wrong authkey")
+                continue
+            threading.Thread(
+                target=_handle_connection, args=(pool, conn), daemon=True
+            ).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        pool.stop()
+
+
+class WorkerPoolClient:
+    """Thin client that runs models on a remote worker pool"""
+
+    def __init__(self, address: str):
+        self.address = address
+        self._address = parse_address(address)
+
+    def _connect(self):
+        return Client(self._address, authkey=_authkey())
+
+    def run_model(
+        self,
+        model_name: str,
+        final_prompt: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Run a model on the pool; same arguments and result as runner.run_model.
+
+        Args:
+            model_name (str): The actual model name
+            final_prompt (str): The fully formatted prompt
+            on_chunk (callable, optional): Receives the partial text while streaming
+            **kwargs: Other run_model keyword arguments
+
+        Returns:
+            dict: The run_model result computed by the worker
+        """
+        conn = self._connect()
+        try:
+            conn.send(
+                {
+                    "op": "run",
+                    "model_name": model_name,
+                    "prompt": final_prompt,
+                    "kwargs": kwargs,
+                    "stream": on_chunk is not None,
+                }
+            )
+            while True:
+                event = conn.recv()
+                if "partial" not in event:
+                    return event
+                on_chunk(event["partial"])
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the pool status (see WorkerPool.stats)"""
+        conn = self._connect()
+        try:
+            conn.send({"op": "stats"})
+            return conn.recv()
+        finally:
+            conn.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_worker_client() -> Optional[WorkerPoolClient]:
+    """Return the worker pool client, or None when models run in-process"""
+    global _client
+    address = os.environ.get(WORKER_ADDRESS_ENV)
+    if not address:
+        return None
+    with _client_lock:
+        if _client is None or _client.address != address:
+            _client = WorkerPoolClient(address)
+        return _client
+
+
+def main():
+    from models.warmup import DEFAULT_PRELOAD_MODELS, parse_preload_list
+
+    parser = argparse.ArgumentParser(description="Prompt Engineering Studio model worker pool")
+    parser.add_argument(
+        "--address",
+        default=os.environ.get(WORKER_ADDRESS_ENV, "127.0.0.1:6150"),
+        help="host:port or Unix socket path to listen on",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_NUM_WORKERS)
+    parser.add_argument(
+        "--preload",
+        default=DEFAULT_PRELOAD_MODELS,
+        help="Comma-separated models to load at startup",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    serve(args.address, args.workers, parse_preload_list(args.preload))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the Streamlit app of Prompt Engineering Studio
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from streamlit.testing.v1 import AppTest
+
+import utils.history_store as history_store
+import utils.template_store as template_store
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+def test_app():
+    """Test the template editor actions and the history key"""
+    print("🧪 Testing App")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the app's stores out of the working directory
+        template_store._template_store = template_store.TemplateStore(os.path.join(tmp, "t.sqlite3"))
+        history_store._history_store = history_store.HistoryStore(os.path.join(tmp, "h.sqlite3"))
+        try:
+            at = AppTest.from_file(APP_PATH, default_timeout=60)
+            at.run()
+            assert not at.exception
+            editor = at.sidebar.text_area(key="template_editor")
+            saved = editor.value
+
+            # Test 1: Reset restores the saved template after an edit
+            print("\n1. Testing Reset:")
+            editor.set_value("Edited {input}").run()
+            assert at.sidebar.text_area(key="template_editor").value == "Edited {input}"
+            at.sidebar.button(key="reset_template").click().run()
+            assert not at.exception
+            assert at.sidebar.text_area(key="template_editor").value == saved
+            assert at.session_state.template_text == saved
+            print("✅ Reset discards edits")
+
+            # Test 2: The history key stays out of the URL and can be resumed
+            print("\n2. Testing History Key:")
+            history_store._history_store.append("saved-key", "Zero-shot", "hi", "hi", ["m"], {}, {})
+            at = AppTest.from_file(APP_PATH, default_timeout=60)
+            at.query_params["history"] = "saved-key"
+            at.run()
+            assert "history" not in at.query_params
+            assert at.session_state.history_id != "saved-key"
+            next(c for c in at.sidebar.checkbox if c.label == "Remember my session").check().run()
+            at.sidebar.text_input(key="resume_history_key").input("saved-key")
+            at.sidebar.button(key="resume_history").click().run()
+            assert not at.exception
+            assert at.session_state.history_id == "saved-key"
+            assert at.session_state.resume_history_key == ""
+            print("✅ History resumes only with its key")
+        finally:
+            template_store._template_store = None
+            history_store._history_store = None
+
+    print("\n🎉 All app tests passed!")
+
+
+if __name__ == "__main__":
+    test_app()
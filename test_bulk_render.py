@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk prompt rendering in Prompt Engineering Studio
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.bulk_render import BulkRenderer, render_table
+from utils.prompt_formatter import format_prompt
+from utils.safety import safe_format_prompt
+
+PROMPT_TYPES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompt_types.json")
+
+
+def test_bulk_render():
+    """Test bulk rendering against the per-row path and table formats"""
+    print("🧪 Testing Bulk Render")
+    print("=" * 50)
+
+    # Test 1: Same final prompts as the app
+    print("\n1. Testing Final Prompts:")
+    with open(PROMPT_TYPES_PATH, "r") as f:
+        templates = [entry["template"] for entry in json.load(f).values()]
+    rows = [{"Input": text} for text in ["What is a prompt?", "  padded  ", "say {INPUT}", "x", " "]]
+    for template in templates:
+        renderer = BulkRenderer(template)
+        rendered = list(renderer.render_table(rows, batch_size=3))
+        assert [r.row for r in rendered] == [1, 2, 3, 4, 5]
+        for r, row in zip(rendered, rows):
+            expected = safe_format_prompt(format_prompt(template, row["Input"].strip()))
+            assert r.prompt == renderer.render(row) == expected
+    print("✅ Matches format_prompt + safe_format_prompt")
+
+    # Test 2: Named variables from columns
+    print("\n2. Testing Columns:")
+    renderer = BulkRenderer("Context: <context>\nQ: {input} {missing}", safe=False)
+    columns = {"context": ["a", "b"], "INPUT": ["q1", 2]}
+    assert [r.prompt for r in renderer.render_table(columns)] == [
+        "Context: a\nQ: q1 {missing}",
+        "Context: b\nQ: 2 {missing}",
+    ]
+    print("✅ Columns fill variables by name")
+
+    # Test 3: Templates without variables still give one prompt per row
+    print("\n3. Testing Templates Without Variables:")
+    rendered = list(render_table("Answer this: [Insert example] please", [{"input": "a"}, {"input": "b"}], safe=False))
+    assert [(r.row, r.prompt) for r in rendered] == [
+        (1, "Answer this: [Insert example] please"),
+        (2, "Answer this: [Insert example] please"),
+    ]
+    print("✅ Every row is rendered")
+
+    # Test 4: Unreadable JSONL rows are reported in place
+    print("\n4. Testing JSONL Errors:")
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as f:
+        f.write('{"input": "a"}\nnot json\n\n{"input": "b"}\n')
+    try:
+        rendered = list(render_table("Q: {input}", f.name, safe=False))
+    finally:
+        os.remove(f.name)
+    assert [(r.row, r.prompt) for r in rendered] == [(1, "Q: a"), (2, None), (3, "Q: b")]
+    assert rendered[1].error.startswith("Invalid JSON")
+    print("✅ Bad rows keep their place")
+
+    print("\n🎉 All bulk render tests passed!")
+
+
+if __name__ == "__main__":
+    test_bulk_render()
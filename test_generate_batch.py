@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for batched generation in Prompt Engineering Studio
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from tiny_model import build_tiny_gpt2
+from models.load_model import load_model, generate_batch, generate_text
+
+
+def test_generate_batch():
+    """Test that batching keeps order and outputs without changing the tokenizer"""
+    print("🧪 Testing Batched Generation")
+    print("=" * 50)
+
+    model_pipeline = load_model(build_tiny_gpt2())
+    tokenizer = model_pipeline.tokenizer
+    tokenizer_state = (tokenizer.pad_token, tokenizer.padding_side)
+    # Different lengths, so batches are padded and reordered by length
+    prompts = [
+        "Question: what is the capital of france\nAnswer:",
+        "explain how python decorators work please",
+        "Instruction: summarize this text\n\nResponse:",
+        "let's think step by step about this problem",
+        "you are a helpful assistant. compare these examples and explain why",
+    ]
+
+    # Test 1: Results come back in prompt order
+    print("\n1. Testing Order:")
+    results = generate_batch(model_pipeline, prompts, max_new_tokens=8, batch_size=2, do_sample=False)
+    assert [result["prompt"] for result in results] == prompts
+    print("✅ One result per prompt, in order")
+
+    # Test 2: Same greedy output as one prompt at a time
+    print("\n2. Testing Outputs:")
+    for result in results:
+        assert not result["response"].startswith("❌"), result["response"]
+        assert result["response"] == generate_text(
+            model_pipeline, result["prompt"], max_new_tokens=8, do_sample=False
+        )
+    print("✅ Padded batches match generate_text")
+
+    # Test 3: The shared tokenizer is left as it was
+    print("\n3. Testing Tokenizer State:")
+    assert (tokenizer.pad_token, tokenizer.padding_side) == tokenizer_state
+    print("✅ Padding settings are not changed")
+
+    print("\n🎉 All batched generation tests passed!")
+
+
+if __name__ == "__main__":
+    test_generate_batch()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for the generation history store in Prompt Engineering Studio
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.history_store import HistoryStore
+
+
+def test_history_store():
+    """Test appending, filtered paging and persistence"""
+    print("🧪 Testing History Store")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.sqlite3")
+        store = HistoryStore(path)
+        for i in range(25):
+            models = ["Prompt Refiner", "distilgpt2"] if i % 2 else ["Prompt Refiner"]
+            store.append(
+                "alice",
+                "Zero-shot" if i % 3 else "Few-shot",
+                f"input {i}",
+                f"Question: input {i}",
+                models,
+                {model: f"response {i}" for model in models},
+                {model: 0.1 for model in models},
+                created_at=1000.0 + i // 2,  # Ties are ordered by id
+            )
+        store.append("bob", "Zero-shot", "other", "other", ["distilgpt2"], {}, {})
+
+        # Test 1: Pages, newest first
+        print("\n1. Testing Pages:")
+        inputs, cursor = [], None
+        while True:
+            page = store.page("alice", cursor, limit=10)
+            if not page:
+                break
+            inputs += [entry["user_input"] for entry in page]
+            cursor = page[-1]["cursor"]
+        assert inputs == [f"input {i}" for i in reversed(range(25))]
+        assert store.count("alice") == 25 and store.count("bob") == 1
+        print("✅ Every entry appears once, newest first")
+
+        # Test 2: Filters
+        print("\n2. Testing Filters:")
+        assert store.count("alice", model="distilgpt2") == 12
+        assert store.count("alice", prompt_type="Few-shot", model="distilgpt2") == 4
+        page = store.page("alice", limit=3, model="distilgpt2")
+        assert [entry["user_input"] for entry in page] == ["input 23", "input 21", "input 19"]
+        assert page[0]["responses"]["distilgpt2"] == "response 23"
+        assert store.facets("alice")["models"] == ["Prompt Refiner", "distilgpt2"]
+        print("✅ Prompt type and model filters work")
+
+        # Test 3: Persistence and clearing
+        print("\n3. Testing Persistence:")
+        restarted = HistoryStore(path)
+        assert restarted.count("alice") == 25
+        assert restarted.clear("alice") == 25
+        assert restarted.count("alice") == 0 and restarted.count("bob") == 1
+        print("✅ History survives restarts and can be cleared")
+
+    print("\n🎉 All history store tests passed!")
+
+
+if __name__ == "__main__":
+    test_history_store()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for the prefix KV cache of Prompt Engineering Studio
+"""
+
+import sys
+import os
+import threading
+from types import SimpleNamespace
+
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from tiny_model import build_tiny_gpt2
+from models.load_model import load_model, generate_text, stream_text
+from models.prefix_cache import PrefixCache, get_prefix_cache
+from models.runner import get_static_prefix
+
+
+def test_prefix_cache():
+    """Test that reusing prefilled prefixes does not change the output"""
+    print("🧪 Testing Prefix Cache")
+    print("=" * 50)
+
+    model_pipeline = load_model(build_tiny_gpt2(), precision="fp32")
+    static_prefix = get_static_prefix("Question: {input}\nAnswer:")
+    cases = [
+        (static_prefix, static_prefix + "what is the capital of france\nAnswer:"),
+        # The prefix ends inside a word, so the cached KV is cropped
+        ("explain how pyt", "explain how python decorators work please"),
+    ]
+
+    # Test 1: Greedy output is the same with and without a cached prefix
+    print("\n1. Testing Generated Text:")
+    cache = get_prefix_cache()
+    for prefix, prompt in cases:
+        expected = generate_text(model_pipeline, prompt, max_new_tokens=8, do_sample=False)
+        assert not expected.startswith("❌"), expected
+        hits = cache.stats()["hits"]
+        for _ in range(2):  # A miss, then a hit
+            assert expected == generate_text(
+                model_pipeline, prompt, max_new_tokens=8, do_sample=False, static_prefix=prefix
+            )
+        assert cache.stats()["hits"] > hits
+    print("✅ Cached prefixes give the same greedy output")
+
+    # Test 2: Streamed output is the same with and without a cached prefix
+    print("\n2. Testing Streamed Text:")
+    for prefix, prompt in cases:
+        expected = "".join(stream_text(model_pipeline, prompt, max_new_tokens=8, do_sample=False))
+        assert not expected.startswith("❌"), expected
+        assert expected == "".join(
+            stream_text(
+                model_pipeline, prompt, max_new_tokens=8, do_sample=False, static_prefix=prefix
+            )
+        )
+    print("✅ Cached prefixes give the same streamed output")
+
+    # Test 3: Concurrent misses on one prefix prefill it once
+    print("\n3. Testing Concurrent Misses:")
+    prefix_cache = PrefixCache()
+    prompt = cases[0][1]
+    prefix = prompt[: len(static_prefix) + len("what is ")]  # Not prefilled yet
+    threads = [
+        threading.Thread(target=prefix_cache.prepare, args=(model_pipeline, prompt, prefix))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = prefix_cache.stats()
+    assert (stats["misses"], stats["hits"]) == (1, 3), stats
+    print("✅ One prefill shared by all waiting requests")
+
+    # Test 4: A slow prefill does not block other models' lookups
+    print("\n4. Testing Prefill Isolation:")
+    started, release = threading.Event(), threading.Event()
+
+    class SlowModel:
+        config = SimpleNamespace(is_encoder_decoder=False)
+
+        def __call__(self, input_ids, use_cache):
+            started.set()
+            release.wait(10)
+            return SimpleNamespace(past_key_values=None)
+
+    slow_pipeline = SimpleNamespace(
+        model=SlowModel(),
+        tokenizer=lambda text, return_tensors: {"input_ids": torch.tensor([[1, 2]])},
+    )
+    slow_thread = threading.Thread(target=prefix_cache._entry, args=(slow_pipeline, "slow"))
+    slow_thread.start()
+    assert started.wait(10)
+    other = threading.Thread(target=prefix_cache.prepare, args=(model_pipeline, prompt, prefix))
+    other.start()
+    other.join(5)
+    blocked = other.is_alive()
+    release.set()
+    slow_thread.join()
+    other.join()
+    assert not blocked
+    print("✅ Other models are served during a prefill")
+
+    print("\n🎉 All prefix cache tests passed!")
+
+
+if __name__ == "__main__":
+    test_prefix_cache()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the response cache in Prompt Engineering Studio
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.response_cache import ResponseCache, make_cache_key, is_deterministic
+
+
+def test_response_cache():
+    """Test cache keys, both tiers, TTL and size eviction"""
+    print("🧪 Testing Response Cache")
+    print("=" * 50)
+
+    # Test 1: Keys and determinism
+    print("\n1. Testing Cache Keys:")
+    params = {"max_new_tokens": 50, "do_sample": False, "seed": None}
+    key = make_cache_key("distilgpt2", "Question: hi", params)
+    assert key == make_cache_key("distilgpt2", "Question: hi", dict(params))
+    assert key != make_cache_key("gpt2", "Question: hi", params)
+    assert key != make_cache_key("distilgpt2", "Question: hi", {**params, "max_new_tokens": 20})
+    assert is_deterministic(params)
+    assert is_deterministic({"do_sample": True, "seed": 42})
+    assert not is_deterministic({"do_sample": True, "seed": None})
+    print("✅ Keys depend on model, prompt and parameters")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "responses.sqlite3")
+
+        # Test 2: Memory and disk tiers
+        print("\n2. Testing Memory and Disk Tiers:")
+        cache = ResponseCache(path=path, memory_entries=1)
+        assert cache.get(key) is None
+        cache.put(key, "distilgpt2", "Paris")
+        assert cache.get(key) == "Paris"
+        assert cache.memory_hits == 1
+
+        restarted = ResponseCache(path=path)
+        assert restarted.get(key) == "Paris"
+        assert restarted.disk_hits == 1
+        print(f"✅ Responses survive restarts: {restarted.stats()}")
+
+        # Test 3: TTL expiry
+        print("\n3. Testing TTL Expiry:")
+        short_lived = ResponseCache(path=os.path.join(tmp, "ttl.sqlite3"), ttl=0.05)
+        short_lived.put(key, "distilgpt2", "Paris")
+        time.sleep(0.1)
+        assert short_lived.get(key) is None
+        print("✅ Expired responses are not returned")
+
+        # Test 4: Size-based eviction
+        print("\n4. Testing Size Eviction:")
+        small = ResponseCache(
+            path=os.path.join(tmp, "small.sqlite3"), max_disk_mb=1500 / (1024 * 1024)
+        )
+        for i in range(3):
+            small.put(f"key-{i}", "distilgpt2", "x" * 600)
+        assert small.stats()["disk_entries"] == 2
+        assert small.get("key-0") is None
+        assert small.get("key-2") == "x" * 600
+        print(f"✅ Oldest entries evicted: {small.evictions} eviction(s)")
+
+    print("\n🎉 All response cache tests passed!")
+
+
+if __name__ == "__main__":
+    test_response_cache()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for response comparison in Prompt Engineering Studio
+"""
+
+import sys
+import os
+import random
+import difflib
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.response_diff import DiffCache, compare_responses, diff_tokens, similarity, unified_diff
+
+
+def test_response_diff():
+    """Test word diffs, the similarity matrix and the diff cache"""
+    print("🧪 Testing Response Diff")
+    print("=" * 50)
+
+    # Test 1: Diffs cover both responses and find as many matches as difflib
+    print("\n1. Testing Diffs:")
+    rng = random.Random(0)
+    words = "the a model answer is of to and data prompt".split()
+    for _ in range(300):
+        a = [rng.choice(words) for _ in range(rng.randint(0, 80))]
+        b = list(a)
+        for _ in range(rng.randint(0, 10)):
+            position = rng.randint(0, len(b))
+            if rng.random() < 0.5 and position < len(b):
+                del b[position]
+            else:
+                b.insert(position, rng.choice(words))
+        opcodes = diff_tokens(a, b)
+        rebuilt_a, rebuilt_b = [], []
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag == "equal":
+                assert a[i1:i2] == b[j1:j2]
+            rebuilt_a += a[i1:i2]
+            rebuilt_b += b[j1:j2]
+        assert rebuilt_a == a and rebuilt_b == b
+        expected = difflib.SequenceMatcher(None, a, b, autojunk=False).ratio()
+        assert similarity(opcodes, len(a), len(b)) >= expected - 1e-9
+    print("✅ Diffs rebuild both responses and are minimal")
+
+    # Test 2: Unified diff output
+    print("\n2. Testing Unified Diff:")
+    a = "the quick brown fox jumps over the lazy dog again and again".split()
+    b = "the quick red fox jumped over the lazy dog again and again today".split()
+    assert unified_diff(a, b, diff_tokens(a, b), "m1", "m2") == list(
+        difflib.unified_diff(a, b, "m1", "m2", lineterm="")
+    )
+    assert unified_diff(a, a, diff_tokens(a, a)) == []
+    print("✅ Output matches difflib.unified_diff")
+
+    # Test 3: Similarity matrix and cache
+    print("\n3. Testing Comparison:")
+    responses = {"one": "a b c d", "two": "a b x d", "three": "p q r s", "four": "a b c d"}
+    comparison = compare_responses(responses)
+    assert comparison.models == list(responses)
+    assert comparison.matrix[0][1] == comparison.matrix[1][0] == 0.75
+    assert comparison.matrix[0][2] == 0.0 and comparison.matrix[0][3] == 1.0
+    assert set(comparison.diffs) == {
+        (first, second) for i, first in enumerate(responses) for second in list(responses)[i + 1 :]
+    }
+    cache = DiffCache(max_entries=2)
+    cache.diff("a b", "a c")
+    cache.diff("a b", "a c")
+    cache.diff("x", "y")
+    cache.diff("y", "z")
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 3}
+    print("✅ Every pair is compared and repeated pairs are cached")
+
+    print("\n🎉 All response diff tests passed!")
+
+
+if __name__ == "__main__":
+    test_response_diff()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the keyword matcher and rule engine in Prompt Engineering Studio
+"""
+
+import sys
+import os
+import random
+import string
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.keyword_matcher import KeywordMatcher, SMALL_TABLE_SIZE
+from models.rule_engine import RuleEngine, get_rule_engine
+
+
+def _naive_labels(keywords, text):
+    return {label for keyword, label in keywords if keyword in text}
+
+
+def test_rule_engine():
+    """Test substring semantics, overlaps, positions and large rule tables"""
+    print("🧪 Testing Rule Engine")
+    print("=" * 50)
+
+    # Test 1: Overlapping and nested keywords
+    print("\n1. Testing Overlapping Keywords:")
+    matcher = KeywordMatcher(
+        [("step", "specific"), ("steps", "plural"), ("how to", "how_to"), ("to", "short")],
+        whole_words=False,
+    )
+    text = "how to follow the steps"
+    found = [(m.start, m.keyword) for m in matcher.finditer(text)]
+    assert found == [(0, "how to"), (4, "to"), (18, "steps")], found
+    assert matcher.labels(text) == {"specific", "plural", "how_to", "short"}
+    print(f"✅ Matches: {found}")
+
+    # Test 2: Both matching strategies agree with plain substring checks
+    print("\n2. Testing Against Substring Checks:")
+    rng = random.Random(0)
+    for size in (8, SMALL_TABLE_SIZE * 3):
+        keywords = [
+            ("".join(rng.choice("abc ") for _ in range(rng.randint(1, 5))), f"c{i % 7}")
+            for i in range(size)
+        ]
+        matcher = KeywordMatcher(keywords)
+        for _ in range(200):
+            text = "".join(rng.choice("abcd ") for _ in range(40))
+            assert matcher.labels(text) == _naive_labels(keywords, text)
+    print("✅ Small and large tables match substring semantics")
+
+    # Test 3: Whole-word matching
+    print("\n3. Testing Whole Words:")
+    matcher = KeywordMatcher([("ice", "a"), ("ice cream", "b")], whole_words=True)
+    assert matcher.labels("nice cream") == set()
+    assert [m.keyword for m in matcher.finditer("ice cream, ice")] == ["ice cream", "ice"]
+    print("✅ Keywords inside longer words are ignored")
+
+    # Test 4: Rule tables
+    print("\n4. Testing Rule Tables:")
+    refiner = get_rule_engine("prompt_refiner")
+    assert refiner.first_category("Compare the code review") == "code"
+    assert refiner.first_category("Please DESCRIBE it") == "explanation"
+    assert refiner.first_category("hello world") is None
+    words = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(8)) for _ in range(3000)
+    ]
+    engine = RuleEngine({"first": words[:1500], "second": words[1500:]})
+    assert engine.classify_many([f"x {words[10].upper()} y", words[2999], "none"]) == [
+        {"first"},
+        {"second"},
+        set(),
+    ]
+    print(f"✅ {len(engine)} keyword table classifies in one pass")
+
+    print("\n🎉 All rule engine tests passed!")
+
+
+if __name__ == "__main__":
+    test_rule_engine()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for compiled prompt templates in Prompt Engineering Studio
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.template_engine import compile_template
+from utils.prompt_formatter import format_prompt, render_template, validate_template
+
+
+def test_template_engine():
+    """Test rendering named variables and locating bracket errors"""
+    print("🧪 Testing Template Engine")
+    print("=" * 50)
+
+    # Test 1: Input placeholders
+    print("\n1. Testing Input Placeholders:")
+    template = "{input} | {INPUT} | [INPUT] | <input> | [Insert example]"
+    assert format_prompt(template, "x") == "x | x | x | x | [Insert example]"
+    # The input is inserted once, not scanned for placeholders again
+    assert format_prompt("Q: {input}", "say {INPUT}") == "Q: say {INPUT}"
+    print("✅ All input spellings are replaced in one pass")
+
+    # Test 2: Named variables
+    print("\n2. Testing Named Variables:")
+    template = "Context: <context>\nTone: [TONE]\nQuestion: {input}\n{unknown}"
+    rendered = render_template(template, {"context": "docs", "tone": "formal", "Input": "Why?"})
+    assert rendered == "Context: docs\nTone: formal\nQuestion: Why?\n{unknown}"
+    compiled = compile_template(template)
+    assert compiled.variables == ("context", "tone", "input", "unknown")
+    assert compile_template(template) is compiled
+    print("✅ Variables render case-insensitively and templates are compiled once")
+
+    # Test 3: Bracket errors with positions
+    print("\n3. Testing Validation Errors:")
+    is_valid, error = validate_template("Question: {input}\nAnswer: {")
+    assert not is_valid
+    assert error == "Unmatched curly brackets in template: '{' is never closed (line 2, column 9)"
+    is_valid, error = validate_template("Q: [input]] and {input}")
+    assert error == "Unmatched square brackets in template: ']' without '[' (line 1, column 11)"
+    assert validate_template("Question: {input}") == (True, "")
+    print("✅ Errors report the line and column")
+
+    print("\n🎉 All template engine tests passed!")
+
+
+if __name__ == "__main__":
+    test_template_engine()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the template store in Prompt Engineering Studio
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.template_store import TemplateStore
+
+
+def test_template_store():
+    """Test versions, search, paging and JSON sync"""
+    print("🧪 Testing Template Store")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TemplateStore(os.path.join(tmp, "templates.sqlite3"))
+
+        # Test 1: Versions
+        print("\n1. Testing Versions:")
+        assert store.save("Zero-shot", "Question: {input}\nAnswer:", "Answers without examples") == 1
+        generation = store.generation()
+        assert store.save("Zero-shot", "Question: {input}\nAnswer:", "Answers without examples") == 1
+        assert store.generation() == generation
+        assert store.save("Zero-shot", "Q: {input}\nA:", "Answers without examples") == 2
+        assert store.generation() > generation
+        assert store.get("Zero-shot")["template"] == "Q: {input}\nA:"
+        assert store.get("Zero-shot", version=1)["template"] == "Question: {input}\nAnswer:"
+        assert [v["version"] for v in store.versions("Zero-shot")] == [2, 1]
+        print("✅ Changed content adds a version")
+
+        # Test 2: Search and paging
+        print("\n2. Testing Search and Paging:")
+        store.import_entries(
+            {f"Task {i:03d}": {"template": "{input}", "description": f"topic{i % 10}"} for i in range(100)}
+        )
+        assert store.count() == 101
+        assert store.list_names(offset=1, limit=3) == ["Task 000", "Task 001", "Task 002"]
+        assert store.count("topic3") == 10
+        assert store.list_names("examples") == ["Zero-shot"]
+        assert store.list_names('"unbalanced') == []
+        print("✅ Pages and full-text search work")
+
+        # Test 3: JSON import and change detection
+        print("\n3. Testing JSON Sync:")
+        path = os.path.join(tmp, "prompt_types.json")
+        with open(path, "w") as f:
+            json.dump({"Zero-shot": {"template": "Question: {input}\nAnswer:"}}, f)
+        assert store.sync_json(path) == 1
+        assert store.sync_json(path) == 0
+        time.sleep(0.01)
+        with open(path, "w") as f:
+            json.dump({"Zero-shot": {"template": "Answer this: {input}"}}, f)
+        assert store.sync_json(path) == 1
+        assert store.get("Zero-shot")["version"] == 4
+        assert "Zero-shot" in store.export_entries()
+        for bad in [{"Zero-shot": "Question: {input}"}, ["Zero-shot"], {"X": {"template": 1}}]:
+            with open(path, "w") as f:
+                json.dump(bad, f)
+            try:
+                store.sync_json(path)
+                assert False, "Expected ValueError"
+            except ValueError:
+                pass
+        assert store.get("Zero-shot")["version"] == 4 and store.get("X") is None
+
+        # Templates removed from the file are removed from the store
+        time.sleep(0.01)
+        with open(path, "w") as f:
+            json.dump({"Zero-shot": {"template": "Answer this: {input}"}, "Extra": {"template": "{input}"}}, f)
+        assert store.sync_json(path) == 1
+        time.sleep(0.01)
+        with open(path, "w") as f:
+            json.dump({"Zero-shot": {"template": "Answer this: {input}"}}, f)
+        generation = store.generation()
+        assert store.sync_json(path) == 1
+        assert store.get("Extra") is None and store.generation() > generation
+        assert store.get("Task 000") is not None
+        print("✅ Edited JSON files are re-imported, malformed ones rejected")
+
+    print("\n🎉 All template store tests passed!")
+
+
+if __name__ == "__main__":
+    test_template_store()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for tokenizer-backed token counting in Prompt Engineering Studio
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.token_counter import TokenCounter
+from utils.prompt_formatter import count_tokens, count_tokens_estimate, format_prompt
+from utils.safety import safe_format_prompt
+
+PROMPT_TYPES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompt_types.json")
+
+
+def _byte_level_tokenizer():
+    """A small GPT-2 style byte-level BPE tokenizer trained on the bundled templates"""
+    from tokenizers import ByteLevelBPETokenizer
+    from transformers import PreTrainedTokenizerFast
+
+    with open(PROMPT_TYPES_PATH, "r") as f:
+        corpus = [entry.get("template", "") for entry in json.load(f).values()]
+    backend = ByteLevelBPETokenizer()
+    backend.train_from_iterator(corpus, vocab_size=500, special_tokens=["<|endoftext|>"])
+    return PreTrainedTokenizerFast(
+        tokenizer_object=backend._tokenizer, eos_token="<|endoftext|>"
+    )
+
+
+def test_token_counter():
+    """Test cached template segments, batching and token-boundary truncation"""
+    print("🧪 Testing Token Counter")
+    print("=" * 50)
+    counter = TokenCounter(_byte_level_tokenizer())
+
+    # Test 1: Segment counts match tokenizing whole prompts
+    print("\n1. Testing Template Segments:")
+    assert counter.splittable
+    inputs = ["What is a prompt?", " leading space", "tabs\tand\nlines", "a", "ünïcode words"]
+    for template in ["Question: {input}\nAnswer:", "{input}", "Q: {input}? Again: {input}!"]:
+        segments = safe_format_prompt(format_prompt(template, "\x00")).split("\x00")
+        expected = [counter.count(text.join(segments)) for text in inputs]
+        assert counter.count_prompts(segments, inputs) == expected, template
+        assert counter.count_prompts(segments, inputs, batch_size=2) == expected
+    assert counter.stats()["segment_hits"] > 0
+    print("✅ Cached segments give exact counts")
+
+    # Test 2: Truncation at token boundaries
+    print("\n2. Testing Truncation:")
+    text = "Explain how python decorators work with a short example. " * 20
+    for max_tokens in (5, 17, 60):
+        truncated = counter.truncate(text, max_tokens)
+        assert truncated.endswith("...")
+        assert counter.count(truncated) <= max_tokens
+        assert text.startswith(truncated[:-3])
+    assert counter.truncate("short text", 100) == "short text"
+    print("✅ Truncated text fits the token budget")
+
+    # Test 3: Estimate without a tokenizer
+    print("\n3. Testing Estimate Fallback:")
+    assert count_tokens("hello world") == count_tokens_estimate("hello world")
+    print("✅ Falls back to the estimate")
+
+    print("\n🎉 All token counter tests passed!")
+
+
+if __name__ == "__main__":
+    test_token_counter()
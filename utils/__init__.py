@@ -5,20 +5,24 @@ Contains utilities for professional prompt formatting and processing.
 
 from .prompt_formatter import (
     format_prompt,
+    render_template,
     extract_placeholders,
     validate_template,
     get_template_preview,
     suggest_input_placeholder,
     count_tokens_estimate,
+    count_tokens,
     truncate_for_model,
 )
 
 __all__ = [
     "format_prompt",
+    "render_template",
     "extract_placeholders",
     "validate_template",
     "get_template_preview",
     "suggest_input_placeholder",
     "count_tokens_estimate",
+    "count_tokens",
     "truncate_for_model",
 ]
@@ -0,0 +1,333 @@
+"""
+Bulk prompt rendering for the Prompt Engineering Studio.
+Renders one compiled template against every row of a table (CSV, JSONL,
+Parquet or in-memory columns) and streams the final prompts lazily, a
+batch at a time, optionally with each prompt's token count.
+"""
+
+import os
+import csv
+import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from utils.safety import safe_format_prompt
+from utils.template_engine import compile_template
+from utils.token_counter import TokenCounter
+
+DEFAULT_BATCH_SIZE = 1024
+
+TABLE_FORMATS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+Row = Dict[str, Any]
+Table = Union[str, Mapping[str, Iterable[Any]], Iterable[Row]]
+
+
+class RenderedRow(NamedTuple):
+    """A final prompt for one table row"""
+
+    row: int  # 1-based row number
+    prompt: Optional[str]  # None if the row could not be read
+    tokens: Optional[int] = None
+    error: Optional[str] = None
+
+
+class RenderedBatch(NamedTuple):
+    """Final prompts for a batch of table rows, as parallel columns"""
+
+    rows: Sequence[int]
+    prompts: List[Optional[str]]
+    tokens: List[Optional[int]]
+    errors: List[Optional[str]]
+
+
+def _read_delimited(path: str, delimiter: str) -> Iterator[Row]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f, delimiter=delimiter)
+
+
+def _read_jsonl(path: str) -> Iterator[Union[Row, ValueError]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON: {str(e)}")
+                continue
+            yield record if isinstance(record, dict) else ValueError("Row is not a JSON object")
+
+
+def _read_parquet(path: str, batch_size: int) -> Iterator[Row]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet tables requires pyarrow (pip install pyarrow)")
+
+    # Only one record batch is decoded at a time
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+def _read_columns(columns: Mapping[str, Iterable[Any]]) -> Iterator[Row]:
+    names = list(columns.keys())
+    for values in zip(*(columns[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def iter_table(
+    table: Table, table_format: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[Union[Row, ValueError]]:
+    """
+    Stream the rows of a table as dicts of column values.
+
+    Args:
+        table: A CSV/TSV/JSONL/Parquet file path, a mapping of column names to
+            values (e.g. a dict of lists or a pandas DataFrame), or an iterable of dicts
+        table_format (str, optional): "csv", "tsv", "jsonl" or "parquet"; by
+            default taken from the file extension
+        batch_size (int): Rows decoded at a time from Parquet files
+
+    Yields:
+        dict or ValueError: Each row, or the error for a row that cannot be read
+    """
+    if not isinstance(table, str):
+        return _read_columns(table) if hasattr(table, "keys") else iter(table)
+
+    table_format = table_format or TABLE_FORMATS.get(os.path.splitext(table)[1].lower())
+    if table_format == "csv":
+        return _read_delimited(table, ",")
+    if table_format == "tsv":
+        return _read_delimited(table, "\t")
+    if table_format == "jsonl":
+        return _read_jsonl(table)
+    if table_format == "parquet":
+        return _read_parquet(table, batch_size)
+    raise ValueError(f"Unknown table format for {table}; use one of {sorted(set(TABLE_FORMATS.values()))}")
+
+
+class BulkRenderer:
+    """
+    Renders one template for many rows of variables.
+
+    Values are gathered a column at a time and each prompt is built by one
+    C-level call: a join into the cached final-prompt segments for the usual
+    single-variable template, otherwise a str.format pattern. Columns match
+    variables case-insensitively. As in the app, values are stripped and the
+    prompt is wrapped by safe_format_prompt. Like format_prompt, a
+    single-variable template with an empty value is left unchanged.
+    """
+
+    def __init__(self, template: str, safe: bool = True, counter: Optional[TokenCounter] = None):
+        """
+        Args:
+            template (str): The prompt template
+            safe (bool): Wrap each prompt with safe_format_prompt
+            counter (TokenCounter, optional): Count each final prompt's tokens
+        """
+        self.template = compile_template(template)
+        self.variables = self.template.variables
+        self.counter = counter
+        self.safe = safe
+
+        # Literal braces are escaped; each slot refers to its variable's position
+        index = {name: position for position, name in enumerate(self.variables)}
+        escape = lambda text: text.replace("{", "{{").replace("}", "}}")
+        pattern = [escape(self.template.literals[0])]
+        for (name, _), literal in zip(self.template.slots, self.template.literals[1:]):
+            pattern.append(f"{{{index[name]}}}{escape(literal)}")
+        self._pattern = "".join(pattern)
+        # Missing variables are rendered unchanged
+        self._defaults = tuple(
+            next(original for name, original in self.template.slots if name == variable)
+            for variable in self.variables
+        )
+        self._wrapper = safe_format_prompt("\x00").split("\x00") if safe else ["", ""]
+        # Final prompt around the only variable, for joining and token counting
+        self._segments: Optional[List[str]] = None
+        if len(self.variables) == 1:
+            segments = list(self.template.segments(self.variables[0]))
+            segments[0] = self._wrapper[0] + segments[0].lstrip()
+            segments[-1] = segments[-1].rstrip() + self._wrapper[1]
+            self._segments = segments
+            # format_prompt returns the template as it is for an empty input
+            self._unchanged = self._wrapper[0] + template + self._wrapper[1]
+        self._columns: Dict[Tuple[str, ...], List[Optional[str]]] = {}
+
+    def _column_keys(self, row: Row) -> List[Optional[str]]:
+        """The column of a row holding each variable, or None"""
+        keys = tuple(row.keys())
+        columns = self._columns.get(keys)
+        if columns is None:
+            by_name = {str(key).lower(): key for key in reversed(keys)}
+            columns = self._columns[keys] = [by_name.get(name) for name in self.variables]
+        return columns
+
+    def _values(self, row: Row) -> Tuple[str, ...]:
+        """Variable values of a row, in the order of self.variables"""
+        values = []
+        for column, default in zip(self._column_keys(row), self._defaults):
+            value = row[column] if column is not None else None
+            values.append(default if value is None else str(value).strip())
+        return tuple(values)
+
+    def _batch_values(self, rows: List[Row]) -> List[List[str]]:
+        """Variable values of many rows, one list per variable"""
+        columns = []
+        for position, column in enumerate(self._column_keys(rows[0])):
+            values = [row.get(column) for row in rows] if column is not None else [None] * len(rows)
+            if None in values:
+                # Rows missing the column, or naming it differently
+                values = [
+                    self._values(row)[position] if value is None else value
+                    for row, value in zip(rows, values)
+                ]
+            if set(map(type, values)) != {str}:
+                values = [str(value) for value in values]
+            columns.append(list(map(str.strip, values)))
+        return columns
+
+    def render(self, row: Row) -> str:
+        """
+        Render the final prompt for one row.
+
+        Args:
+            row (dict): Variable values by column name
+
+        Returns:
+            str: The final prompt
+        """
+        values = self._values(row)
+        if self._segments is not None:
+            return values[0].join(self._segments) if values[0] else self._unchanged
+        prefix, suffix = self._wrapper
+        return prefix + self._pattern.format(*values).strip() + suffix
+
+    def _count(self, prompts: List[str], inputs: Optional[List[str]]) -> List[int]:
+        """Token counts for a batch, reusing the cached template segments when possible"""
+        if inputs is None:
+            return self.counter.count_many(prompts)
+
+        # Cached segments are exact when the input is not empty
+        counts: List[Optional[int]] = [None] * len(prompts)
+        joined = [i for i, text in enumerate(inputs) if text]
+        for i, count in zip(joined, self.counter.count_prompts(self._segments, [inputs[i] for i in joined])):
+            counts[i] = count
+        rest = [i for i, count in enumerate(counts) if count is None]
+        for i, count in zip(rest, self.counter.count_many([prompts[i] for i in rest])):
+            counts[i] = count
+        return counts
+
+    def _render_batch(self, rows: List[Row]) -> Tuple[List[str], Optional[List[str]]]:
+        """Final prompts of a batch, and the inputs if the template has one variable"""
+        prefix, suffix = self._wrapper
+        if not self.variables:
+            # Nothing to fill in: every row gets the same prompt
+            return [prefix + self._pattern.format().strip() + suffix] * len(rows), None
+
+        columns = self._batch_values(rows)
+        if len(columns) != 1:
+            pattern = self._pattern
+            return [prefix + pattern.format(*values).strip() + suffix for values in zip(*columns)], None
+
+        # One variable: join the stripped value into the cached final-prompt segments
+        inputs, segments, unchanged = columns[0], self._segments, self._unchanged
+        prompts = [text.join(segments) if text else unchanged for text in inputs]
+        return prompts, inputs
+
+    def render_batches(
+        self,
+        table: Table,
+        table_format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[RenderedBatch]:
+        """
+        Lazily render a table a batch at a time; only one batch is held in memory.
+
+        Args:
+            table: Rows as accepted by iter_table
+            table_format (str, optional): Table file format
+            batch_size (int): Rows rendered and counted together
+
+        Yields:
+            RenderedBatch: The final prompts of each batch of rows, in order
+        """
+        number = 0
+        rows = iter_table(table, table_format, batch_size)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+
+            numbers = range(number + 1, number + len(batch) + 1)
+            number += len(batch)
+            errors: List[Optional[str]] = [None] * len(batch)
+            valid = batch
+            if ValueError in set(map(type, batch)):
+                errors = [str(row) if type(row) is ValueError else None for row in batch]
+                valid = [row for row in batch if type(row) is not ValueError]
+
+            prompts: List[Optional[str]] = []
+            counts: List[Optional[int]] = []
+            if valid:
+                prompts, inputs = self._render_batch(valid)
+                counts = self._count(prompts, inputs) if self.counter else [None] * len(prompts)
+            if len(valid) < len(batch):
+                # Put the unreadable rows back in place
+                rendered = iter(zip(prompts, counts))
+                prompts, counts = map(
+                    list, zip(*((None, None) if error else next(rendered) for error in errors))
+                )
+            yield RenderedBatch(numbers, prompts, counts, errors)
+
+    def render_table(
+        self,
+        table: Table,
+        table_format: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[RenderedRow]:
+        """
+        Lazily render every row of a table; only one batch is held in memory.
+
+        Args:
+            table: Rows as accepted by iter_table
+            table_format (str, optional): Table file format
+            batch_size (int): Rows rendered and counted together
+
+        Yields:
+            RenderedRow: The final prompt of each row, in order
+        """
+        for batch in self.render_batches(table, table_format, batch_size):
+            yield from map(RenderedRow._make, zip(*batch))
+
+
+def render_table(
+    template: str,
+    table: Table,
+    counter: Optional[TokenCounter] = None,
+    safe: bool = True,
+    table_format: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[RenderedRow]:
+    """
+    Lazily render a template for every row of a table.
+
+    Args:
+        template (str): The prompt template
+        table: A CSV/TSV/JSONL/Parquet path, a mapping of columns or an iterable of dicts
+        counter (TokenCounter, optional): Count each final prompt's tokens
+        safe (bool): Wrap each prompt with safe_format_prompt
+        table_format (str, optional): Table file format, by default from the extension
+        batch_size (int): Rows rendered and counted together
+
+    Returns:
+        Iterator[RenderedRow]: The final prompt of each row, in order
+    """
+    return BulkRenderer(template, safe, counter).render_table(table, table_format, batch_size)
@@ -0,0 +1,250 @@
+"""
+Generation history for the Prompt Engineering Studio.
+Appends every remembered run to SQLite, indexed by session, time, prompt
+type and model, so history is kept without limit, survives restarts and is
+read back one page at a time instead of being held in session state.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from utils.sqlite_store import open_sqlite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = os.environ.get("PROMPT_STUDIO_HISTORY_DB", "history.sqlite3")
+DEFAULT_PAGE_SIZE = 10
+
+# A page position: (created_at, id) of the last entry shown
+Cursor = Tuple[float, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    prompt_type TEXT NOT NULL,
+    user_input TEXT NOT NULL,
+    final_prompt TEXT NOT NULL,
+    models TEXT NOT NULL,
+    responses TEXT NOT NULL,
+    generation_times TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS history_models (
+    entry_id INTEGER NOT NULL REFERENCES history(id),
+    session_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_session_time
+    ON history(session_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_history_session_type
+    ON history(session_id, prompt_type, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_history_models
+    ON history_models(session_id, model, created_at, entry_id);
+"""
+
+
+class HistoryStore:
+    """
+    Append-only store of generation runs.
+
+    Pages are read newest first with keyset pagination, so loading any page
+    costs the same however long the history is.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str, optional): SQLite file, or ":memory:"
+        """
+        self.path = path or DEFAULT_HISTORY_PATH
+        self._lock = threading.Lock()
+        self._conn = open_sqlite(self.path, _SCHEMA)
+
+    def append(
+        self,
+        session_id: str,
+        prompt_type: str,
+        user_input: str,
+        final_prompt: str,
+        models: Sequence[str],
+        responses: Dict[str, str],
+        generation_times: Dict[str, float],
+        created_at: Optional[float] = None,
+    ) -> int:
+        """
+        Record one generation run.
+
+        Args:
+            session_id (str): The user's history id
+            prompt_type (str): Prompt type used
+            user_input (str): The user's input
+            final_prompt (str): The prompt sent to the models
+            models (list): Models run
+            responses (dict): Response per model
+            generation_times (dict): Seconds per model
+            created_at (float, optional): Unix time, now by default
+
+        Returns:
+            int: The entry id
+        """
+        created_at = time.time() if created_at is None else created_at
+        with self._lock:
+            entry_id = self._conn.execute(
+                "INSERT INTO history (session_id, created_at, prompt_type, user_input, "
+                "final_prompt, models, responses, generation_times) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session_id,
+                    created_at,
+                    prompt_type,
+                    user_input,
+                    final_prompt,
+                    json.dumps(list(models), ensure_ascii=False),
+                    json.dumps(responses, ensure_ascii=False),
+                    json.dumps(generation_times),
+                ),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO history_models (entry_id, session_id, model, created_at) VALUES (?, ?, ?, ?)",
+                [(entry_id, session_id, model, created_at) for model in dict.fromkeys(models)],
+            )
+            self._conn.commit()
+            return entry_id
+
+    def _where(
+        self, session_id: str, prompt_type: Optional[str], model: Optional[str]
+    ) -> Tuple[str, List[Any], str]:
+        """FROM/WHERE clause, parameters and the indexed (time, id) columns to page by"""
+        if model is not None:
+            source = (
+                "history_models JOIN history ON history.id = history_models.entry_id "
+                "WHERE history_models.session_id = ? AND history_models.model = ?"
+            )
+            params: List[Any] = [session_id, model]
+            order = "history_models.created_at, history_models.entry_id"
+        else:
+            source = "history WHERE history.session_id = ?"
+            params = [session_id]
+            order = "history.created_at, history.id"
+        if prompt_type is not None:
+            source += " AND history.prompt_type = ?"
+            params.append(prompt_type)
+        return source, params, order
+
+    def count(
+        self, session_id: str, prompt_type: Optional[str] = None, model: Optional[str] = None
+    ) -> int:
+        """
+        Count a session's entries.
+
+        Args:
+            session_id (str): The user's history id
+            prompt_type (str, optional): Only entries of this prompt type
+            model (str, optional): Only entries that ran this model
+
+        Returns:
+            int: Number of entries
+        """
+        source, params, _ = self._where(session_id, prompt_type, model)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {source}", params).fetchone()[0]
+
+    def page(
+        self,
+        session_id: str,
+        after: Optional[Cursor] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        prompt_type: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Load one page of a session's history, newest first.
+
+        Args:
+            session_id (str): The user's history id
+            after (tuple, optional): Cursor of the previous page's last entry
+            limit (int): Page size
+            prompt_type (str, optional): Only entries of this prompt type
+            model (str, optional): Only entries that ran this model
+
+        Returns:
+            List[dict]: Entries with a "cursor" for loading the next page
+        """
+        source, params, order = self._where(session_id, prompt_type, model)
+        if after is not None:
+            source += f" AND ({order}) < (?, ?)"
+            params.extend(after)
+        time_column, id_column = order.split(", ")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT history.* FROM {source} "
+                f"ORDER BY {time_column} DESC, {id_column} DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> Dict[str, Any]:
+        entry = dict(row)
+        for field in ("models", "responses", "generation_times"):
+            entry[field] = json.loads(entry[field])
+        entry["cursor"] = (entry["created_at"], entry["id"])
+        return entry
+
+    def facets(self, session_id: str) -> Dict[str, List[str]]:
+        """
+        Get the prompt types and models in a session's history, for filters.
+
+        Args:
+            session_id (str): The user's history id
+
+        Returns:
+            dict: Sorted "prompt_types" and "models"
+        """
+        with self._lock:
+            prompt_types = self._conn.execute(
+                "SELECT DISTINCT prompt_type FROM history WHERE session_id = ? ORDER BY prompt_type",
+                (session_id,),
+            ).fetchall()
+            models = self._conn.execute(
+                "SELECT DISTINCT model FROM history_models WHERE session_id = ? ORDER BY model",
+                (session_id,),
+            ).fetchall()
+        return {"prompt_types": [row[0] for row in prompt_types], "models": [row[0] for row in models]}
+
+    def clear(self, session_id: str) -> int:
+        """
+        Delete a session's history.
+
+        Args:
+            session_id (str): The user's history id
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM history_models WHERE session_id = ?", (session_id,))
+            removed = self._conn.execute(
+                "DELETE FROM history WHERE session_id = ?", (session_id,)
+            ).rowcount
+            self._conn.commit()
+            return removed
+
+
+_history_store = None
+_history_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    """Return the process-wide history store, creating it on first use"""
+    global _history_store
+    with _history_store_lock:
+        if _history_store is None:
+            _history_store = HistoryStore()
+        return _history_store
@@ -0,0 +1,154 @@
+"""
+Prompt injection detection for the Prompt Engineering Studio.
+Injection signatures are loaded from a pattern file, normalized and compiled
+into one multi-pattern matcher, so checking an input costs about the same
+whether there are ten signatures or ten thousand.
+"""
+
+import os
+import functools
+import unicodedata
+from typing import List, NamedTuple, Tuple
+from utils.keyword_matcher import KeywordMatcher
+
+DEFAULT_PATTERNS_PATH = os.environ.get(
+    "PROMPT_STUDIO_INJECTION_PATTERNS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules", "injection_patterns.txt"),
+)
+
+# Invisible characters used to split words without changing how they look
+ZERO_WIDTH = {"­", "​", "‌", "‍", "⁠", "﻿"}
+
+# Letters from other scripts that look like Latin ones
+HOMOGLYPHS = {
+    # Cyrillic
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o",
+    "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ї": "i", "ј": "j",
+    "ѕ": "s", "ԁ": "d", "ԛ": "q", "ԝ": "w", "һ": "h", "ӏ": "l",
+    # Greek
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o",
+    "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+    # Latin lookalikes
+    "ı": "i", "ɡ": "g", "ℓ": "l",
+}
+
+
+class InjectionMatch(NamedTuple):
+    """An injection signature found in the original (unnormalized) text"""
+
+    pattern: str
+    start: int
+    end: int
+
+
+def normalize_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """
+    Normalize text and map every normalized character back to the original.
+
+    Applies NFKC, case folding and homoglyph folding per character, drops
+    zero-width characters and collapses whitespace runs to one space.
+
+    Args:
+        text (str): Original text
+
+    Returns:
+        Tuple[str, List[int]]: Normalized text and, for each of its
+        characters, the index of the original character it came from
+    """
+    chars: List[str] = []
+    offsets: List[int] = []
+    for index, char in enumerate(text):
+        if char in ZERO_WIDTH:
+            continue
+        for folded in unicodedata.normalize("NFKC", char).casefold():
+            folded = HOMOGLYPHS.get(folded, folded)
+            if folded.isspace():
+                if chars and chars[-1] == " ":
+                    continue
+                folded = " "
+            chars.append(folded)
+            offsets.append(index)
+    return "".join(chars), offsets
+
+
+def normalize(text: str) -> str:
+    """
+    Normalize text for matching (see normalize_with_offsets).
+
+    Args:
+        text (str): Original text
+
+    Returns:
+        str: Normalized text
+    """
+    if text.isascii():
+        # Matches the per-character path, except that leading and trailing
+        # spaces are dropped, which never changes what matches
+        return " ".join(text.lower().split())
+    return normalize_with_offsets(text)[0]
+
+
+class InjectionDetector:
+    """Immutable multi-pattern matcher over normalized text"""
+
+    def __init__(self, patterns: List[str]):
+        """
+        Args:
+            patterns (List[str]): Injection signatures as written in the pattern file
+        """
+        # Normalized form -> pattern as written, reported back to the user
+        self._patterns = {}
+        for pattern in patterns:
+            self._patterns.setdefault(normalize(pattern).strip(), pattern)
+        self._matcher = KeywordMatcher((key, key) for key in self._patterns)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_PATTERNS_PATH) -> "InjectionDetector":
+        """
+        Load signatures from a text file with one pattern per line.
+
+        Args:
+            path (str): Pattern file; blank lines and # comments are ignored
+
+        Returns:
+            InjectionDetector: The compiled detector
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            patterns = [
+                line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")
+            ]
+        return cls(patterns)
+
+    def __len__(self) -> int:
+        return len(self._matcher)
+
+    def detect(self, text: str) -> List[InjectionMatch]:
+        """
+        Find injection signatures in a text.
+
+        Args:
+            text (str): User input
+
+        Returns:
+            List[InjectionMatch]: Matches in text order, with positions in the
+            original text
+        """
+        if self._matcher.first(normalize(text)) is None:
+            return []
+
+        # Offsets are only needed once something matched
+        normalized, offsets = normalize_with_offsets(text)
+        return [
+            InjectionMatch(
+                pattern=self._patterns[match.keyword],
+                start=offsets[match.start],
+                end=offsets[match.end - 1] + 1,
+            )
+            for match in self._matcher.finditer(normalized)
+        ]
+
+
+@functools.lru_cache(maxsize=None)
+def get_injection_detector() -> InjectionDetector:
+    """Return the shared detector, compiled from the pattern file on first use"""
+    return InjectionDetector.from_file()
@@ -0,0 +1,177 @@
+"""
+Compiled multi-keyword matcher for the Prompt Engineering Studio.
+Thousands of keywords are folded into a single trie-shaped regular expression,
+so a text is scanned once in C no matter how many keywords there are.
+"""
+
+import re
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+# Below this many keywords, C substring search per keyword beats one regex scan
+SMALL_TABLE_SIZE = 96
+
+
+class KeywordMatch(NamedTuple):
+    """A keyword found in a text"""
+
+    start: int
+    end: int
+    keyword: str
+    labels: FrozenSet[str]
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Regex for a trie node; longer continuations are tried before ending here"""
+    ends_here = "" in node
+    branches = [
+        re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if ends_here else pattern
+
+
+class KeywordMatcher:
+    """
+    Immutable matcher for a labelled keyword set.
+
+    Matching has substring semantics by default: a keyword matches wherever it
+    occurs, including inside longer words and overlapping other keywords.
+    With ``whole_words=True`` a keyword only matches between non-word
+    characters. Texts are matched as given, so callers normalize case first.
+
+    Label lookups on small substring tables check each keyword with ``in``
+    instead, which is faster than a regex scan until about a hundred keywords.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, str]], whole_words: bool = False):
+        """
+        Args:
+            keywords: (keyword, label) pairs; a keyword may carry several labels
+            whole_words (bool): Only match keywords delimited by non-word characters
+        """
+        labels: Dict[str, Set[str]] = {}
+        for keyword, label in keywords:
+            if keyword:
+                labels.setdefault(keyword, set()).add(label)
+
+        self.whole_words = whole_words
+        self.max_keyword_length = max((len(k) for k in labels), default=0)
+        self._labels = {keyword: frozenset(names) for keyword, names in labels.items()}
+
+        # Keywords grouped by label, for the small-table path
+        self._by_label: Optional[Dict[str, Tuple[str, ...]]] = None
+        if not whole_words and len(labels) <= SMALL_TABLE_SIZE:
+            grouped: Dict[str, List[str]] = {}
+            for keyword, names in labels.items():
+                for name in names:
+                    grouped.setdefault(name, []).append(keyword)
+            self._by_label = {name: tuple(words) for name, words in grouped.items()}
+
+        # Every keyword that matches at a position is a prefix of the longest one
+        # matching there, so each keyword also reports the labels of its prefixes
+        self._closure: Dict[str, FrozenSet[str]] = {}
+        if not whole_words:
+            for keyword in self._labels:
+                closure = set()
+                for end in range(1, len(keyword) + 1):
+                    closure |= self._labels.get(keyword[:end], frozenset())
+                self._closure[keyword] = frozenset(closure)
+
+        trie: Dict[str, dict] = {}
+        for keyword in self._labels:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        body = _trie_pattern(trie) if trie else "(?!)"
+        if whole_words:
+            body = r"(?<!\w)(?:" + body + r")(?!\w)"
+        self._pattern = re.compile(body)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def finditer(self, text: str, start: int = 0) -> Iterator[KeywordMatch]:
+        """
+        Yield the longest keyword starting at each position where one matches.
+
+        Args:
+            text (str): The text to scan
+            start (int): Position to start scanning from
+
+        Yields:
+            KeywordMatch: start, end, keyword and the labels it implies
+        """
+        search = self._pattern.search
+        labels = self._labels if self.whole_words else self._closure
+        match = search(text, start)
+        while match is not None:
+            keyword = match.group()
+            yield KeywordMatch(match.start(), match.end(), keyword, labels[keyword])
+            # Restart one character later so overlapping keywords are found too
+            match = search(text, match.start() + 1)
+
+    def first(self, text: str) -> Optional[KeywordMatch]:
+        """Return the leftmost match, or None"""
+        return next(self.finditer(text), None)
+
+    def labels(self, text: str) -> Set[str]:
+        """
+        Find every label with at least one keyword in the text.
+
+        Args:
+            text (str): The text to scan
+
+        Returns:
+            Set[str]: Labels of all matching keywords
+        """
+        if self._by_label is not None:
+            return {
+                name
+                for name, words in self._by_label.items()
+                if any(word in text for word in words)
+            }
+
+        found: Set[str] = set()
+        for match in self.finditer(text):
+            found |= match.labels
+        return found
+
+    def first_label(self, text: str, order: Sequence[str]) -> Optional[str]:
+        """
+        Get the first label in ``order`` with a keyword in the text.
+
+        Args:
+            text (str): The text to scan
+            order: Labels by priority
+
+        Returns:
+            str or None: The highest-priority matching label
+        """
+        if self._by_label is not None:
+            for name in order:
+                if any(word in text for word in self._by_label.get(name, ())):
+                    return name
+            return None
+
+        found = self.labels(text)
+        return next((name for name in order if name in found), None)
+
+    def matches(self, text: str) -> List[KeywordMatch]:
+        """Return all matches as a list"""
+        return list(self.finditer(text))
@@ -0,0 +1,235 @@
+"""
+Compiled profanity index for the Prompt Engineering Studio.
+The better_profanity word list is compiled once into a trie-shaped regular
+expression with leetspeak character classes, so an output is checked in a
+single C-level scan instead of better_profanity's per-word Python loop.
+"""
+
+import os
+import re
+import bisect
+import functools
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from better_profanity.utils import get_complete_path_of_file
+
+    DEFAULT_WORDLIST_PATH: Optional[str] = os.environ.get(
+        "PROMPT_STUDIO_PROFANITY_WORDLIST", get_complete_path_of_file("profanity_wordlist.txt")
+    )
+except ImportError:
+    DEFAULT_WORDLIST_PATH = os.environ.get("PROMPT_STUDIO_PROFANITY_WORDLIST")
+
+# Characters that may stand in for a letter (same table as better_profanity)
+LEETSPEAK = {
+    "a": "a@*4",
+    "i": "i*l1",
+    "o": "o*0@",
+    "u": "u*v",
+    "v": "v*u",
+    "l": "l1",
+    "e": "e*3",
+    "s": "s$5",
+    "t": "t7",
+}
+
+# Word characters: letters and digits plus the symbols used in leetspeak
+_WORD_CHARS = "@$*\"'"
+_NOT_AFTER_WORD = r"(?<![^\W_])(?<![" + re.escape(_WORD_CHARS) + r"])"
+_NOT_BEFORE_WORD = r"(?![^\W_])(?![" + re.escape(_WORD_CHARS) + r"])"
+
+# Separators between letters ("f u-c.k"); NUL is excluded so batches can be joined with it
+_SEPARATOR = r"(?:[^\w\x00" + re.escape(_WORD_CHARS) + r"]|_)*"
+_BATCH_JOINER = "\x00"
+
+
+def _letter_class(char: str) -> str:
+    variants = LEETSPEAK.get(char, char)
+    if len(variants) == 1:
+        return re.escape(variants)
+    return "[" + "".join(re.escape(v) for v in variants) + "]"
+
+
+def _trie_pattern(node: Dict[str, dict], first: bool) -> str:
+    """Regex for a trie node; letters after the first may be preceded by separators"""
+    ends_here = "" in node
+    prefix = "" if first else _SEPARATOR
+    branches = [
+        prefix + _letter_class(char) + _trie_pattern(child, False)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if ends_here else pattern
+
+
+class ProfanityIndex:
+    """
+    Immutable, thread-safe profanity matcher.
+
+    A listed word matches as a whole word, case-insensitively, with leetspeak
+    substitutions ("sh1t") and separators between its letters ("s h-i.t").
+    """
+
+    def __init__(self, words: Iterable[str]):
+        """
+        Args:
+            words: Words to match; spaces, hyphens, dots and underscores inside
+                them are treated as optional separators
+        """
+        keys = set()
+        for word in words:
+            key = "".join(
+                char for char in word.lower() if not char.isspace() and char not in "-._"
+            )
+            if key:
+                keys.add(key)
+        self.size = len(keys)
+        self.max_word_length = max((len(key) for key in keys), default=0)
+
+        trie: Dict[str, dict] = {}
+        for key in keys:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        body = _trie_pattern(trie, True) if trie else "(?!)"
+        # Matches listed words in lowercased text; lowercasing texts up front
+        # scans faster than re.IGNORECASE
+        self.pattern = re.compile(_NOT_AFTER_WORD + "(?:" + body + ")" + _NOT_BEFORE_WORD)
+
+    @classmethod
+    def from_file(cls, path: str) -> "ProfanityIndex":
+        """
+        Load a word list with one word or phrase per line.
+
+        Args:
+            path (str): Path to the word list
+
+        Returns:
+            ProfanityIndex: The compiled index
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(line.strip() for line in f if line.strip())
+
+    def __len__(self) -> int:
+        return self.size
+
+    def contains(self, text: str) -> bool:
+        """Check whether the text contains a listed word"""
+        return self.pattern.search(text.lower()) is not None
+
+    def contains_many(self, texts: List[str]) -> List[bool]:
+        """
+        Check many texts in a single scan.
+
+        Args:
+            texts (List[str]): Texts to check
+
+        Returns:
+            List[bool]: Whether each text contains a listed word
+        """
+        flags = [False] * len(texts)
+        if not texts:
+            return flags
+
+        # Texts are joined with a character that matches can never span
+        texts = [text.lower() for text in texts]
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + 1
+
+        search = self.pattern.search
+        joined = _BATCH_JOINER.join(texts)
+        match = search(joined)
+        while match is not None:
+            index = bisect.bisect_right(starts, match.start()) - 1
+            flags[index] = True
+            if index + 1 == len(texts):
+                break
+            # The rest of this text cannot change its flag
+            match = search(joined, starts[index + 1])
+        return flags
+
+    def scanner(self) -> "StreamScanner":
+        """Return a scanner for text that arrives in chunks"""
+        return StreamScanner(self)
+
+
+class StreamScanner:
+    """
+    Incremental ProfanityIndex.contains for streamed text.
+
+    Only a short tail of the text seen so far is kept and rescanned with each
+    new chunk: enough to hold the longest listed word, its separators and the
+    character before it.
+    """
+
+    def __init__(self, index: ProfanityIndex):
+        self._pattern = index.pattern
+        self._tail_words = index.max_word_length
+        self._tail = ""
+        # Once trimmed, the tail starts with a character kept only as context
+        self._start = 0
+        self.found = False
+        # Characters at the end of the text that may be the start of a listed word
+        self.pending = 0
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scan the next chunk of text.
+
+        Args:
+            chunk (str): Newly decoded text
+
+        Returns:
+            bool: Whether a listed word has been found so far
+        """
+        if self.found or not chunk:
+            return self.found
+
+        window = self._tail + chunk.lower()
+        self.pending = 0
+        # A word ending at the end of the window may still grow ("damn" -> "damned")
+        for match in self._pattern.finditer(window, self._start):
+            if match.end() < len(window):
+                self.found = True
+                return True
+            self.pending = max(self.pending, len(window) - match.start())
+        start = self._tail_start(window)
+        self._tail = window[start:]
+        self._start = 1 if start > 0 else self._start
+        return False
+
+    def finish(self) -> bool:
+        """Scan the end of the text, once no more chunks will arrive"""
+        if not self.found:
+            self.found = self._pattern.search(self._tail, self._start) is not None
+        self.pending = 0
+        return self.found
+
+    def _tail_start(self, window: str) -> int:
+        """Start of the shortest suffix that still contains max_word_length letters"""
+        letters = 0
+        index = len(window)
+        while index > 0 and letters < self._tail_words:
+            index -= 1
+            char = window[index]
+            if char.isalnum() or char in _WORD_CHARS:
+                letters += 1
+        # Keep the character before as context for the word-boundary check
+        return max(index - 1, 0)
+
+
+@functools.lru_cache(maxsize=None)
+def get_profanity_index() -> Optional[ProfanityIndex]:
+    """Return the shared index, or None when no word list is available"""
+    if not DEFAULT_WORDLIST_PATH or not os.path.exists(DEFAULT_WORDLIST_PATH):
+        return None
+    return ProfanityIndex.from_file(DEFAULT_WORDLIST_PATH)
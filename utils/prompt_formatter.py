@@ -3,8 +3,9 @@ Prompt formatting utilities for the Prompt Engineering Studio.
 Handles template processing, placeholder replacement, and professional prompt formatting.
 """
 
-import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from utils.template_engine import compile_template, template_segments
+from utils.token_counter import get_token_counter
 
 
 def format_prompt(template: str, input_text: str) -> str:
@@ -21,13 +22,25 @@ def format_prompt(template: str, input_text: str) -> str:
     if not template or not input_text:
         return template
 
-    # Replace common placeholder patterns
-    formatted = template.replace("{input}", input_text)
-    formatted = formatted.replace("{INPUT}", input_text)
-    formatted = formatted.replace("[INPUT]", input_text)
-    formatted = formatted.replace("<input>", input_text)
+    # {input}, {INPUT}, [INPUT] and <input> are all the same variable
+    return input_text.join(template_segments(template)).strip()
 
-    return formatted.strip()
+
+def render_template(template: str, variables: Dict[str, str]) -> str:
+    """
+    Fill in a template with several named variables, such as {input} and {context}.
+
+    Args:
+        template (str): The prompt template with placeholders
+        variables (dict): Values by variable name, matched case-insensitively
+
+    Returns:
+        str: The rendered prompt; variables without a value are left unchanged
+    """
+    if not template:
+        return template
+
+    return compile_template(template).render(variables).strip()
 
 
 def extract_placeholders(template: str) -> List[str]:
@@ -40,21 +53,8 @@ def extract_placeholders(template: str) -> List[str]:
     Returns:
         List[str]: List of placeholder names found in the template
     """
-    placeholders = []
-
-    # Find {placeholder} patterns
-    curly_matches = re.findall(r"\{([^}]+)\}", template)
-    placeholders.extend(curly_matches)
-
-    # Find [placeholder] patterns
-    square_matches = re.findall(r"\[([^\]]+)\]", template)
-    placeholders.extend(square_matches)
-
-    # Find <placeholder> patterns
-    angle_matches = re.findall(r"<([^>]+)>", template)
-    placeholders.extend(angle_matches)
-
-    return list(set(placeholders))  # Remove duplicates
+    placeholders = compile_template(template).placeholders
+    return list({placeholder.name for placeholder in placeholders})  # Remove duplicates
 
 
 def validate_template(template: str) -> Tuple[bool, str]:
@@ -70,26 +70,14 @@ def validate_template(template: str) -> Tuple[bool, str]:
     if not template.strip():
         return False, "Template cannot be empty"
 
-    placeholders = extract_placeholders(template)
+    compiled = compile_template(template)
 
-    if not placeholders:
+    if not compiled.placeholders:
         return False, "Template should contain at least one placeholder (e.g., {input})"
 
-    # Check for unmatched brackets
-    open_curly = template.count("{")
-    close_curly = template.count("}")
-    if open_curly != close_curly:
-        return False, "Unmatched curly brackets in template"
-
-    open_square = template.count("[")
-    close_square = template.count("]")
-    if open_square != close_square:
-        return False, "Unmatched square brackets in template"
-
-    open_angle = template.count("<")
-    close_angle = template.count(">")
-    if open_angle != close_angle:
-        return False, "Unmatched angle brackets in template"
+    # Unmatched brackets, reported with their line and column
+    if compiled.errors:
+        return False, str(compiled.errors[0])
 
     return True, ""
 
@@ -159,17 +147,42 @@ def count_tokens_estimate(text: str) -> int:
     return len(text) // 4 + text.count(" ") + 1
 
 
-def truncate_for_model(text: str, max_tokens: int = 512) -> str:
+def count_tokens(text: str, model_name: Optional[str] = None, load: bool = True) -> int:
+    """
+    Count tokens with the model's own tokenizer.
+
+    Args:
+        text (str): Input text
+        model_name (str, optional): The model name/path
+        load (bool): Load the tokenizer if it is not available yet
+
+    Returns:
+        int: Token count, estimated when the tokenizer is not available
+    """
+    counter = get_token_counter(model_name, load=load) if model_name else None
+    if counter is None:
+        return count_tokens_estimate(text)
+    return counter.count(text)
+
+
+def truncate_for_model(
+    text: str, max_tokens: int = 512, model_name: Optional[str] = None
+) -> str:
     """
     Truncate text to fit within token limits.
 
     Args:
         text (str): Input text
         max_tokens (int): Maximum allowed tokens
+        model_name (str, optional): Cut at the model's token boundaries
 
     Returns:
         str: Truncated text if necessary
     """
+    counter = get_token_counter(model_name) if model_name else None
+    if counter is not None:
+        return counter.truncate(text, max_tokens)
+
     estimated_tokens = count_tokens_estimate(text)
 
     if estimated_tokens <= max_tokens:
@@ -0,0 +1,372 @@
+"""
+Response comparison for the Prompt Engineering Studio.
+Diffs model responses word by word and builds a pairwise similarity matrix
+across all compared models. Diffs use patience anchoring with a bounded Myers
+search between anchors, so long responses diff in near-linear time, and
+results are cached by the hashes of the two responses.
+"""
+
+import hashlib
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_CACHE_SIZE = 256
+# Edit distance explored by Myers between two anchors before the gap is
+# treated as fully replaced; the search costs about this number squared
+DEFAULT_MAX_EDITS = 500
+DEFAULT_CONTEXT = 3
+
+# (tag, a_start, a_end, b_start, b_end) as in difflib.SequenceMatcher.get_opcodes
+Opcode = Tuple[str, int, int, int, int]
+
+
+class PairDiff(NamedTuple):
+    """Word-level differences between two responses"""
+
+    similarity: float  # 2 * matching words / total words, as difflib's ratio()
+    opcodes: List[Opcode]
+
+
+class ResponseComparison(NamedTuple):
+    """Comparison of every pair of responses"""
+
+    models: List[str]
+    matrix: List[List[float]]  # matrix[i][j]: similarity of models i and j
+    diffs: Dict[Tuple[str, str], PairDiff]  # (models[i], models[j]) with i < j
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a response into the words that are compared"""
+    return text.split()
+
+
+def _myers(a: Sequence[int], b: Sequence[int], max_edits: int) -> Optional[List[Tuple[int, int]]]:
+    """Matching positions of a shortest edit script, or None if it needs more than max_edits edits"""
+    n, m = len(a), len(b)
+    limit = min(n + m, max_edits)
+    offset = limit + 1
+    v = [0] * (2 * limit + 3)
+    trace = []
+    for d in range(limit + 1):
+        # Only diagonals -d-1..d+1 are read at this step
+        trace.append(v[offset - d - 1 : offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace: List[List[int]], x: int, y: int) -> List[Tuple[int, int]]:
+    """Walk the saved frontiers back from the end to collect the matching positions"""
+    matches = []
+    for d in range(len(trace) - 1, -1, -1):
+        v, base = trace[d], d + 1  # v[base + k] is diagonal k
+        k = x - y
+        if k == -d or (k != d and v[base + k - 1] < v[base + k + 1]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[base + previous_k] if d > 0 else 0
+        previous_y = previous_x - previous_k if d > 0 else 0
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            matches.append((x, y))
+        x, y = previous_x, previous_y
+    matches.reverse()
+    return matches
+
+
+def _unique_anchors(a: Sequence[int], b: Sequence[int]) -> List[Tuple[int, int]]:
+    """Longest increasing run of words that occur exactly once in both sides (patience diff)"""
+    counts: Dict[int, List[int]] = {}
+    for i, token in enumerate(a):
+        entry = counts.setdefault(token, [0, i, 0, -1])
+        entry[0] += 1
+    for j, token in enumerate(b):
+        entry = counts.get(token)
+        if entry is not None:
+            entry[2] += 1
+            entry[3] = j
+    pairs = sorted((i, j) for count_a, i, count_b, j in counts.values() if count_a == 1 and count_b == 1)
+
+    # Longest increasing subsequence of b positions, by patience sorting
+    tops: List[int] = []
+    top_index: List[int] = []
+    previous: List[int] = []
+    for index, (_, j) in enumerate(pairs):
+        pile = bisect_left(tops, j)
+        previous.append(top_index[pile - 1] if pile else -1)
+        if pile == len(tops):
+            tops.append(j)
+            top_index.append(index)
+        else:
+            tops[pile] = j
+            top_index[pile] = index
+    anchors = []
+    index = top_index[-1] if top_index else -1
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def _matches(a: Sequence[int], b: Sequence[int], max_edits: int) -> List[Tuple[int, int]]:
+    """Matching positions of a and b, in order"""
+    matches: List[Tuple[int, int]] = []
+    # Work left to right: ("range", a_start, a_end, b_start, b_end) still to diff,
+    # or ("matches", pairs) already known
+    stack: List[tuple] = [("range", 0, len(a), 0, len(b))]
+    while stack:
+        entry = stack.pop()
+        if entry[0] == "matches":
+            matches.extend(entry[1])
+            continue
+        _, a_lo, a_hi, b_lo, b_hi = entry
+
+        # Common prefix and suffix
+        while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+            matches.append((a_lo, b_lo))
+            a_lo += 1
+            b_lo += 1
+        suffix = []
+        while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+            suffix.append((a_hi, b_hi))
+        suffix.reverse()
+        if a_lo == a_hi or b_lo == b_hi:
+            matches.extend(suffix)
+            continue
+
+        # Gaps that fit the edit budget get an exact Myers diff; longer ones are
+        # first split on words unique to both sides (patience diff)
+        small = (a_hi - a_lo) + (b_hi - b_lo) <= max_edits
+        anchors = [] if small else _unique_anchors(a[a_lo:a_hi], b[b_lo:b_hi])
+        if anchors:
+            pending: List[tuple] = []
+            i_start, j_start = a_lo, b_lo
+            for i, j in anchors:
+                pending.append(("range", i_start, a_lo + i, j_start, b_lo + j))
+                pending.append(("matches", [(a_lo + i, b_lo + j)]))
+                i_start, j_start = a_lo + i + 1, b_lo + j + 1
+            pending.append(("range", i_start, a_hi, j_start, b_hi))
+            pending.append(("matches", suffix))
+            stack.extend(reversed(pending))
+            continue
+
+        middle = _myers(a[a_lo:a_hi], b[b_lo:b_hi], max_edits)
+        if middle is not None:
+            matches.extend((a_lo + i, b_lo + j) for i, j in middle)
+        # Otherwise the gap is too different to align and counts as replaced
+        matches.extend(suffix)
+    return matches
+
+
+def diff_tokens(
+    a: Sequence[str], b: Sequence[str], max_edits: int = DEFAULT_MAX_EDITS
+) -> List[Opcode]:
+    """
+    Diff two word sequences.
+
+    Args:
+        a: Words of the first response
+        b: Words of the second response
+        max_edits (int): Myers search limit between anchors
+
+    Returns:
+        List[Opcode]: Opcodes in the format of difflib.SequenceMatcher.get_opcodes()
+    """
+    # Compare small ints instead of strings
+    ids: Dict[str, int] = {}
+    a_ids = [ids.setdefault(token, len(ids)) for token in a]
+    b_ids = [ids.setdefault(token, len(ids)) for token in b]
+
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for x, y in _matches(a_ids, b_ids, max_edits) + [(len(a), len(b))]:
+        if i < x and j < y:
+            opcodes.append(("replace", i, x, j, y))
+        elif i < x:
+            opcodes.append(("delete", i, x, j, y))
+        elif j < y:
+            opcodes.append(("insert", i, x, j, y))
+        if x < len(a):
+            if opcodes and opcodes[-1][0] == "equal":
+                opcodes[-1] = ("equal", opcodes[-1][1], x + 1, opcodes[-1][3], y + 1)
+            else:
+                opcodes.append(("equal", x, x + 1, y, y + 1))
+        i, j = x + 1, y + 1
+    return opcodes
+
+
+def similarity(opcodes: List[Opcode], a_length: int, b_length: int) -> float:
+    """2 * matching words / total words; 1.0 for two empty responses"""
+    if not a_length + b_length:
+        return 1.0
+    matched = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal")
+    return 2.0 * matched / (a_length + b_length)
+
+
+def _group_opcodes(opcodes: List[Opcode], context: int) -> Iterator[List[Opcode]]:
+    """Hunks of changes with context words around them, as difflib.get_grouped_opcodes()"""
+    if not opcodes:
+        opcodes = [("equal", 0, 1, 0, 1)]
+    # Trim the leading and trailing context
+    tag, i1, i2, j1, j2 = opcodes[0]
+    if tag == "equal":
+        opcodes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    tag, i1, i2, j1, j2 = opcodes[-1]
+    if tag == "equal":
+        opcodes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        # Split long unchanged runs into the end and start of two hunks
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _format_range(start: int, stop: int) -> str:
+    length = stop - start
+    beginning = start + 1 if length else start
+    return str(beginning) if length == 1 else f"{beginning},{length}"
+
+
+def unified_diff(
+    a: Sequence[str],
+    b: Sequence[str],
+    opcodes: List[Opcode],
+    fromfile: str = "",
+    tofile: str = "",
+    context: int = DEFAULT_CONTEXT,
+) -> List[str]:
+    """
+    Format word-level opcodes like difflib.unified_diff(..., lineterm="").
+
+    Args:
+        a: Words of the first response
+        b: Words of the second response
+        opcodes: Opcodes from diff_tokens(a, b)
+        fromfile (str): Label of the first response
+        tofile (str): Label of the second response
+        context (int): Unchanged words shown around each change
+
+    Returns:
+        List[str]: Diff lines; empty if the responses are the same
+    """
+    lines: List[str] = []
+    for group in _group_opcodes(list(opcodes), context):
+        if not lines:
+            lines += [f"--- {fromfile}", f"+++ {tofile}"]
+        first, last = group[0], group[-1]
+        lines.append(
+            f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+        )
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines += [" " + word for word in a[i1:i2]]
+                continue
+            lines += ["-" + word for word in a[i1:i2]]
+            lines += ["+" + word for word in b[j1:j2]]
+    return lines
+
+
+class DiffCache:
+    """LRU cache of pair diffs keyed by the hashes of both responses"""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            max_entries (int): Number of pair diffs to keep
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], PairDiff]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def diff(self, a: str, b: str) -> PairDiff:
+        """
+        Diff two responses, reusing the result for the same pair of texts.
+
+        Args:
+            a (str): First response
+            b (str): Second response
+
+        Returns:
+            PairDiff: Similarity and word-level opcodes
+        """
+        key = (
+            hashlib.sha256(a.encode("utf-8")).hexdigest(),
+            hashlib.sha256(b.encode("utf-8")).hexdigest(),
+        )
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        a_tokens, b_tokens = tokenize(a), tokenize(b)
+        opcodes = diff_tokens(a_tokens, b_tokens)
+        result = PairDiff(similarity(opcodes, len(a_tokens), len(b_tokens)), opcodes)
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_diff_cache = DiffCache()
+
+
+def get_diff_cache() -> DiffCache:
+    """Return the process-wide diff cache"""
+    return _diff_cache
+
+
+def compare_responses(responses: Dict[str, str]) -> ResponseComparison:
+    """
+    Compare every pair of responses.
+
+    Args:
+        responses (dict): Response text by model name
+
+    Returns:
+        ResponseComparison: Similarity matrix and the diff of each pair
+    """
+    models = list(responses)
+    matrix = [[1.0] * len(models) for _ in models]
+    diffs = {}
+    for i, first in enumerate(models):
+        for j in range(i + 1, len(models)):
+            second = models[j]
+            pair = _diff_cache.diff(responses[first], responses[second])
+            diffs[(first, second)] = pair
+            matrix[i][j] = matrix[j][i] = pair.similarity
+    return ResponseComparison(models, matrix, diffs)
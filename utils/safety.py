@@ -2,13 +2,16 @@
 Safety utilities for the Prompt Engineering Studio
 """
 
-try:
-    from better_profanity import profanity
+from typing import List, Tuple
 
-    PROFANITY_AVAILABLE = True
-except ImportError:
-    PROFANITY_AVAILABLE = False
-    profanity = None
+from utils.injection_detector import InjectionMatch, get_injection_detector
+from utils.profanity_filter import get_profanity_index
+
+FILTERED_MESSAGE = "[⚠️ Filtered: Output contained inappropriate content]"
+
+# Compiled once at startup and shared by every thread
+_profanity_index = get_profanity_index()
+PROFANITY_AVAILABLE = _profanity_index is not None
 
 
 def safe_format_prompt(user_input: str) -> str:
@@ -41,16 +44,81 @@ def filter_output(text: str):
     if not PROFANITY_AVAILABLE:
         return text, False
 
-    # Load profanity filter if not already loaded
-    if not hasattr(profanity, "_words"):
-        profanity.load_censor_words()
-
-    if profanity.contains_profanity(text):
-        return "[⚠️ Filtered: Output contained inappropriate content]", True
+    if _profanity_index.contains(text):
+        return FILTERED_MESSAGE, True
 
     return text, False
 
 
+def filter_outputs(texts: List[str]) -> List[Tuple[str, bool]]:
+    """
+    Filter many model outputs at once, e.g. a batch run or an N-way comparison.
+
+    Args:
+        texts: Raw model outputs
+
+    Returns:
+        List of (filtered_text, was_filtered) tuples, one per output
+    """
+    if not PROFANITY_AVAILABLE:
+        return [(text, False) for text in texts]
+
+    return [
+        (FILTERED_MESSAGE, True) if flagged else (text, False)
+        for text, flagged in zip(texts, _profanity_index.contains_many(texts))
+    ]
+
+
+class StreamingOutputFilter:
+    """
+    filter_output for text that is generated in chunks.
+
+    Each chunk is checked as it arrives, keeping only a short tail of the
+    text for words split across chunks, so generation can be stopped as soon
+    as inappropriate content appears.
+    """
+
+    def __init__(self):
+        self._scanner = _profanity_index.scanner() if PROFANITY_AVAILABLE else None
+        self.text = ""
+        self.was_filtered = False
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Check the next chunk of model output.
+
+        Args:
+            chunk: Newly decoded text
+
+        Returns:
+            True once the output has been filtered
+        """
+        self.text += chunk
+        if self._scanner is not None and not self.was_filtered:
+            self.was_filtered = self._scanner.feed(chunk)
+        return self.was_filtered
+
+    def finish(self):
+        """
+        Check the end of the output once generation is done.
+
+        Returns:
+            Tuple of (filtered_text, was_filtered), like filter_output
+        """
+        if self._scanner is not None and not self.was_filtered:
+            self.was_filtered = self._scanner.finish()
+        return self.output, self.was_filtered
+
+    @property
+    def output(self) -> str:
+        """The text that is safe to show so far"""
+        if self.was_filtered:
+            return FILTERED_MESSAGE
+        # A word that may turn out to be inappropriate is held back until it is complete
+        pending = self._scanner.pending if self._scanner is not None else 0
+        return self.text[: len(self.text) - pending]
+
+
 def validate_input(user_input: str):
     """
     Validate user input for safety concerns.
@@ -68,16 +136,21 @@ def validate_input(user_input: str):
         return "Input too long (max 1000 characters)", False
 
     # Check for potential prompt injection attempts
-    injection_patterns = [
-        "ignore previous instructions",
-        "forget your instructions",
-        "act as if you are",
-        "pretend to be",
-    ]
-
-    user_lower = user_input.lower()
-    for pattern in injection_patterns:
-        if pattern in user_lower:
-            return f"⚠️ Input may contain prompt injection attempt: '{pattern}'", False
+    matches = detect_injection(user_input)
+    if matches:
+        return f"⚠️ Input may contain prompt injection attempt: '{matches[0].pattern}'", False
 
     return "", True
+
+
+def detect_injection(user_input: str) -> List[InjectionMatch]:
+    """
+    Find prompt injection signatures in user input.
+
+    Args:
+        user_input: User's input text
+
+    Returns:
+        List of (pattern, start, end) matches, positioned in the original text
+    """
+    return get_injection_detector().detect(user_input)
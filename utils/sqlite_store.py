@@ -0,0 +1,33 @@
+"""
+SQLite setup shared by the Prompt Engineering Studio's on-disk stores
+(response cache, template store and history store).
+"""
+
+import os
+import sqlite3
+
+
+def open_sqlite(path: str, schema: str) -> sqlite3.Connection:
+    """
+    Open a store's database for use from several threads and processes.
+
+    The parent directory is created if needed, and the WAL journal lets
+    readers in other processes work while one process writes. Callers
+    serialize access to the connection with their own lock.
+
+    Args:
+        path (str): SQLite file, or ":memory:"
+        schema (str): CREATE ... IF NOT EXISTS statements for the store's tables
+
+    Returns:
+        sqlite3.Connection: The connection, with rows returned as sqlite3.Row
+    """
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(schema)
+    conn.commit()
+    return conn
@@ -0,0 +1,194 @@
+"""
+Compiled prompt templates for the Prompt Engineering Studio.
+A template is parsed once into literal segments and variable slots, cached by
+its content, so rendering is a single join and validation a cached lookup.
+"""
+
+import re
+import functools
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+# Any bracketed text is a placeholder, as in "[Insert example]"
+_PLACEHOLDER_PATTERNS = [re.compile(r"\{([^}]+)\}"), re.compile(r"\[([^\]]+)\]"), re.compile(r"<([^>]+)>")]
+
+# Variables are identifiers in brackets: {input}, [INPUT], <context>
+_VARIABLE = re.compile(
+    r"\{([A-Za-z_][A-Za-z0-9_]*)\}|\[([A-Za-z_][A-Za-z0-9_]*)\]|<([A-Za-z_][A-Za-z0-9_]*)>"
+)
+
+_BRACKETS = {"{": "}", "[": "]", "<": ">"}
+_BRACKET_NAMES = {"{": "curly", "[": "square", "<": "angle"}
+_CLOSING = {close: open_ for open_, close in _BRACKETS.items()}
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class Placeholder(NamedTuple):
+    """A bracketed placeholder in a template"""
+
+    name: str  # Text between the brackets
+    start: int
+    end: int
+
+
+class TemplateError(NamedTuple):
+    """A problem found while compiling a template"""
+
+    message: str
+    position: int
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        return f"{self.message} (line {self.line}, column {self.column})"
+
+
+def _error(template: str, message: str, position: int) -> TemplateError:
+    line = template.count("\n", 0, position) + 1
+    column = position - (template.rfind("\n", 0, position) + 1) + 1
+    return TemplateError(message, position, line, column)
+
+
+class CompiledTemplate:
+    """
+    Immutable parsed template.
+
+    Variables are identifiers in brackets, such as {input}, [INPUT] or
+    <context>, and match render() arguments case-insensitively. Variables
+    without a value, and placeholders that are not identifiers, are
+    rendered unchanged.
+    """
+
+    def __init__(self, source: str):
+        """
+        Args:
+            source (str): The template text
+        """
+        self.source = source
+        self.placeholders: Tuple[Placeholder, ...] = tuple(
+            sorted(
+                (
+                    Placeholder(match.group(1), *match.span())
+                    for pattern in _PLACEHOLDER_PATTERNS
+                    for match in pattern.finditer(source)
+                ),
+                key=lambda placeholder: placeholder.start,
+            )
+        )
+
+        # Alternating literal text and variable slots: literals[i] precedes slots[i]
+        literals: List[str] = []
+        slots: List[Tuple[str, str]] = []  # (variable, original placeholder text)
+        position = 0
+        for match in _VARIABLE.finditer(source):
+            name = next(group for group in match.groups() if group)
+            literals.append(source[position : match.start()])
+            slots.append((name.lower(), match.group()))
+            position = match.end()
+        literals.append(source[position:])
+        self.literals: Tuple[str, ...] = tuple(literals)
+        self.slots: Tuple[Tuple[str, str], ...] = tuple(slots)
+        self.variables: Tuple[str, ...] = tuple(dict.fromkeys(name for name, _ in slots))
+        self.errors: Tuple[TemplateError, ...] = tuple(self._check_brackets())
+        self._segments: Dict[str, Tuple[str, ...]] = {}
+
+    def _check_brackets(self) -> List[TemplateError]:
+        """Find the first unmatched bracket of each kind"""
+        open_positions: Dict[str, List[int]] = {open_: [] for open_ in _BRACKETS}
+        errors: Dict[str, TemplateError] = {}
+        for position, char in enumerate(self.source):
+            if char in _BRACKETS:
+                open_positions[char].append(position)
+            elif char in _CLOSING:
+                open_ = _CLOSING[char]
+                if open_positions[open_]:
+                    open_positions[open_].pop()
+                elif open_ not in errors:
+                    errors[open_] = _error(
+                        self.source,
+                        f"Unmatched {_BRACKET_NAMES[open_]} brackets in template: "
+                        f"'{char}' without '{open_}'",
+                        position,
+                    )
+        for open_, positions in open_positions.items():
+            if positions and open_ not in errors:
+                errors[open_] = _error(
+                    self.source,
+                    f"Unmatched {_BRACKET_NAMES[open_]} brackets in template: "
+                    f"'{open_}' is never closed",
+                    positions[0],
+                )
+        return sorted(errors.values(), key=lambda error: error.position)
+
+    def render(self, variables: Optional[Mapping[str, str]] = None, **kwargs: str) -> str:
+        """
+        Fill in the template's variables.
+
+        Args:
+            variables (dict, optional): Variable values by name
+            **kwargs: More variable values
+
+        Returns:
+            str: The rendered text
+        """
+        values = {name.lower(): value for name, value in {**(variables or {}), **kwargs}.items()}
+        parts = []
+        for literal, (name, original) in zip(self.literals, self.slots):
+            parts.append(literal)
+            parts.append(values.get(name, original))
+        parts.append(self.literals[-1])
+        return "".join(parts)
+
+    def segments(self, variable: str) -> Tuple[str, ...]:
+        """
+        Split the template around one variable, with every other placeholder kept.
+
+        Args:
+            variable (str): The variable name
+
+        Returns:
+            Tuple[str, ...]: Text around each occurrence; ``value.join(segments)``
+            renders the template
+        """
+        variable = variable.lower()
+        segments = self._segments.get(variable)
+        if segments is None:
+            parts, current = [], self.literals[0]
+            for (name, original), literal in zip(self.slots, self.literals[1:]):
+                if name == variable:
+                    parts.append(current)
+                    current = literal
+                else:
+                    current += original + literal
+            parts.append(current)
+            segments = self._segments[variable] = tuple(parts)
+        return segments
+
+
+@functools.lru_cache(maxsize=DEFAULT_CACHE_SIZE)
+def compile_template(template: str) -> CompiledTemplate:
+    """
+    Compile a template, reusing the compiled form for identical text.
+
+    Args:
+        template (str): The template text
+
+    Returns:
+        CompiledTemplate: The parsed template
+    """
+    return CompiledTemplate(template)
+
+
+@functools.lru_cache(maxsize=DEFAULT_CACHE_SIZE)
+def template_segments(template: str, variable: str = "input") -> Tuple[str, ...]:
+    """
+    Split a template around one variable, so that rendering is a single join.
+
+    Args:
+        template (str): The template text
+        variable (str): The variable name
+
+    Returns:
+        Tuple[str, ...]: Text around each occurrence of the variable
+    """
+    return compile_template(template).segments(variable)
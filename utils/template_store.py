@@ -0,0 +1,458 @@
+"""
+Template store for the Prompt Engineering Studio.
+Keeps the prompt template library in SQLite with a version history per
+template, full-text search over names and descriptions, paged listing and a
+change counter for hot reload. prompt_types.json remains the import/export
+format and is re-imported whenever the file changes; templates removed from
+the file are removed from the store.
+
+Usage:
+    python -m utils.template_store import prompt_types.json
+    python -m utils.template_store export prompt_types.json
+    python -m utils.template_store search "step by step"
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.sqlite_store import open_sqlite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.environ.get("PROMPT_STUDIO_TEMPLATE_DB", "templates.sqlite3")
+DEFAULT_JSON_PATH = "prompt_types.json"
+DEFAULT_PAGE_SIZE = 50
+
+FIELDS = ("template", "description", "input_placeholder")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS templates (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    template TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    input_placeholder TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS template_versions (
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    template TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    input_placeholder TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    PRIMARY KEY (name, version)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _fts_query(query: str) -> str:
+    """Quote each word of a search so that it is matched as a prefix"""
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in query.split())
+
+
+class TemplateStore:
+    """
+    Versioned prompt templates in SQLite.
+
+    Saving a template whose content changed adds a new version and bumps a
+    store-wide generation counter, which readers poll to notice edits made
+    by this or any other process.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str, optional): SQLite file, or ":memory:"
+        """
+        self.path = path or DEFAULT_STORE_PATH
+        self._lock = threading.Lock()
+        self._conn = open_sqlite(self.path, _SCHEMA)
+        self.full_text = self._create_search_index()
+        self._conn.commit()
+
+    def _create_search_index(self) -> bool:
+        """Create the FTS5 index, kept in sync by triggers; False if FTS5 is unavailable"""
+        try:
+            self._conn.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS templates_fts USING fts5(
+                    name, description, content='templates', content_rowid='rowid'
+                );
+                CREATE TRIGGER IF NOT EXISTS templates_ai AFTER INSERT ON templates BEGIN
+                    INSERT INTO templates_fts(rowid, name, description)
+                    VALUES (new.rowid, new.name, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS templates_ad AFTER DELETE ON templates BEGIN
+                    INSERT INTO templates_fts(templates_fts, rowid, name, description)
+                    VALUES ('delete', old.rowid, old.name, old.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS templates_au AFTER UPDATE ON templates BEGIN
+                    INSERT INTO templates_fts(templates_fts, rowid, name, description)
+                    VALUES ('delete', old.rowid, old.name, old.description);
+                    INSERT INTO templates_fts(rowid, name, description)
+                    VALUES (new.rowid, new.name, new.description);
+                END;
+                """
+            )
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite has no FTS5, template search uses LIKE: {str(e)}")
+            return False
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _bump_generation(self):
+        self._set_meta("generation", str(int(self._meta("generation") or 0) + 1))
+
+    def generation(self) -> int:
+        """
+        Get the change counter; it increases whenever any template changes.
+
+        Returns:
+            int: The current generation
+        """
+        with self._lock:
+            return int(self._meta("generation") or 0)
+
+    def _save(self, name: str, entry: Dict[str, Any], now: float) -> Optional[int]:
+        """Store one template without committing; returns the new version or None"""
+        values = tuple(str(entry.get(field) or "") for field in FIELDS)
+        current = self._conn.execute(
+            "SELECT version, template, description, input_placeholder FROM templates WHERE name = ?",
+            (name,),
+        ).fetchone()
+        if current is not None and tuple(current)[1:] == values:
+            return None
+
+        # Continue the history of a deleted template rather than restarting it
+        version = self._conn.execute(
+            "SELECT COALESCE(MAX(version), 0) + 1 FROM template_versions WHERE name = ?", (name,)
+        ).fetchone()[0]
+        self._conn.execute(
+            "INSERT INTO template_versions "
+            "(name, version, template, description, input_placeholder, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, version, *values, now),
+        )
+        if current is None:
+            self._conn.execute(
+                "INSERT INTO templates "
+                "(name, version, template, description, input_placeholder, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (name, version, *values, now),
+            )
+        else:
+            self._conn.execute(
+                "UPDATE templates SET version = ?, template = ?, description = ?, "
+                "input_placeholder = ?, updated_at = ? WHERE name = ?",
+                (version, *values, now, name),
+            )
+        return version
+
+    def save(
+        self, name: str, template: str, description: str = "", input_placeholder: str = ""
+    ) -> int:
+        """
+        Save a template, adding a version if its content changed.
+
+        Args:
+            name (str): Template name, e.g. "Zero-shot"
+            template (str): Template text
+            description (str): What the template is for
+            input_placeholder (str): Hint shown in the input box
+
+        Returns:
+            int: The template's current version
+        """
+        entry = {"template": template, "description": description, "input_placeholder": input_placeholder}
+        with self._lock:
+            version = self._save(name, entry, time.time())
+            if version is None:
+                return self._conn.execute(
+                    "SELECT version FROM templates WHERE name = ?", (name,)
+                ).fetchone()[0]
+            self._bump_generation()
+            self._conn.commit()
+            return version
+
+    def delete(self, name: str) -> bool:
+        """
+        Remove a template; its version history is kept.
+
+        Args:
+            name (str): Template name
+
+        Returns:
+            bool: True if the template existed
+        """
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM templates WHERE name = ?", (name,)).rowcount
+            if deleted:
+                self._bump_generation()
+            self._conn.commit()
+            return deleted > 0
+
+    def get(self, name: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a template in the prompt_types.json entry format.
+
+        Args:
+            name (str): Template name
+            version (int, optional): A past version; the current one by default
+
+        Returns:
+            dict or None: template, description, input_placeholder and version
+        """
+        with self._lock:
+            if version is None:
+                row = self._conn.execute(
+                    "SELECT version, template, description, input_placeholder "
+                    "FROM templates WHERE name = ?",
+                    (name,),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT version, template, description, input_placeholder "
+                    "FROM template_versions WHERE name = ? AND version = ?",
+                    (name, version),
+                ).fetchone()
+        return dict(row) if row is not None else None
+
+    def versions(self, name: str) -> List[Dict[str, Any]]:
+        """
+        Get a template's version history, newest first.
+
+        Args:
+            name (str): Template name
+
+        Returns:
+            List[dict]: Each version with its creation time
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT version, template, description, input_placeholder, created_at "
+                "FROM template_versions WHERE name = ? ORDER BY version DESC",
+                (name,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _where(self, query: Optional[str]) -> Tuple[str, Tuple[Any, ...], str]:
+        """FROM/WHERE clause, parameters and ORDER BY for an optional search"""
+        if not query or not query.split():
+            return "templates", (), "templates.rowid"
+        if self.full_text:
+            return (
+                "templates JOIN templates_fts ON templates_fts.rowid = templates.rowid "
+                "WHERE templates_fts MATCH ?",
+                (_fts_query(query),),
+                "bm25(templates_fts), templates.rowid",
+            )
+        words = query.split()
+        clause = " AND ".join("(name LIKE ? OR description LIKE ?)" for _ in words)
+        params = tuple(value for word in words for value in (f"%{word}%", f"%{word}%"))
+        return f"templates WHERE {clause}", params, "templates.rowid"
+
+    def list_names(
+        self, query: Optional[str] = None, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE
+    ) -> List[str]:
+        """
+        List one page of template names, optionally filtered by a search.
+
+        Args:
+            query (str, optional): Words to find in names and descriptions
+            offset (int): Names to skip
+            limit (int): Page size
+
+        Returns:
+            List[str]: Names in the order they were added, or best search match first
+        """
+        source, params, order = self._where(query)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT templates.name FROM {source} ORDER BY {order} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def count(self, query: Optional[str] = None) -> int:
+        """
+        Count templates, optionally only those matching a search.
+
+        Args:
+            query (str, optional): Words to find in names and descriptions
+
+        Returns:
+            int: Number of templates
+        """
+        source, params, _ = self._where(query)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {source}", params).fetchone()[0]
+
+    def import_entries(
+        self, entries: Dict[str, Dict[str, Any]], remove: Iterable[str] = ()
+    ) -> int:
+        """
+        Save many templates in one transaction.
+
+        Args:
+            entries (dict): Entries by name, in the prompt_types.json format
+            remove (Iterable[str]): Template names to delete in the same transaction
+
+        Returns:
+            int: Number of templates added, changed or deleted
+
+        Raises:
+            ValueError: If the entries are not in the prompt_types.json format
+        """
+        # Check everything first, so a bad file imports nothing
+        if not isinstance(entries, dict):
+            raise ValueError("Templates must be a JSON object of entries by name")
+        for name, entry in entries.items():
+            if not isinstance(entry, dict):
+                raise ValueError(f"Template '{name}' must be a JSON object")
+            for field in FIELDS:
+                if entry.get(field) is not None and not isinstance(entry[field], str):
+                    raise ValueError(f"Template '{name}' has a non-string '{field}'")
+
+        now = time.time()
+        with self._lock:
+            changed = sum(
+                self._save(name, entry, now) is not None for name, entry in entries.items()
+            )
+            for name in remove:
+                changed += self._conn.execute(
+                    "DELETE FROM templates WHERE name = ?", (name,)
+                ).rowcount
+            if changed:
+                self._bump_generation()
+            self._conn.commit()
+            return changed
+
+    def sync_json(self, path: str = DEFAULT_JSON_PATH) -> int:
+        """
+        Import a prompt_types.json file if it changed since the last sync.
+
+        The file's modification time and size are checked first, so an
+        unchanged file is not read. Templates that an earlier sync imported
+        and the file no longer lists are deleted; templates from other
+        sources are kept.
+
+        Args:
+            path (str): Prompt types JSON file
+
+        Returns:
+            int: Number of templates added, changed or deleted
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return 0
+        signature = f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+        with self._lock:
+            if self._meta("json_signature") == signature:
+                return 0
+
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            unchanged = self._meta("json_sha256") == digest
+            if unchanged:
+                self._set_meta("json_signature", signature)
+                self._conn.commit()
+        if unchanged:
+            return 0
+
+        entries = json.loads(content)
+        with self._lock:
+            synced_names = json.loads(self._meta("json_names") or "[]")
+        removed = []
+        if isinstance(entries, dict):
+            removed = [name for name in synced_names if name not in entries]
+        changed = self.import_entries(entries, remove=removed)
+        with self._lock:
+            self._set_meta("json_signature", signature)
+            self._set_meta("json_sha256", digest)
+            self._set_meta("json_names", json.dumps(list(entries)))
+            self._conn.commit()
+        if changed:
+            logger.info(f"Imported {changed} template(s) from {path}")
+        return changed
+
+    def export_entries(self) -> Dict[str, Dict[str, str]]:
+        """
+        Get all current templates in the prompt_types.json format.
+
+        Returns:
+            dict: Entries by name
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, template, description, input_placeholder FROM templates ORDER BY rowid"
+            ).fetchall()
+        return {row["name"]: {field: row[field] for field in FIELDS} for row in rows}
+
+    def export_json(self, path: str):
+        """
+        Write all current templates to a prompt_types.json file.
+
+        Args:
+            path (str): Output JSON file
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.export_entries(), f, indent=2, ensure_ascii=False)
+
+
+_template_store = None
+_template_store_lock = threading.Lock()
+
+
+def get_template_store() -> TemplateStore:
+    """Return the process-wide template store, creating it on first use"""
+    global _template_store
+    with _template_store_lock:
+        if _template_store is None:
+            _template_store = TemplateStore()
+        return _template_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt Engineering Studio template store")
+    parser.add_argument("--db", default=DEFAULT_STORE_PATH, help="SQLite template store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("import", help="Import a prompt types JSON file").add_argument("path")
+    subparsers.add_parser("export", help="Export to a prompt types JSON file").add_argument("path")
+    subparsers.add_parser("search", help="Search names and descriptions").add_argument("query")
+    args = parser.parse_args()
+
+    store = TemplateStore(args.db)
+    if args.command == "import":
+        with open(args.path, "r", encoding="utf-8") as f:
+            print(f"✅ Imported {store.import_entries(json.load(f))} changed template(s)")
+    elif args.command == "export":
+        store.export_json(args.path)
+        print(f"✅ Exported {store.count()} template(s) to {args.path}")
+    else:
+        for name in store.list_names(args.query):
+            print(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Tokenizer-backed token counting for the Prompt Engineering Studio.
+Counts and truncates text with each model's own tokenizer instead of a
+characters-per-token estimate. The static text of a prompt template is
+tokenized once and cached, and many inputs are tokenized in one batched call.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEGMENT_CACHE_SIZE = 256
+DEFAULT_BATCH_SIZE = 256
+
+# Texts used to check that a tokenizer can be split at whitespace boundaries
+_PROBE_TEXTS = [
+    "You are a professional assistant. Respond clearly.\n\nUser: What is a prompt?\nAssistant:",
+    "Text: hello world  -- summarize it,\tplease (in 3 bullets)!",
+]
+
+
+def _is_whitespace_boundary(text: str, index: int) -> bool:
+    """Whether text can be cut before index: a non-space followed by a space"""
+    return 0 < index < len(text) and not text[index - 1].isspace() and text[index].isspace()
+
+
+class TokenCounter:
+    """
+    Token counting and truncation for one tokenizer.
+
+    Prompts are counted as static template segments around the user input.
+    Most tokenizers never merge tokens across the point where a non-space
+    character is followed by a space, so segments are cut there: the cached
+    middle of each segment is counted once, and only the input together with
+    its neighbouring characters is tokenized per prompt. Tokenizers that do
+    merge across such points are detected up front and always count whole
+    prompts instead.
+    """
+
+    def __init__(self, tokenizer: Any, segment_cache_size: int = DEFAULT_SEGMENT_CACHE_SIZE):
+        """
+        Args:
+            tokenizer: A transformers tokenizer
+            segment_cache_size (int): Number of static segment counts to keep
+        """
+        self.tokenizer = tokenizer
+        self.special_tokens = tokenizer.num_special_tokens_to_add(pair=False)
+        self.segment_cache_size = segment_cache_size
+        self._segments: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.segment_hits = 0
+        self.segment_misses = 0
+        self.splittable = self._check_splittable()
+
+    def _lengths(self, texts: Sequence[str]) -> List[int]:
+        """Content token counts (no special tokens) in one tokenizer call"""
+        if not texts:
+            return []
+        encoded = self.tokenizer(
+            list(texts),
+            add_special_tokens=False,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+
+    def _check_splittable(self) -> bool:
+        """Check that cutting at whitespace boundaries never changes the tokens"""
+        encode = lambda text: self.tokenizer(text, add_special_tokens=False)["input_ids"]
+        for text in _PROBE_TEXTS:
+            whole = encode(text)
+            for index in range(len(text)):
+                if _is_whitespace_boundary(text, index):
+                    if encode(text[:index]) + encode(text[index:]) != whole:
+                        return False
+        return True
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens a model sees for a text, including special tokens.
+
+        Args:
+            text (str): Text to count
+
+        Returns:
+            int: Number of tokens
+        """
+        return self._lengths([text])[0] + self.special_tokens
+
+    def count_many(self, texts: Sequence[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[int]:
+        """
+        Count tokens for many texts, batching the tokenizer calls.
+
+        Args:
+            texts: Texts to count
+            batch_size (int): Texts per tokenizer call
+
+        Returns:
+            List[int]: Number of tokens for each text
+        """
+        counts = []
+        for start in range(0, len(texts), batch_size):
+            counts.extend(self._lengths(texts[start : start + batch_size]))
+        return [count + self.special_tokens for count in counts]
+
+    def _segment_length(self, segment: str) -> int:
+        with self._lock:
+            length = self._segments.get(segment)
+            if length is not None:
+                self._segments.move_to_end(segment)
+                self.segment_hits += 1
+                return length
+            self.segment_misses += 1
+
+        length = self._lengths([segment])[0]
+        with self._lock:
+            self._segments[segment] = length
+            while len(self._segments) > self.segment_cache_size:
+                self._segments.popitem(last=False)
+        return length
+
+    def count_prompts(
+        self,
+        segments: Sequence[str],
+        inputs: Sequence[str],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[int]:
+        """
+        Count tokens for prompts built from one template and many inputs.
+
+        Args:
+            segments: Static text around the input; the prompt for an input is
+                ``input.join(segments)``
+            inputs: User inputs
+            batch_size (int): Inputs per tokenizer call
+
+        Returns:
+            List[int]: Number of tokens for each prompt, including special tokens
+        """
+        if not self.splittable or len(segments) < 2:
+            return self.count_many([text.join(segments) for text in inputs], batch_size)
+
+        # Split each segment into the part glued to the input on its left, a cached
+        # middle, and the part glued to the input on its right
+        heads, middles, tails = [], [], []
+        for position, segment in enumerate(segments):
+            cuts = [i for i in range(len(segment)) if _is_whitespace_boundary(segment, i)]
+            start = 0 if position == 0 else (cuts[0] if cuts else len(segment))
+            end = len(segment) if position == len(segments) - 1 else (cuts[-1] if cuts else 0)
+            if end <= start:
+                # No cacheable middle: the whole segment travels with the input
+                start = end = 0 if position == 0 else len(segment)
+            heads.append(segment[:start])
+            middles.append(segment[start:end])
+            tails.append(segment[end:])
+        static_length = sum(self._segment_length(middle) for middle in middles if middle)
+
+        def variable_parts(text: str) -> List[str]:
+            """The texts between cached middles, e.g. tail + input + head"""
+            parts, current = [], tails[0]
+            for position in range(1, len(segments)):
+                current += text + heads[position]
+                if middles[position]:
+                    parts.append(current)
+                    current = ""
+                current += tails[position]
+            if current:
+                parts.append(current)
+            return parts
+
+        counts = []
+        for start in range(0, len(inputs), batch_size):
+            parts = [variable_parts(text) for text in inputs[start : start + batch_size]]
+            lengths = iter(self._lengths([part for text_parts in parts for part in text_parts]))
+            for text_parts in parts:
+                variable_length = sum(next(lengths) for _ in text_parts)
+                counts.append(static_length + variable_length + self.special_tokens)
+        return counts
+
+    def truncate(self, text: str, max_tokens: int, ellipsis: str = "...") -> str:
+        """
+        Cut text at a token boundary so that it fits in max_tokens.
+
+        The budget covers the model's special tokens and the ellipsis that
+        marks the cut.
+
+        Args:
+            text (str): Text to truncate
+            max_tokens (int): Maximum number of tokens
+            ellipsis (str): Appended when the text is cut
+
+        Returns:
+            str: The text, truncated if necessary
+        """
+        if self.count(text) <= max_tokens:
+            return text
+
+        encoded = self.tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=self.tokenizer.is_fast
+        )
+        ids = encoded["input_ids"]
+        keep = max_tokens - self.special_tokens - (self._lengths([ellipsis])[0] if ellipsis else 0)
+        while keep > 0:
+            if self.tokenizer.is_fast:
+                truncated = text[: encoded["offset_mapping"][keep - 1][1]].rstrip()
+            else:
+                truncated = self.tokenizer.decode(ids[:keep], skip_special_tokens=True).rstrip()
+            # Joining the ellipsis can occasionally add a token, so verify the result
+            if self.count(truncated + ellipsis) <= max_tokens:
+                return truncated + ellipsis
+            keep -= 1
+        return ""
+
+    def stats(self) -> Dict[str, Any]:
+        """Segment cache counters"""
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "segment_hits": self.segment_hits,
+                "segment_misses": self.segment_misses,
+                "splittable": self.splittable,
+            }
+
+
+_counters: Dict[str, TokenCounter] = {}
+_failed: Set[str] = set()
+_counters_lock = threading.Lock()
+
+
+def register_tokenizer(model_name: str, tokenizer: Any) -> TokenCounter:
+    """
+    Make a model's tokenizer available for counting, e.g. once the model is loaded.
+
+    Args:
+        model_name (str): The model name/path
+        tokenizer: The model's transformers tokenizer
+
+    Returns:
+        TokenCounter: The counter for the model
+    """
+    with _counters_lock:
+        counter = _counters.get(model_name)
+        if counter is None or counter.tokenizer is not tokenizer:
+            counter = _counters[model_name] = TokenCounter(tokenizer)
+        _failed.discard(model_name)
+        return counter
+
+
+def get_token_counter(model_name: str, load: bool = True) -> Optional[TokenCounter]:
+    """
+    Return the token counter for a model.
+
+    Args:
+        model_name (str): The model name/path
+        load (bool): Load the tokenizer if the model has not registered one;
+            with False only already available tokenizers are used
+
+    Returns:
+        TokenCounter or None: None if the tokenizer is not available
+    """
+    with _counters_lock:
+        counter = _counters.get(model_name)
+        if counter is not None or not load or model_name in _failed:
+            return counter
+
+    try:
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+    except Exception as e:
+        logger.warning(f"No tokenizer for {model_name}, token counts are estimates: {str(e)}")
+        with _counters_lock:
+            _failed.add(model_name)
+        return None
+    return register_tokenizer(model_name, tokenizer)
@@ -0,0 +1,179 @@
+"""
+Lightweight tracing for the Prompt Engineering Studio.
+Spans time each stage of the generation request path and are aggregated
+in-process into per-stage histograms, exportable as Prometheus text or JSON.
+"""
+
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+METRIC_NAME = "prompt_studio_span_seconds"
+
+
+class SpanStats:
+    """Aggregated timings of one span name and label set"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.bucket_counts = [0] * (len(buckets) + 1)  # Last bucket is +Inf
+
+    def add(self, seconds: float, failed: bool, buckets: Tuple[float, ...]):
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.bucket_counts[bisect.bisect_left(buckets, seconds)] += 1
+
+
+class Tracer:
+    """Thread-safe aggregator of span timings"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._spans: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], SpanStats] = {}
+
+    def record(self, name: str, seconds: float, failed: bool = False, **labels: Any):
+        """
+        Add one span timing.
+
+        Args:
+            name (str): Stage name, e.g. "generate"
+            seconds (float): Duration of the stage
+            failed (bool): Whether the stage raised
+            **labels: Extra dimensions such as result="hit"
+        """
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            stats = self._spans.get(key)
+            if stats is None:
+                stats = self._spans[key] = SpanStats(self.buckets)
+            stats.add(seconds, failed, self.buckets)
+
+    @contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time the enclosed block as one span.
+
+        The yielded dict can be updated inside the block to add labels that
+        are only known once the stage has run (e.g. a cache hit or miss).
+        """
+        span_labels = dict(labels)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield span_labels
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, failed, **span_labels)
+
+    def reset(self):
+        """Drop all recorded spans"""
+        with self._lock:
+            self._spans.clear()
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Export aggregated spans as JSON-serializable data.
+
+        Returns:
+            dict: {"spans": [{name, labels, count, errors, total_seconds,
+            mean_seconds, min_seconds, max_seconds, buckets}]}
+        """
+        with self._lock:
+            items = sorted(self._spans.items())
+            spans = []
+            for (name, labels), stats in items:
+                spans.append(
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "count": stats.count,
+                        "errors": stats.errors,
+                        "total_seconds": stats.total,
+                        "mean_seconds": stats.total / stats.count,
+                        "min_seconds": stats.min,
+                        "max_seconds": stats.max,
+                        "buckets": {
+                            str(bound): count
+                            for bound, count in zip(
+                                self.buckets + ("+Inf",), stats.bucket_counts
+                            )
+                        },
+                    }
+                )
+        return {"spans": spans}
+
+    def to_prometheus(self) -> str:
+        """
+        Export aggregated spans in the Prometheus text exposition format.
+
+        Returns:
+            str: A histogram metric with one series per span name and label set
+        """
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each stage of the generation request path",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        with self._lock:
+            items = sorted(self._spans.items())
+            for (name, labels), stats in items:
+                base = [f'span="{_escape(name)}"'] + [
+                    f'{key}="{_escape(value)}"' for key, value in labels
+                ]
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), stats.bucket_counts):
+                    cumulative += count
+                    series = ",".join(base + [f'le="{bound}"'])
+                    lines.append(f"{METRIC_NAME}_bucket{{{series}}} {cumulative}")
+                series = ",".join(base)
+                lines.append(f"{METRIC_NAME}_sum{{{series}}} {stats.total}")
+                lines.append(f"{METRIC_NAME}_count{{{series}}} {stats.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer"""
+    return _tracer
+
+
+def span(name: str, **labels: Any):
+    """Time a block on the process-wide tracer (see Tracer.span)"""
+    return _tracer.span(name, **labels)
+
+
+def traced(name: str, **labels: Any) -> Callable:
+    """Decorator that records every call of a function as a span"""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(name, **labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator